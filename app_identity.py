@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Identity-based merging of desktop entries and PATH commands.
+
+Detection used to merge everything by display name, so "Firefox" (the
+.desktop entry) and firefox (the PATH command) were listed twice, while
+two different desktop entries called "Terminal" silently replaced each
+other. Entries are now grouped by what they actually run: the real path
+of the executable (resolved once at index time and kept in the entry's
+``executable``), the name it is invoked as, and the arguments.
+
+The invoked name is part of the identity because multi-call binaries
+pick their behaviour from argv[0]: halt, reboot and poweroff are all
+symlinks to systemctl, view and vimdiff to vim, and rustup proxies
+every toolchain command. Such commands stay separate entries.
+
+A desktop entry absorbs a PATH command with the same identity, even
+when they reach the executable through different paths (/bin/foo and
+/usr/bin/foo on a merged-/usr system), since both run the same program
+under the same name. The desktop entry provides the name, icon,
+description and categories; the command name is kept in ``aliases`` so
+it still matches in search. Desktop names that still collide get their
+desktop file id appended.
+"""
+
+import os
+
+DESKTOP_SUFFIX = '.desktop'
+
+
+def executable_path(path):
+    """Real path of an absolute executable path, or '' if it is not absolute"""
+    return os.path.realpath(path) if path and os.path.isabs(path) else ''
+
+
+def identity(info):
+    """What an entry runs: (real executable, invoked name, *arguments), or None if unresolved"""
+    executable = info.get('executable')
+    argv = info.get('argv') or []
+    if not executable or not argv:
+        return None
+    return (executable, os.path.basename(argv[0])) + tuple(argv[1:])
+
+
+def merge_apps(desktop_entries, path_apps):
+    """Merge {desktop file id: (name, info)} and {command name: info} into {name: info}.
+
+    Desktop entries come first, in precedence order; a later entry with
+    the same identity replaces an earlier one. A PATH command joins the
+    desktop entry with the same identity, and is listed on its own
+    otherwise. Cached info dicts are never modified.
+    """
+    # [name, info, desktop file id or None, aliases]
+    groups = []
+    by_identity = {}
+
+    def add(name, info, file_id):
+        key = identity(info)
+        group = by_identity.get(key) if key is not None else None
+        if group is None:
+            group = [name, info, file_id, set()]
+            groups.append(group)
+            if key is not None:
+                by_identity[key] = group
+            return
+        if file_id is None:
+            # The command the desktop entry runs
+            group[3].add(name)
+            return
+        group[3].add(group[0])
+        group[0], group[1], group[2] = name, info, file_id
+
+    for file_id, (name, info) in desktop_entries.items():
+        add(name, info, file_id)
+    for name, info in path_apps.items():
+        add(name, info, None)
+
+    counts = {}
+    for group in groups:
+        counts[group[0]] = counts.get(group[0], 0) + 1
+
+    apps = {}
+    for name, info, file_id, aliases in groups:
+        if counts[name] > 1 and file_id is not None:
+            # PATH commands keep the name that is typed in a shell
+            stem = file_id[:-len(DESKTOP_SUFFIX)] if file_id.endswith(DESKTOP_SUFFIX) else file_id
+            name = f"{name} ({stem})"
+        aliases.discard(name)
+        if aliases:
+            info = dict(info, aliases=sorted(aliases))
+        apps[name] = info
+    return apps
@@ -0,0 +1,416 @@
+#!/usr/bin/env python3
+"""
+Persistent application index for Smart Launcher.
+
+Parsed and categorized applications are cached under
+~/.cache/smart-launcher together with the mtime/size of every scanned
+directory and .desktop file, so a launch only re-parses what changed.
+"""
+
+import os
+import json
+import time
+import threading
+from pathlib import Path
+
+import desktop_entry
+import tracing
+
+
+# Streaming: flush a delta after this many changed files/directories,
+# or after this many seconds, whichever comes first
+BATCH_SIZE = 200
+BATCH_INTERVAL = 0.05
+
+
+def default_cache_dir():
+    """Cache directory, honoring XDG_CACHE_HOME"""
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache')
+    return Path(base) / 'smart-launcher'
+
+
+def _stat_key(st):
+    """What we remember about a file or directory to detect changes"""
+    return [st.st_mtime_ns, st.st_size]
+
+
+class AppIndex:
+    """On-disk cache of detected applications with mtime-based invalidation"""
+
+    VERSION = 7
+
+    def __init__(self, detector, cache_path=None):
+        self.detector = detector
+        self.cache_path = Path(cache_path) if cache_path else default_cache_dir() / 'index.json'
+        # {dir: {'stat': [mtime, size], 'files': {filename: {'stat', 'name', 'info'}}}}
+        self.desktop_dirs = {}
+        # {dir: {'stat': [mtime, size], 'commands': {name: info}}}
+        self.path_dirs = {}
+        self.reused = 0
+        self.parsed = 0
+        self._loaded = False
+        self._lock = threading.RLock()
+
+    def load(self):
+        """Return applications grouped by category, re-parsing only what changed"""
+        with self._lock:
+            self._ensure_loaded()
+            if self.refresh():
+                self.save()
+
+            print(f"Index: {self.reused} entries reused, {self.parsed} re-parsed")
+            return self.applications()
+
+    def cached_applications(self):
+        """Categorized contents of the on-disk index, without revalidating it"""
+        with self._lock:
+            self._ensure_loaded()
+            return self.applications()
+
+    def iter_batches(self, batch_size=BATCH_SIZE, interval=BATCH_INTERVAL, skip_cached=False):
+        """Stream the index as deltas while it is being revalidated.
+
+        The cached contents are yielded first as a single 'added' delta
+        (unless ``skip_cached``, for callers that already showed
+        cached_applications()), then every ``batch_size`` changed units of
+        work (files or PATH directories) or every ``interval`` seconds,
+        whichever comes first, a delta against everything yielded so far.
+        Applying all deltas with apply_delta to an empty dict yields the
+        same result as load().
+        """
+        with self._lock:
+            self._ensure_loaded()
+            emitted = {}
+
+            current = self.merged_apps()
+            if current:
+                if not skip_cached:
+                    yield self._diff(emitted, current)
+                emitted = current
+
+            changed = False
+            pending = 0
+            last_flush = time.monotonic()
+            for step_changed in self._refresh_steps():
+                if not step_changed:
+                    continue
+                changed = True
+                pending += 1
+                if pending >= batch_size or time.monotonic() - last_flush >= interval:
+                    current = self.merged_apps()
+                    delta = self._diff(emitted, current)
+                    if any(delta.values()):
+                        yield delta
+                    emitted = current
+                    pending = 0
+                    last_flush = time.monotonic()
+
+            if pending:
+                delta = self._diff(emitted, self.merged_apps())
+                if any(delta.values()):
+                    yield delta
+
+            if changed:
+                self.save()
+            print(f"Index: {self.reused} entries reused, {self.parsed} re-parsed")
+
+    def _ensure_loaded(self):
+        """Read the on-disk index once"""
+        if not self._loaded:
+            self._read_cache()
+            self._loaded = True
+
+    def applications(self):
+        """Categorized view of the current index contents"""
+        with self._lock:
+            return self.detector.build_categories(self.merged_apps())
+
+    def merged_apps(self):
+        """Merge desktop and PATH entries the same way detect_applications does"""
+        desktop_entries = {}
+        desktops = desktop_entry.current_desktops()
+        for desktop_dir in self.detector.desktop_dirs():
+            cached = self.desktop_dirs.get(desktop_dir)
+            if not cached:
+                continue
+            for filename in sorted(cached['files']):
+                entry = cached['files'][filename]
+                # Later directories override, or hide, the same file id.
+                # TryExec and OnlyShowIn are re-checked every time: the
+                # program or the desktop may have changed since parsing
+                if entry['name'] is not None and self.detector.desktop_entry_shown(entry['info'], desktops):
+                    desktop_entries[filename] = (entry['name'], entry['info'])
+                else:
+                    desktop_entries.pop(filename, None)
+
+        # Earlier PATH directories win, as in the shell
+        path_apps = {}
+        for path_dir in reversed(self.detector.path_dirs()):
+            cached = self.path_dirs.get(path_dir)
+            if cached:
+                path_apps.update(cached['commands'])
+
+        return self.detector.merge_apps(desktop_entries, path_apps)
+
+    def refresh(self):
+        """Revalidate every scanned directory; returns True if anything changed"""
+        with self._lock, tracing.span('index_refresh'):
+            return any([changed for changed in self._refresh_steps()])
+
+    def _refresh_steps(self):
+        """Revalidate every directory, yielding whether each unit of work changed the index"""
+        self.reused = 0
+        self.parsed = 0
+
+        desktop_dirs = self.detector.desktop_dirs()
+        for desktop_dir in desktop_dirs:
+            yield from self._refresh_desktop_dir_steps(desktop_dir)
+
+        path_dirs = self.detector.path_dirs()
+        yield from self._refresh_path_dirs_steps(path_dirs)
+
+        # Forget directories that are no longer scanned
+        for cache, wanted in ((self.desktop_dirs, desktop_dirs), (self.path_dirs, path_dirs)):
+            for stale in set(cache) - set(wanted):
+                del cache[stale]
+                yield True
+
+    def apply_changes(self, changes):
+        """Apply filesystem changes reported by the watcher and return the delta.
+
+        ``changes`` is an iterable of (directory, filename) pairs; a filename
+        of None means the whole directory must be re-listed. Only the touched
+        files are re-parsed. The delta has 'added', 'removed' and 'modified'
+        lists; see apply_delta for their layout.
+        """
+        with self._lock:
+            before = self.merged_apps()
+
+            for directory, filename in changes:
+                if directory in self.desktop_dirs or directory in self.detector.desktop_dirs():
+                    self._apply_desktop_change(directory, filename)
+                elif directory in self.path_dirs or directory in self.detector.path_dirs():
+                    self._apply_path_change(directory, filename)
+
+            return self._diff(before, self.merged_apps())
+
+    def _apply_desktop_change(self, desktop_dir, filename):
+        """Update a single .desktop file, or re-list its directory"""
+        cached = self.desktop_dirs.get(desktop_dir)
+        if filename is None or cached is None:
+            if cached:
+                # Force a directory listing; unchanged files are still reused
+                cached['stat'] = None
+            self._refresh_desktop_dir(desktop_dir)
+            return
+
+        if not filename.endswith('.desktop'):
+            return
+
+        entry = self._refresh_desktop_file(desktop_dir, filename, cached['files'].get(filename))
+        if entry is None:
+            cached['files'].pop(filename, None)
+        else:
+            cached['files'][filename] = entry
+
+    def _apply_path_change(self, path_dir, filename):
+        """Update a single PATH entry, or re-list its directory"""
+        cached = self.path_dirs.get(path_dir)
+        if filename is None or cached is None:
+            self.path_dirs.pop(path_dir, None)
+            self._refresh_path_dirs([path_dir])
+            return
+
+        info = self.detector._check_path_command(os.path.join(path_dir, filename))
+        if info:
+            info['category'] = self.detector._categorize_application(filename, info)
+            cached['commands'][filename] = info
+        else:
+            cached['commands'].pop(filename, None)
+
+    def _diff(self, before, after):
+        """Compare two merged app dicts and describe what changed"""
+        delta = {'added': [], 'removed': [], 'modified': []}
+        for name, info in after.items():
+            old = before.get(name)
+            if old is None:
+                delta['added'].append(self._categorized(name, info))
+            elif old != info:
+                delta['modified'].append(self._categorized(name, old) + self._categorized(name, info))
+        for name, info in before.items():
+            if name not in after:
+                delta['removed'].append(self._categorized(name, info))
+        return delta
+
+    def _categorized(self, name, info):
+        """(category, record) pair for a merged entry"""
+        category = info.get('category') or self.detector._categorize_application(name, info)
+        return (category, self.detector.make_record(name, info))
+
+    def _refresh_desktop_dir(self, desktop_dir):
+        """Re-parse the .desktop files of a directory whose contents changed"""
+        return any([changed for changed in self._refresh_desktop_dir_steps(desktop_dir)])
+
+    def _refresh_desktop_dir_steps(self, desktop_dir):
+        """Revalidate one application directory, yielding after every file"""
+        try:
+            dir_stat = _stat_key(os.stat(desktop_dir))
+        except OSError:
+            if self.desktop_dirs.pop(desktop_dir, None) is not None:
+                yield True
+            return
+
+        cached = self.desktop_dirs.get(desktop_dir)
+        old_files = cached['files'] if cached else {}
+        if cached and cached['stat'] == dir_stat:
+            filenames = list(old_files)
+        else:
+            try:
+                filenames = [name for name in os.listdir(desktop_dir) if name.endswith('.desktop')]
+            except OSError:
+                filenames = []
+
+        # Entries stay visible while they are revalidated one by one
+        files = dict(old_files)
+        self.desktop_dirs[desktop_dir] = {'stat': dir_stat, 'files': files}
+        if cached is None or cached['stat'] != dir_stat:
+            yield True
+
+        for filename in filenames:
+            old_entry = old_files.get(filename)
+            entry = self._refresh_desktop_file(desktop_dir, filename, old_entry)
+            if entry is None:
+                files.pop(filename, None)
+            else:
+                files[filename] = entry
+            yield entry is not old_entry
+
+        for filename in set(old_files) - set(filenames):
+            del files[filename]
+            yield True
+
+    def _refresh_desktop_file(self, desktop_dir, filename, cached):
+        """Return the cached entry if the file is unchanged, otherwise re-parse it"""
+        file_path = os.path.join(desktop_dir, filename)
+        try:
+            file_stat = _stat_key(os.stat(file_path))
+        except OSError:
+            return None
+
+        if cached and cached['stat'] == file_stat:
+            self.reused += 1
+            return cached
+
+        self.parsed += 1
+        parsed = self.detector._parse_desktop_file(file_path)
+        if not parsed:
+            # Remember hidden/invalid files too so they are not re-parsed
+            return {'stat': file_stat, 'name': None, 'info': None}
+
+        name, info = parsed
+        info['category'] = self.detector._categorize_application(name, info)
+        return {'stat': file_stat, 'name': name, 'info': info}
+
+    def _refresh_path_dirs(self, path_dirs):
+        """Re-list, concurrently, the PATH directories whose mtime/size changed"""
+        return any([changed for changed in self._refresh_path_dirs_steps(path_dirs)])
+
+    def _refresh_path_dirs_steps(self, path_dirs):
+        """Revalidate PATH directories, yielding as each re-listed directory finishes"""
+        stale = {}
+        for path_dir in path_dirs:
+            try:
+                dir_stat = _stat_key(os.stat(path_dir))
+            except OSError:
+                if self.path_dirs.pop(path_dir, None) is not None:
+                    yield True
+                continue
+
+            cached = self.path_dirs.get(path_dir)
+            if cached and cached['stat'] == dir_stat:
+                self.reused += len(cached['commands'])
+            else:
+                stale[path_dir] = dir_stat
+
+        for path_dir, commands in self.detector._iter_scan_path_dirs(list(stale)):
+            items = list(commands.items())
+            for (_name, info), category in zip(items, self.detector.categorize_batch(items)):
+                info['category'] = category
+            self.parsed += len(commands)
+            self.path_dirs[path_dir] = {'stat': stale[path_dir], 'commands': commands}
+            yield True
+
+    def _read_cache(self):
+        """Load the on-disk index, discarding it if it is stale or unreadable"""
+        try:
+            with tracing.span('index_read'), open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        if (not isinstance(data, dict) or
+            data.get('version') != self.VERSION or
+            data.get('categories') != self.detector.categories):
+            return
+
+        self.desktop_dirs = data.get('desktop', {})
+        self.path_dirs = data.get('path', {})
+
+    def save(self):
+        """Atomically write the index to disk"""
+        with self._lock, tracing.span('index_save'):
+            data = {
+                'version': self.VERSION,
+                'categories': self.detector.categories,
+                'desktop': self.desktop_dirs,
+                'path': self.path_dirs
+            }
+            try:
+                self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = self.cache_path.with_name(self.cache_path.name + '.tmp')
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+                os.replace(tmp_path, self.cache_path)
+            except OSError as e:
+                print(f"⚠️  Could not write index cache: {e}")
+
+
+def apply_delta(apps_by_category, delta):
+    """Apply an AppIndex delta in place to a categorized app dict.
+
+    'added' and 'removed' hold (category, record) pairs, 'modified' holds
+    (old_category, old_record, new_category, new_record) tuples. Returns the
+    set of categories that changed.
+    """
+    touched = set()
+
+    def remove(category, record):
+        apps = apps_by_category.get(category, [])
+        for i, app in enumerate(apps):
+            if app['name'] == record['name']:
+                del apps[i]
+                break
+        touched.add(category)
+
+    def insert(category, record):
+        apps = apps_by_category.setdefault(category, [])
+        key = record['name'].lower()
+        lo, hi = 0, len(apps)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if apps[mid]['name'].lower() < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        apps.insert(lo, record)
+        touched.add(category)
+
+    for category, record in delta.get('removed', []):
+        remove(category, record)
+    for old_category, old_record, new_category, new_record in delta.get('modified', []):
+        remove(old_category, old_record)
+        insert(new_category, new_record)
+    for category, record in delta.get('added', []):
+        insert(category, record)
+
+    return touched
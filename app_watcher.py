@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+Live application index updates for Smart Launcher.
+
+Watches the XDG application directories and PATH directories with Linux
+inotify (falling back to stat polling elsewhere) and feeds the touched
+files to AppIndex.apply_changes, so installs and removals show up without
+a full rescan.
+"""
+
+import os
+import time
+import errno
+import select
+import struct
+import threading
+import ctypes
+import ctypes.util
+
+# inotify event masks (see inotify(7))
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = os.O_CLOEXEC
+
+WATCH_MASK = (IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO |
+              IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR)
+ANCESTOR_MASK = IN_CREATE | IN_MOVED_TO | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR
+
+_EVENT_HEADER = struct.Struct('iIII')
+
+
+class InotifyBackend:
+    """Directory watcher built on the inotify syscalls via ctypes.
+
+    A directory that does not exist (yet), such as ~/.local/bin before
+    the first install, is waited for by watching its nearest existing
+    ancestor. Once it is created, or re-created after being removed, it
+    is watched itself and reported as a (directory, None) change.
+    """
+
+    def __init__(self, directories):
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self._rm_watch = libc.inotify_rm_watch
+        self._rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+
+        self.directories = list(directories)
+        # {wd: watched path}; {missing directory: ancestor watched for it}
+        self.watches = {}
+        self.pending = {}
+        for directory in self.directories:
+            self._watch(directory)
+
+    def fileno(self):
+        return self.fd
+
+    def _add(self, path):
+        """Watch path; False if it is missing or not a directory"""
+        # Ancestors only need to report new entries and their own removal
+        mask = WATCH_MASK if path in self.directories else ANCESTOR_MASK
+        wd = self._add_watch(self.fd, os.fsencode(path), mask)
+        if wd < 0:
+            return False
+        self.watches[wd] = path
+        return True
+
+    def _remove(self, wd):
+        del self.watches[wd]
+        self._rm_watch(self.fd, wd)
+
+    def _watch(self, directory):
+        """Watch directory, or its nearest existing ancestor until it appears.
+
+        Returns True if the directory itself is watched now.
+        """
+        old_ancestor = self.pending.pop(directory, None)
+        watched = self._add(directory)
+        if not watched and os.path.isabs(directory):
+            ancestor = os.path.dirname(directory)
+            while not self._add(ancestor) and ancestor != os.path.dirname(ancestor):
+                ancestor = os.path.dirname(ancestor)
+            self.pending[directory] = ancestor
+        if old_ancestor is not None and old_ancestor != self.pending.get(directory):
+            self._forget_ancestor(old_ancestor)
+        return watched
+
+    def _forget_ancestor(self, path):
+        """Stop watching an ancestor nothing waits on any more"""
+        if path in self.directories or path in self.pending.values():
+            return
+        for wd, watched in list(self.watches.items()):
+            if watched == path:
+                self._remove(wd)
+
+    def _rewatch(self, path, changes):
+        """Watch again what depended on a removed or moved-away directory"""
+        for directory in self.directories:
+            if directory == path:
+                changes.add((directory, None))
+                self._watch(directory)
+            elif self.pending.get(directory) == path and self._watch(directory):
+                changes.add((directory, None))
+
+    def read_changes(self):
+        """Drain pending events into a set of (directory, filename) pairs"""
+        changes = set()
+        while True:
+            try:
+                data = os.read(self.fd, 65536)
+            except OSError as e:
+                if e.errno in (errno.EAGAIN, errno.EWOULDBLOCK):
+                    break
+                raise
+            if not data:
+                break
+
+            offset = 0
+            while offset < len(data):
+                wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                name = data[offset:offset + length].rstrip(b'\0')
+                offset += length
+
+                if mask & IN_Q_OVERFLOW:
+                    # Events were dropped: re-list every directory and look
+                    # again for the missing ones
+                    changes.update((directory, None) for directory in self.directories
+                                   if directory not in self.pending)
+                    for directory in list(self.pending):
+                        if self._watch(directory):
+                            changes.add((directory, None))
+                    continue
+
+                path = self.watches.get(wd)
+                if path is None:
+                    continue
+                if mask & (IN_DELETE_SELF | IN_MOVE_SELF | IN_IGNORED):
+                    # A moved directory keeps its watch under the new name
+                    if mask & IN_MOVE_SELF:
+                        self._remove(wd)
+                    else:
+                        del self.watches[wd]
+                    self._rewatch(path, changes)
+                    continue
+
+                if not name:
+                    continue
+                filename = os.fsdecode(name)
+                if path in self.directories:
+                    changes.add((path, filename))
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    # A missing directory, or one of its parents, may exist now
+                    child = os.path.join(path, filename)
+                    for directory, ancestor in list(self.pending.items()):
+                        if ancestor == path and (directory == child or directory.startswith(child + os.sep)):
+                            if self._watch(directory):
+                                changes.add((directory, None))
+
+        return changes
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingBackend:
+    """Portable fallback that detects changes by comparing stat snapshots"""
+
+    def __init__(self, directories):
+        self.directories = list(directories)
+        self.snapshots = {directory: self._snapshot(directory) for directory in self.directories}
+
+    def _snapshot(self, directory):
+        """{filename: (mtime, size, mode)} for every entry of a directory"""
+        entries = {}
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    try:
+                        st = entry.stat()
+                    except OSError:
+                        continue
+                    entries[entry.name] = (st.st_mtime_ns, st.st_size, st.st_mode)
+        except OSError:
+            return None
+        return entries
+
+    def read_changes(self):
+        """Compare every directory against its last snapshot"""
+        changes = set()
+        for directory in self.directories:
+            old = self.snapshots[directory]
+            new = self._snapshot(directory)
+            if old is None or new is None:
+                if old != new:
+                    changes.add((directory, None))
+            else:
+                for name in old.keys() | new.keys():
+                    if old.get(name) != new.get(name):
+                        changes.add((directory, name))
+            self.snapshots[directory] = new
+        return changes
+
+    def close(self):
+        pass
+
+
+class AppWatcher:
+    """Background thread that applies filesystem deltas to an AppIndex.
+
+    ``callback(delta)`` is called from the watcher thread for every batch of
+    changes that actually altered the index.
+    """
+
+    def __init__(self, index, callback, poll_interval=0.5, settle_time=0.15):
+        self.index = index
+        self.callback = callback
+        self.poll_interval = poll_interval
+        # Package managers touch many files at once; coalesce them
+        self.settle_time = settle_time
+        self.backend = None
+        self._thread = None
+        self._stop = threading.Event()
+        self._wakeup_r, self._wakeup_w = os.pipe()
+
+    def watched_directories(self):
+        """Application and PATH directories, deduplicated, including missing ones"""
+        detector = self.index.detector
+        # detector.path_dirs() drops PATH entries that do not exist yet;
+        # they are watched for creation
+        missing = [path_dir for path_dir in os.environ.get('PATH', '').split(':')
+                   if os.path.isabs(path_dir) and not os.path.exists(path_dir)]
+        directories = []
+        for directory in detector.desktop_dirs() + detector.path_dirs() + missing:
+            if directory and directory not in directories:
+                directories.append(directory)
+        return directories
+
+    def start(self):
+        """Start watching; uses inotify when available, polling otherwise"""
+        if self._thread:
+            return
+        directories = self.watched_directories()
+        try:
+            self.backend = InotifyBackend(directories)
+        except (OSError, AttributeError, TypeError):
+            self.backend = PollingBackend(directories)
+
+        self._thread = threading.Thread(target=self._run, name='app-watcher', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the watcher thread and release the backend"""
+        self._stop.set()
+        os.write(self._wakeup_w, b'x')
+        if self._thread:
+            self._thread.join(timeout=2)
+            self._thread = None
+        if self.backend:
+            self.backend.close()
+            self.backend = None
+        for fd in (self._wakeup_r, self._wakeup_w):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+    def _wait(self, timeout):
+        """Sleep until the backend has events, the timeout expires or stop()"""
+        fds = [self._wakeup_r]
+        if isinstance(self.backend, InotifyBackend):
+            fds.append(self.backend.fileno())
+        try:
+            select.select(fds, [], [], timeout)
+        except (OSError, ValueError):
+            time.sleep(timeout or 0)
+
+    def _run(self):
+        inotify = isinstance(self.backend, InotifyBackend)
+        while not self._stop.is_set():
+            self._wait(None if inotify else self.poll_interval)
+            if self._stop.is_set():
+                break
+
+            changes = self.backend.read_changes()
+            if not changes:
+                continue
+
+            # Let a burst of events settle before touching the index
+            deadline = time.monotonic() + self.settle_time
+            while not self._stop.is_set():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._wait(remaining)
+                more = self.backend.read_changes() if inotify else set()
+                changes |= more
+
+            try:
+                delta = self.index.apply_changes(changes)
+            except Exception as e:
+                print(f"⚠️  Watcher failed to apply changes: {e}")
+                continue
+
+            if any(delta.values()):
+                self.index.save()
+                self.callback(delta)
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Benchmark: streaming .desktop parser vs the old configparser path.
+
+Generates a synthetic applications directory with thousands of entries
+(each with localized keys and Desktop Actions groups, like real ones)
+and times parsing every file with both implementations.
+
+    python3 benchmarks/bench_desktop_parser.py --entries 5000
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import configparser
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from smart_launcher import ApplicationDetector
+
+LOCALES = ['ar', 'de', 'es', 'fa', 'fr', 'it', 'ja', 'nl', 'pl', 'pt_BR', 'ru', 'zh_CN']
+
+
+def write_entry(directory, i):
+    """Write one realistic .desktop file"""
+    lines = [
+        '[Desktop Entry]',
+        'Version=1.0',
+        'Type=Application',
+        f'Name=Synthetic App {i}',
+        f'GenericName=Tool number {i}',
+        f'Comment=Synthetic application {i} for benchmarking',
+        f'Exec=synthetic-app-{i} --new-window %U',
+        f'Icon=synthetic-{i}',
+        'Categories=Utility;Development;',
+        'Keywords=bench;synthetic;',
+    ]
+    for locale in LOCALES:
+        lines.append(f'Name[{locale}]=Synthetic App {i} ({locale})')
+        lines.append(f'Comment[{locale}]=Localized comment {i} ({locale})')
+    lines.append('Actions=new-window;private;')
+    for action in ('new-window', 'private'):
+        lines.append('')
+        lines.append(f'[Desktop Action {action}]')
+        lines.append(f'Name=Open {action}')
+        lines.append(f'Exec=synthetic-app-{i} --{action}')
+        for locale in LOCALES:
+            lines.append(f'Name[{locale}]=Open {action} ({locale})')
+    (Path(directory) / f'synthetic-{i}.desktop').write_text('\n'.join(lines) + '\n', encoding='utf-8')
+
+
+def parse_with_configparser(file_path):
+    """The previous implementation of _parse_desktop_file"""
+    # interpolation=None: with the default interpolation every Exec
+    # containing a field code (%U) raised, so it is disabled to compare
+    # equal amounts of work
+    config = configparser.ConfigParser(interpolation=None)
+    config.read(file_path, encoding='utf-8')
+    if 'Desktop Entry' not in config:
+        return None
+    entry = config['Desktop Entry']
+    if entry.get('NoDisplay', '').lower() == 'true':
+        return None
+    name = entry.get('Name', Path(file_path).stem)
+    command = entry.get('Exec', '')
+    description = entry.get('Comment', entry.get('GenericName', 'Desktop Application'))
+    if command:
+        command = command.split()[0]
+    return name, {'command': command, 'description': description, 'type': 'desktop'}
+
+
+def time_parser(parse, files, repeat):
+    """Best wall time of parsing every file"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for file_path in files:
+            parse(file_path)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--entries', type=int, default=5000, help='number of .desktop files')
+    parser.add_argument('--repeat', type=int, default=3, help='repetitions (best is reported)')
+    args = parser.parse_args()
+
+    detector = ApplicationDetector()
+    with tempfile.TemporaryDirectory(prefix='bench-desktop-') as directory:
+        for i in range(args.entries):
+            write_entry(directory, i)
+        files = sorted(Path(directory).glob('*.desktop'))
+
+        old = time_parser(parse_with_configparser, files, args.repeat)
+        new = time_parser(detector._parse_desktop_file, files, args.repeat)
+
+    print(f"📊 Parsing {args.entries} .desktop files (best of {args.repeat})")
+    print(f"   configparser : {old * 1000:8.1f} ms  ({old / args.entries * 1e6:6.1f} µs/file)")
+    print(f"   streaming    : {new * 1000:8.1f} ms  ({new / args.entries * 1e6:6.1f} µs/file)")
+    print(f"   speedup      : {old / new:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Benchmark: GUI latency of loading, searching and switching categories.
+
+Runs BulletproofLauncher on Qt's offscreen platform (no display needed)
+over a synthetic app set and replays a scripted session: the first
+batch and the finished index arriving, then typing, deleting and
+category clicks, --rounds times. For every event it measures how long
+the GUI thread was blocked handling it, the latency until the results
+were applied and painted (including the search debounce and worker
+thread), and the paint itself, and reports p50/p95/p99 per kind of
+event along with peak RSS.
+
+    python3 benchmarks/bench_gui.py --apps 20000 --output gui.json
+"""
+
+import os
+import sys
+import json
+import time
+import tempfile
+import argparse
+import resource
+
+# Before Qt is imported
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+try:
+    from PyQt5.QtCore import Qt
+    from PyQt5.QtTest import QTest
+    from PyQt5.QtWidgets import QApplication
+except ImportError:
+    print("❌ PyQt5 is needed for the GUI benchmark: pip install PyQt5")
+    sys.exit(1)
+
+from bench_categorizer import synthetic_apps
+from bench_suite import environment, git_revision
+
+# Seconds to wait for a search result before giving up on an event
+EVENT_TIMEOUT = 10.0
+
+# Pause between scripted keystrokes: slower than the debounce, like a person typing
+KEY_INTERVAL = 0.05
+
+# (action, argument) steps replayed every round
+SCRIPT = [
+    ('type', 'code'),
+    ('backspace', 4),
+    ('category', 'Programming'),
+    ('type', 'git'),
+    ('category', 'All'),
+    ('backspace', 3),
+    ('category', 'Internet'),
+    ('type', 'ff'),
+    ('backspace', 2),
+    ('category', 'Other'),
+    ('type', 'zentorpix'),
+    ('backspace', 9),
+    ('category', 'All'),
+]
+
+PERCENTILES = (50, 95, 99)
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process so far"""
+    # ru_maxrss is in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def percentile(sorted_samples, pct):
+    """Nearest-rank percentile of already sorted samples"""
+    if not sorted_samples:
+        return None
+    rank = max(1, -(-pct * len(sorted_samples) // 100))
+    return sorted_samples[int(rank) - 1]
+
+
+def harness_window_class():
+    """BulletproofLauncher that loads the synthetic set only when told to"""
+    from bulletproof_launcher import BulletproofLauncher
+
+    class NoWatcher:
+        def stop(self):
+            pass
+
+    class HarnessWindow(BulletproofLauncher):
+        def __init__(self):
+            super().__init__()
+            self.applied_generation = 0
+
+        def load_apps(self, from_cache=False):
+            # Neither the on-disk index nor a detection thread: the
+            # harness feeds the window itself
+            self.search_input.setEnabled(False)
+
+        def on_apps_loaded(self, apps, search_index):
+            # Nothing to watch in a synthetic set
+            self.watcher = NoWatcher()
+            super().on_apps_loaded(apps, search_index)
+
+        def on_search_results(self, session, ids):
+            super().on_search_results(session, ids)
+            self.applied_generation = self.search_scheduler.generation
+
+        def settled(self):
+            """No search queued, running or waiting to be applied"""
+            return (self.search_session is None or
+                    self.applied_generation == self.search_scheduler.generation)
+
+    return HarnessWindow
+
+
+class Recorder:
+    """Replays events on the window and collects their timings"""
+
+    def __init__(self, app, window):
+        self.app = app
+        self.window = window
+        self.samples = {}
+
+    def measure(self, kind, action):
+        """Run ``action`` and time it until its results are painted"""
+        window = self.window
+        start = time.perf_counter()
+        action()
+        handled = time.perf_counter()
+
+        deadline = handled + EVENT_TIMEOUT
+        while not window.settled():
+            if time.perf_counter() > deadline:
+                print(f"⚠️  {kind}: no search result within {EVENT_TIMEOUT:g} s")
+                break
+            self.app.processEvents()
+            time.sleep(0.0005)
+        # Let the view lay out the new rows, then paint synchronously
+        self.app.processEvents()
+        paint_start = time.perf_counter()
+        window.app_view.viewport().repaint()
+        done = time.perf_counter()
+
+        self.samples.setdefault(kind, []).append({
+            'blocked': handled - start,
+            'latency': done - start,
+            'paint': done - paint_start,
+        })
+
+    def idle(self, seconds):
+        """Keep the event loop running for a while"""
+        end = time.perf_counter() + seconds
+        while time.perf_counter() < end:
+            self.app.processEvents()
+            time.sleep(0.001)
+
+    def run_step(self, action, argument):
+        window = self.window
+        if action == 'type':
+            for char in argument:
+                self.measure('keystroke', lambda: QTest.keyClick(window.search_input, char))
+                self.idle(KEY_INTERVAL)
+        elif action == 'backspace':
+            for _ in range(argument):
+                self.measure('backspace', lambda: QTest.keyClick(window.search_input, Qt.Key_Backspace))
+                self.idle(KEY_INTERVAL)
+        elif action == 'category':
+            self.measure('category', lambda: window.category_buttons[argument].click())
+        else:
+            raise ValueError(f"unknown script action: {action}")
+
+    def summary(self):
+        """{event kind: {metric: {p50, p95, p99, max} in ms, 'count': n}}"""
+        report = {}
+        for kind, samples in self.samples.items():
+            entry = {'count': len(samples)}
+            for metric in ('blocked', 'latency', 'paint'):
+                values = sorted(sample[metric] for sample in samples)
+                entry[metric] = {f'p{pct}': percentile(values, pct) * 1000 for pct in PERCENTILES}
+                entry[metric]['max'] = values[-1] * 1000
+            report[kind] = entry
+        return report
+
+
+def run(apps_count, rounds):
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    rss_start = peak_rss_mb()
+
+    window = harness_window_class()()
+    window.show()
+    app.processEvents()
+    recorder = Recorder(app, window)
+
+    from search_index import SearchIndex
+    apps = window.detector.build_categories(dict(synthetic_apps(apps_count)))
+    added = [(category, app_record) for category, records in apps.items() for app_record in records]
+    search_index = SearchIndex(apps)
+
+    # What the window does with a warm cache: everything in one batch,
+    # then the finished index (built on the loader thread, so not timed)
+    recorder.measure('first_batch', lambda: window.on_apps_batch(
+        {'added': added, 'removed': [], 'modified': []}))
+    recorder.measure('apps_loaded', lambda: window.on_apps_loaded(apps, search_index))
+    rss_loaded = peak_rss_mb()
+
+    for _ in range(rounds):
+        for action, argument in SCRIPT:
+            recorder.run_step(action, argument)
+
+    window.quitting = True
+    window.close()
+    app.processEvents()
+    return {
+        'apps': apps_count,
+        'rounds': rounds,
+        'events': recorder.summary(),
+        'peak_rss_mb': {'qt_started': rss_start, 'apps_loaded': rss_loaded, 'end': peak_rss_mb()},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--apps', type=int, default=20000, help='number of synthetic apps')
+    parser.add_argument('--rounds', type=int, default=5, help='times the scripted session is replayed')
+    parser.add_argument('--output', help='write results as JSON to this file')
+    args = parser.parse_args()
+
+    # Keep the user's index, usage log and launch stats out of it
+    with tempfile.TemporaryDirectory(prefix='bench-gui-') as home, \
+            environment({'XDG_CACHE_HOME': os.path.join(home, 'cache'),
+                         'XDG_DATA_HOME': os.path.join(home, 'data')}):
+        result = run(args.apps, args.rounds)
+
+    print(f"📊 GUI latency over {args.apps} apps, {args.rounds} rounds "
+          f"({os.environ['QT_QPA_PLATFORM']} platform), ms")
+    print(f"   {'event':<12} {'n':>4}  {'blocked p50/p95/p99':>22}  {'latency p50/p95/p99':>22}  {'paint p50':>9}")
+    for kind, entry in result['events'].items():
+        blocked = '/'.join(f"{entry['blocked'][f'p{pct}']:.1f}" for pct in PERCENTILES)
+        latency = '/'.join(f"{entry['latency'][f'p{pct}']:.1f}" for pct in PERCENTILES)
+        print(f"   {kind:<12} {entry['count']:>4}  {blocked:>22}  {latency:>22}  {entry['paint']['p50']:9.1f}")
+    rss = result['peak_rss_mb']
+    print(f"   peak RSS: {rss['qt_started']:.0f} MB with Qt up, {rss['apps_loaded']:.0f} MB loaded, "
+          f"{rss['end']:.0f} MB at the end")
+
+    if args.output:
+        meta = {'revision': git_revision(), 'platform': os.environ['QT_QPA_PLATFORM'],
+                'key_interval': KEY_INTERVAL}
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'meta': meta, 'results': [result]}, f, indent=2)
+            f.write('\n')
+        print(f"💾 Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
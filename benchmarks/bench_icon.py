@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Benchmark: icon rasterization and icon set writing in create_icon.py.
+
+Times the original per-pixel putpixel gradient against the row-buffer
+gradient (checking both give identical pixels), the whole icon, and
+writing the master plus every size serially against in parallel, at
+several master sizes.
+
+    python3 benchmarks/bench_icon.py --sizes 256,1024
+"""
+
+import os
+import sys
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from PIL import Image
+from create_icon import (SIZES, create_bulletproof_icon, gradient_background, save_resized,
+                         write_icon_set)
+from bench_categorizer import best_of
+
+
+def gradient_putpixel(size):
+    """The original gradient loop of create_bulletproof_icon"""
+    img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
+    for y in range(size):
+        ratio = y / size
+        r = int(102 + (118 - 102) * ratio)
+        g = int(126 + (75 - 126) * ratio)
+        b = int(234 + (162 - 234) * ratio)
+        for x in range(size):
+            x_ratio = x / size
+            final_r = max(0, min(255, int(r + (r * 0.1 * x_ratio))))
+            final_g = max(0, min(255, int(g + (g * 0.1 * x_ratio))))
+            final_b = max(0, min(255, int(b + (b * 0.1 * x_ratio))))
+            img.putpixel((x, y), (final_r, final_g, final_b, 255))
+    return img
+
+
+def write_serial(icon, output_dir):
+    """The original main(): master, then each size in turn"""
+    icon.save(os.path.join(output_dir, "bulletproof_launcher_icon.png"), "PNG")
+    for size in SIZES:
+        save_resized(icon, size, output_dir)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', default='256,1024', help='comma-separated master sizes')
+    parser.add_argument('--repeat', type=int, default=3, help='repetitions (best is reported)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix='bench-icon-') as output_dir:
+        for size in (int(value) for value in args.sizes.split(',')):
+            old_time, old = best_of(1 if size > 512 else args.repeat, lambda: gradient_putpixel(size))
+            new_time, new = best_of(args.repeat, lambda: gradient_background(size))
+            if old.tobytes() != new.tobytes():
+                print(f"❌ Gradients differ at {size}px!")
+                sys.exit(1)
+            icon_time, icon = best_of(args.repeat, lambda: create_bulletproof_icon(size))
+            serial_time, _ = best_of(args.repeat, lambda: write_serial(icon, output_dir))
+            parallel_time, _ = best_of(args.repeat, lambda: write_icon_set(icon, output_dir))
+
+            print(f"📊 {size}x{size} master (best of {args.repeat})")
+            print(f"   putpixel gradient : {old_time * 1000:8.1f} ms")
+            print(f"   buffer gradient   : {new_time * 1000:8.1f} ms  ({old_time / new_time:.0f}x)")
+            print(f"   whole icon        : {icon_time * 1000:8.1f} ms")
+            print(f"   icon set, serial  : {serial_time * 1000:8.1f} ms")
+            print(f"   icon set, parallel: {parallel_time * 1000:8.1f} ms  ({serial_time / parallel_time:.1f}x, "
+                  f"{os.cpu_count()} CPUs)")
+
+
+if __name__ == "__main__":
+    main()
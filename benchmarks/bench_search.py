@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Benchmark: fuzzy ranked search vs the old linear substring filter.
+
+Builds a SearchIndex over a synthetic app set (50k by default) and, for
+a few queries, times the old per-app substring loop, fuzzy matching,
+ranking the best matches with a heap against sorting every match, and
+typing each query letter by letter through a SearchSession.
+
+    python3 benchmarks/bench_search.py --apps 50000
+"""
+
+import os
+import sys
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from smart_launcher import ApplicationDetector
+from search_index import SearchIndex, SearchSession, RANKED_RESULTS
+from bench_categorizer import synthetic_apps, best_of
+
+QUERIES = ['c', 'co', 'ff', 'gitdev', 'kalo', 'zentorpix', 'code']
+
+
+def linear_filter(apps_by_category, query):
+    """The original filter_apps loop"""
+    query = query.lower()
+    found = []
+    for apps in apps_by_category.values():
+        for app in apps:
+            if (query in app['name'].lower() or
+                    query in app['description'].lower() or
+                    query in app['command'].lower()):
+                found.append(app)
+    return found
+
+
+def sort_all(index, query, ids):
+    """Rank by sorting every match, the approach the heap replaces"""
+    query = query.lower()
+    return sorted(ids, key=lambda doc_id: -index.score(query, doc_id))
+
+
+def type_query(index, query):
+    session = SearchSession(index)
+    for end in range(1, len(query) + 1):
+        session.search_ids(query[:end])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--apps', type=int, default=50000, help='number of synthetic apps')
+    parser.add_argument('--repeat', type=int, default=3, help='repetitions (best is reported)')
+    args = parser.parse_args()
+
+    detector = ApplicationDetector()
+    apps_by_category = detector.build_categories(dict(synthetic_apps(args.apps)))
+    build_time, index = best_of(1, lambda: SearchIndex(apps_by_category))
+
+    print(f"📊 Searching {args.apps} apps (best of {args.repeat}, index built in {build_time * 1000:.0f} ms)")
+    print(f"   {'query':<10} {'matches':>8} {'linear':>9} {'fuzzy':>9} {'sort all':>9} "
+          f"{'top ' + str(RANKED_RESULTS):>9} {'typing':>9}")
+    for query in QUERIES:
+        linear_time, _ = best_of(args.repeat, lambda: linear_filter(apps_by_category, query))
+        match_time, ids = best_of(args.repeat, lambda: index.match_ids(query, limit=RANKED_RESULTS))
+        sort_time, by_sort = best_of(args.repeat, lambda: sort_all(index, query, ids))
+        heap_time, by_heap = best_of(args.repeat, lambda: index.rank_ids(query, ids))
+        typing_time, _ = best_of(args.repeat, lambda: type_query(index, query))
+
+        best_scores = [index.score(query, doc_id) for doc_id in by_heap[:RANKED_RESULTS]]
+        if best_scores != [index.score(query, doc_id) for doc_id in by_sort[:RANKED_RESULTS]]:
+            print(f"❌ Heap ranking disagrees with a full sort for '{query}'!")
+            sys.exit(1)
+
+        print(f"   {query:<10} {len(ids):>8} {linear_time * 1000:>7.1f}ms {match_time * 1000:>7.1f}ms "
+              f"{sort_time * 1000:>7.1f}ms {heap_time * 1000:>7.1f}ms {typing_time * 1000:>7.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
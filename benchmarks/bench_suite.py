@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite: detection, categorization, search and CLI listing at scale.
+
+For each scale (total apps) a synthetic system is generated in a
+temporary tree (see fixtures.py): a share of the apps as .desktop files
+over the XDG application directories, the rest as executables over
+several PATH directories. Every stage is timed against it (best of
+--repeat, page cache warm) and the results are written as JSON, so runs
+on different commits can be compared:
+
+    python3 benchmarks/bench_suite.py --output before.json
+    python3 benchmarks/bench_suite.py --output after.json --compare before.json
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import socket
+import argparse
+import platform
+import subprocess
+import contextlib
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from app_index import AppIndex
+from search_index import SearchIndex, SearchSession
+from smart_cli_launcher import SmartCLILauncher
+from bench_categorizer import best_of
+from fixtures import SystemFixture
+
+SCALES = [1000, 10000, 100000]
+QUERIES = ['c', 'co', 'ff', 'gitdev', 'kalo', 'zentorpix', 'code']
+SCHEMA = 1
+
+# A timing this much slower than the baseline is flagged by --compare
+REGRESSION = 1.2
+# ... and at least this many seconds slower, so sub-millisecond noise is ignored
+NOISE = 0.002
+
+
+def git_revision():
+    """Commit of the working tree (with '+dirty' when modified), or None"""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    try:
+        revision = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=root,
+                                  capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=root,
+                               capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return revision + ('+dirty' if dirty else '')
+
+
+@contextlib.contextmanager
+def environment(values):
+    """Temporarily set environment variables"""
+    saved = {key: os.environ.get(key) for key in values}
+    os.environ.update(values)
+    try:
+        yield
+    finally:
+        for key, value in saved.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+
+def quiet(func):
+    """Run ``func`` with stdout discarded (the launchers report progress)"""
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            return func()
+    return run
+
+
+def cli_launcher(fixture, fresh_cache):
+    """SmartCLILauncher scanning the fixture, without the daemon"""
+    if fresh_cache:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(os.path.join(fixture.environ()['XDG_CACHE_HOME'], 'smart-launcher', 'index.json'))
+    launcher = SmartCLILauncher(use_daemon=False)
+    launcher.detector = fixture.detector()
+    launcher.index = AppIndex(launcher.detector)
+    launcher.load_applications()
+    return launcher
+
+
+def list_categories(launcher, page_size=20):
+    """What the CLI does per category: rank its apps and format the first page"""
+    lines = []
+    for category in launcher.category_counts:
+        for i, app in enumerate(launcher.category_apps(category)[:page_size], 1):
+            lines.append(f"{i:3d}. ⚡ {app['name'][:40]:<43} [{app['type']}] {app['description'][:30]}")
+    return lines
+
+
+def run_scale(scale, desktop_share, repeat, seed):
+    """Timings (seconds) of every stage for one fixture size"""
+    desktop = int(scale * desktop_share)
+    timings = {}
+    started = time.perf_counter()
+    with SystemFixture(desktop=desktop, commands=scale - desktop, seed=seed) as fixture, \
+            environment(fixture.environ()):
+        fixture_time = time.perf_counter() - started
+        detector = fixture.detector()
+
+        timings['scan_desktop'], desktop_apps = best_of(repeat, detector._scan_desktop_files)
+        timings['scan_path'], path_apps = best_of(repeat, detector._scan_path_commands)
+        timings['merge'], all_apps = best_of(repeat, lambda: detector.merge_apps(desktop_apps, path_apps))
+        items = list(all_apps.items())
+
+        timings['categorize'], _ = best_of(repeat, lambda: [
+            detector._categorize_application(name, info) for name, info in items])
+        timings['categorize_batch'], _ = best_of(repeat, lambda: detector.categorize_batch(items))
+        timings['build_categories'], apps_by_category = best_of(
+            repeat, lambda: detector.build_categories(all_apps))
+
+        timings['search_index_build'], index = best_of(repeat, lambda: SearchIndex(apps_by_category))
+        timings['search'], _ = best_of(repeat, lambda: [
+            index.search_ids(query) for query in QUERIES])
+
+        def type_queries():
+            for query in QUERIES:
+                session = SearchSession(index)
+                for end in range(1, len(query) + 1):
+                    session.search_ids(query[:end])
+        timings['search_typing'], _ = best_of(repeat, type_queries)
+
+        timings['cli_load_cold'], _ = best_of(repeat, quiet(lambda: cli_launcher(fixture, fresh_cache=True)))
+        timings['cli_load_warm'], launcher = best_of(repeat, quiet(lambda: cli_launcher(fixture, fresh_cache=False)))
+        timings['cli_list'], _ = best_of(repeat, lambda: list_categories(launcher))
+
+    return {
+        'scale': scale,
+        'desktop_files': desktop,
+        'executables': scale - desktop,
+        'desktop_apps': len(desktop_apps),
+        'path_apps': len(path_apps),
+        'fixture_seconds': fixture_time,
+        'timings': timings,
+    }
+
+
+def compare(results, baseline):
+    """Print each timing relative to a previous run; returns the number of regressions"""
+    previous = {entry['scale']: entry['timings'] for entry in baseline.get('results', [])}
+    regressions = 0
+    print(f"\n📈 Against {baseline.get('meta', {}).get('revision') or 'baseline'}")
+    for entry in results:
+        before = previous.get(entry['scale'])
+        if before is None:
+            continue
+        for stage, seconds in entry['timings'].items():
+            if not before.get(stage):
+                continue
+            ratio = seconds / before[stage]
+            regressed = ratio > REGRESSION and seconds - before[stage] > NOISE
+            mark = '❌' if regressed else '  '
+            regressions += regressed
+            print(f" {mark} {entry['scale']:>7} {stage:<20} {before[stage] * 1000:9.1f} ms → "
+                  f"{seconds * 1000:9.1f} ms  ({ratio:.2f}x)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--scales', default=','.join(map(str, SCALES)),
+                        help='comma-separated app counts (default: %(default)s)')
+    parser.add_argument('--desktop-share', type=float, default=0.2,
+                        help='fraction of apps generated as .desktop files (default: %(default)s)')
+    parser.add_argument('--repeat', type=int, default=3, help='repetitions (best is reported)')
+    parser.add_argument('--seed', type=int, default=42, help='fixture generator seed')
+    parser.add_argument('--output', help='write results as JSON to this file')
+    parser.add_argument('--compare', help='previous results file to compare against')
+    args = parser.parse_args()
+
+    meta = {
+        'schema': SCHEMA,
+        'revision': git_revision(),
+        'date': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'host': socket.gethostname(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'repeat': args.repeat,
+        'seed': args.seed,
+        'desktop_share': args.desktop_share,
+    }
+
+    results = []
+    for scale in (int(value) for value in args.scales.split(',')):
+        entry = run_scale(scale, args.desktop_share, args.repeat, args.seed)
+        results.append(entry)
+        print(f"📊 {scale} apps ({entry['desktop_files']} .desktop, {entry['executables']} executables; "
+              f"fixture written in {entry['fixture_seconds']:.1f} s)")
+        for stage, seconds in entry['timings'].items():
+            print(f"   {stage:<20} {seconds * 1000:9.1f} ms")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'meta': meta, 'results': results}, f, indent=2)
+            f.write('\n')
+        print(f"💾 Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            regressions = compare(results, json.load(f))
+        if regressions:
+            print(f"❌ {regressions} timing(s) more than {REGRESSION:.1f}x slower")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
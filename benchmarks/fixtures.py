@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Synthetic system fixtures for the benchmarks.
+
+Builds a fake filesystem in a temporary tree: .desktop files spread over
+the XDG application directories and executables spread over several
+PATH directories, with names, descriptions and categories drawn from a
+seeded generator so every run (and every commit) sees the same system.
+FixtureDetector is an ApplicationDetector that scans that tree instead
+of the real one.
+
+    with SystemFixture(desktop=1000, commands=9000) as fixture:
+        apps = fixture.detector().detect_applications()
+"""
+
+import os
+import sys
+import random
+import shutil
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from smart_launcher import ApplicationDetector
+from bench_categorizer import SYLLABLES, DESCRIPTIONS
+
+# Relative to the fixture root, in lookup order
+DESKTOP_DIRS = ['usr/share/applications', 'usr/local/share/applications',
+                'home/.local/share/applications']
+PATH_DIRS = ['home/.local/bin', 'usr/local/bin', 'usr/bin', 'usr/sbin', 'opt/tools/bin']
+
+# Desktop directories get most entries from the system one, like real systems
+DESKTOP_WEIGHTS = [0.8, 0.1, 0.1]
+PATH_WEIGHTS = [0.05, 0.1, 0.7, 0.1, 0.05]
+
+CATEGORIES = ['Utility;', 'Development;IDE;', 'Network;WebBrowser;', 'AudioVideo;Player;',
+              'Graphics;2DGraphics;', 'Office;WordProcessor;', 'Game;ArcadeGame;', 'System;Monitor;', '']
+LOCALES = ['de', 'es', 'fa', 'fr', 'ja', 'pt_BR', 'ru', 'zh_CN']
+
+# Share of desktop entries that point at one of the generated commands
+LINKED_EXEC = 0.5
+
+
+def app_name(rng, i):
+    return ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))) + str(i)
+
+
+def desktop_entry_text(rng, name, command):
+    """Contents of a .desktop file with localized keys and an action group"""
+    lines = [
+        '[Desktop Entry]',
+        'Type=Application',
+        f'Name={name.capitalize()}',
+        f'GenericName={rng.choice(DESCRIPTIONS)}',
+        f'Comment={rng.choice(DESCRIPTIONS)} {name}',
+        f'Exec={command} %U',
+        f'Icon={name}',
+        f'Categories={rng.choice(CATEGORIES)}',
+    ]
+    for locale in rng.sample(LOCALES, rng.randint(0, len(LOCALES))):
+        lines.append(f'Name[{locale}]={name} ({locale})')
+        lines.append(f'Comment[{locale}]=Localized comment ({locale})')
+    if rng.random() < 0.05:
+        lines.append('NoDisplay=true')
+    lines.append('Actions=new-window;')
+    lines.append('')
+    lines.append('[Desktop Action new-window]')
+    lines.append('Name=New Window')
+    lines.append(f'Exec={command} --new-window')
+    return '\n'.join(lines) + '\n'
+
+
+def spread(count, weights):
+    """Split ``count`` items over buckets by weight, exactly"""
+    sizes = [int(count * weight) for weight in weights]
+    sizes[0] += count - sum(sizes)
+    return sizes
+
+
+class SystemFixture:
+    """Temporary tree with ``desktop`` .desktop files and ``commands`` executables"""
+
+    def __init__(self, desktop, commands, seed=42, root=None):
+        self.desktop = desktop
+        self.commands = commands
+        self.seed = seed
+        self.root = Path(root) if root else None
+        self._tmp = None
+
+    def __enter__(self):
+        if self.root is None:
+            self._tmp = tempfile.mkdtemp(prefix='smart-launcher-fixture-')
+            self.root = Path(self._tmp)
+        self.build()
+        return self
+
+    def __exit__(self, *exc):
+        if self._tmp is not None:
+            shutil.rmtree(self._tmp, ignore_errors=True)
+
+    @property
+    def desktop_dirs(self):
+        return [str(self.root / directory) for directory in DESKTOP_DIRS]
+
+    @property
+    def path_dirs(self):
+        return [str(self.root / directory) for directory in PATH_DIRS]
+
+    def build(self):
+        """Write the tree; the same seed always gives the same files"""
+        rng = random.Random(self.seed)
+        for directory in self.desktop_dirs + self.path_dirs:
+            os.makedirs(directory, exist_ok=True)
+
+        commands = []
+        i = 0
+        for directory, size in zip(self.path_dirs, spread(self.commands, PATH_WEIGHTS)):
+            for _ in range(size):
+                name = app_name(rng, i)
+                i += 1
+                path = os.path.join(directory, name)
+                with open(path, 'w') as f:
+                    f.write('#!/bin/sh\n')
+                os.chmod(path, 0o755)
+                commands.append(name)
+
+        for directory, size in zip(self.desktop_dirs, spread(self.desktop, DESKTOP_WEIGHTS)):
+            for _ in range(size):
+                name = app_name(rng, i)
+                i += 1
+                command = rng.choice(commands) if commands and rng.random() < LINKED_EXEC else name
+                with open(os.path.join(directory, f'{name}.desktop'), 'w', encoding='utf-8') as f:
+                    f.write(desktop_entry_text(rng, name, command))
+
+    def environ(self):
+        """Environment pointing PATH and the XDG cache/data homes into the fixture"""
+        return {
+            'PATH': os.pathsep.join(self.path_dirs),
+            'XDG_CACHE_HOME': str(self.root / 'home/.cache'),
+            'XDG_DATA_HOME': str(self.root / 'home/.local/share'),
+        }
+
+    def detector(self):
+        return FixtureDetector(self.desktop_dirs, self.path_dirs)
+
+
+class FixtureDetector(ApplicationDetector):
+    """ApplicationDetector scanning fixture directories instead of the system"""
+
+    def __init__(self, desktop_dirs, path_dirs):
+        super().__init__()
+        self._desktop_dirs = list(desktop_dirs)
+        self._path_dirs = list(path_dirs)
+
+    def desktop_dirs(self):
+        return list(self._desktop_dirs)
+
+    def path_dirs(self):
+        return list(self._path_dirs)
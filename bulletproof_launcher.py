@@ -11,265 +11,498 @@ Features:
 - Zero-crash architecture
 """
 
+import time
+
+# Taken before the heavy imports, for --startup-trace
+MODULE_START = time.perf_counter()
+
 import sys
 import os
-import subprocess
-import configparser
-import threading
-import json
-from pathlib import Path
-from collections import defaultdict
+import socket
+from collections import OrderedDict
+
+import tracing
+from runtime_dir import runtime_dir
+
+# Single instance: the first launcher stays resident and later invocations
+# only ask it to show itself
+INSTANCE_TIMEOUT = 1.0
+
+
+def instance_socket_path():
+    """Socket of the resident GUI, in XDG_RUNTIME_DIR when available (see runtime_dir.py)"""
+    return os.path.join(runtime_dir(), 'gui.sock')
+
+
+def send_instance_command(command):
+    """Send a command to the resident launcher; True if it acknowledged"""
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(INSTANCE_TIMEOUT)
+            sock.connect(instance_socket_path())
+            sock.sendall(command.encode('utf-8') + b'\n')
+            return sock.recv(16).startswith(b'ok')
+    except OSError:
+        return False
+
+
+if __name__ == "__main__":
+    # Profiling measures this process, so it never hands over to a resident one
+    sys.argv = tracing.enable_from_argv(sys.argv)
+    if tracing.enabled() and '--new-instance' not in sys.argv:
+        sys.argv.append('--new-instance')
+
+if __name__ == "__main__" and '--launch-stats' in sys.argv:
+    from launch_stats import print_report
+    sys.exit(print_report())
+
+# Plain sockets, before Qt is even imported: summoning the running
+# instance costs little more than starting the interpreter
+if __name__ == "__main__" and '--new-instance' not in sys.argv:
+    if '--quit' in sys.argv:
+        sys.exit(0 if send_instance_command('quit') else 1)
+    if send_instance_command('show'):
+        sys.exit(0)
 
 try:
-    from PyQt5.QtWidgets import *
-    from PyQt5.QtCore import *
-    from PyQt5.QtGui import *
+    from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QHBoxLayout, QVBoxLayout,
+                                 QLabel, QPushButton, QLineEdit, QListView, QAbstractItemView,
+                                 QStyledItemDelegate, QStyle, QMessageBox, QSystemTrayIcon, QMenu)
+    from PyQt5.QtCore import (Qt, QObject, QThread, QThreadPool, QRunnable, QTimer, QEvent, QSize,
+                              QRect, QModelIndex, QAbstractListModel, QAbstractProxyModel,
+                              pyqtSignal)
+    from PyQt5.QtGui import QColor, QFont, QFontMetrics, QPainter, QPen, QIcon, QImage, QPixmap
+    from PyQt5.QtNetwork import QLocalServer
 except ImportError:
     print("❌ Error: PyQt5 not installed!")
     print("📦 Install with: pip install PyQt5")
     sys.exit(1)
 
+from smart_launcher import ApplicationDetector
+from app_index import AppIndex, apply_delta
+from search_index import SearchIndex, SearchSession
+from usage_store import UsageStore
+from launch_engine import LaunchEngine, LaunchError
+from launch_stats import LaunchStats
+from icon_theme import IconTheme, thumbnail_path
+
+MODULES_LOADED = time.perf_counter()
+
 
-class ApplicationDetector:
-    """Intelligent application detection and categorization engine"""
+def process_age():
+    """Seconds since this process was created (exec), or None if unknown"""
+    try:
+        with open('/proc/self/stat', 'rb') as f:
+            # Fields after the parenthesized command name; starttime is field 22
+            fields = f.read().rsplit(b')', 1)[1].split()
+        start_ticks = int(fields[19])
+        now = time.clock_gettime(time.CLOCK_BOOTTIME)
+        return now - start_ticks / os.sysconf('SC_CLK_TCK')
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+class StartupTrace:
+    """Startup timestamps relative to process creation, printed with --startup-trace"""
     
-    def __init__(self):
-        self.categories = {
-            'Programming': ['code', 'editor', 'ide', 'python', 'java', 'git', 'vim'],
-            'Security': ['security', 'hack', 'nmap', 'wireshark', 'metasploit', 'burp'],  
-            'System': ['system', 'monitor', 'htop', 'top', 'kill', 'systemctl'],
-            'Internet': ['browser', 'firefox', 'chrome', 'wget', 'curl', 'thunderbird'],
-            'Media': ['video', 'audio', 'vlc', 'mpv', 'gimp', 'blender', 'spotify'],
-            'Office': ['office', 'document', 'libreoffice', 'writer', 'calc', 'pdf'],
-            'Graphics': ['graphics', 'design', 'gimp', 'inkscape', 'krita', 'darktable'],
-            'Games': ['game', 'steam', 'lutris', 'wine', 'emulator']
-        }
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.origin = None
+        self.last = None
         
-    def detect_applications(self):
-        """Detect all applications in the system"""
-        print("Scanning system for applications...")
-        
-        apps_by_category = {}
-        for cat in self.categories:
-            apps_by_category[cat] = []
-        apps_by_category['Other'] = []
-        
-        # Scan desktop applications
-        desktop_apps = self._scan_desktop_files()
-        print(f"Found {len(desktop_apps)} desktop applications")
-        
-        # Scan command line tools
-        path_apps = self._scan_path_commands()
-        print(f"Found {len(path_apps)} command line tools")
-        
-        # Merge and categorize all applications
-        all_apps = {**desktop_apps, **path_apps}
-        
-        for name, info in all_apps.items():
-            category = self._categorize_application(name, info)
-            apps_by_category[category].append({
-                'name': name,
-                'command': info.get('command', name),
-                'description': info.get('description', 'Application'),
-                'type': info.get('type', 'unknown')
-            })
-        
-        # Sort applications by name
-        for cat in apps_by_category:
-            apps_by_category[cat].sort(key=lambda x: x['name'].lower())
-            
-        return apps_by_category
+    def mark(self, label, when=None):
+        if not self.enabled:
+            return
+        when = time.perf_counter() if when is None else when
+        if self.origin is None:
+            age = process_age()
+            # Clock ticks are coarse (10 ms); fall back to the module start
+            self.origin = time.perf_counter() - age if age is not None else MODULE_START
+            self.last = self.origin
+            print("⏱️  Startup trace (ms since process start)")
+        print(f"⏱️  {(when - self.origin) * 1000:8.1f}  (+{(when - self.last) * 1000:7.1f})  {label}")
+        self.last = when
+
+
+class AppListModel(QAbstractListModel):
+    """Flat list of app records; a view reads them through AppFilterProxy"""
     
-    def _scan_desktop_files(self):
-        """اسکن فایل‌های .desktop"""
-        apps = {}
-        desktop_dirs = [
-            '/usr/share/applications',
-            '/usr/local/share/applications',
-            os.path.expanduser('~/.local/share/applications')
-        ]
-        
-        for desktop_dir in desktop_dirs:
-            if not os.path.exists(desktop_dir):
-                continue
-                
-            for file_path in Path(desktop_dir).glob('*.desktop'):
-                try:
-                    config = configparser.ConfigParser()
-                    config.read(file_path, encoding='utf-8')
-                    
-                    if 'Desktop Entry' not in config:
-                        continue
-                        
-                    entry = config['Desktop Entry']
-                    if entry.get('NoDisplay', '').lower() == 'true':
-                        continue
-                        
-                    name = entry.get('Name', file_path.stem)
-                    command = entry.get('Exec', '')
-                    description = entry.get('Comment', entry.get('GenericName', 'Desktop Application'))
-                    
-                    if command:
-                        command = command.split()[0]
-                        
-                    apps[name] = {
-                        'command': command,
-                        'description': description,
-                        'type': 'desktop'
-                    }
-                    
-                except Exception:
-                    continue
-                    
-        return apps
+    AppRole = Qt.UserRole + 1
     
-    def _scan_path_commands(self):
-        """اسکن دستورات PATH - محدود شده"""
-        apps = {}
-        path_dirs = os.environ.get('PATH', '').split(':')
-        
-        # محدود کردن تعداد برای جلوگیری از crash
-        max_commands = 1000
-        count = 0
-        
-        for path_dir in path_dirs:
-            if count >= max_commands:
-                break
-                
-            if not os.path.exists(path_dir):
-                continue
-                
-            try:
-                for file_path in Path(path_dir).iterdir():
-                    if count >= max_commands:
-                        break
-                        
-                    if (file_path.is_file() and 
-                        os.access(file_path, os.X_OK) and
-                        not file_path.name.startswith('.') and
-                        len(file_path.name) > 2):
-                        
-                        name = file_path.name
-                        apps[name] = {
-                            'command': name,
-                            'description': f'Command line tool',
-                            'type': 'cli'
-                        }
-                        count += 1
-                        
-            except (PermissionError, OSError):
-                continue
-                
-        return apps
+    def __init__(self):
+        super().__init__()
+        self.apps = []
+        
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.apps)
+        
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        app = self.apps[index.row()]
+        if role == self.AppRole:
+            return app
+        if role == Qt.DisplayRole:
+            return app['name']
+        if role == Qt.ToolTipRole:
+            return f"{app['description']}\n{app['command']}"
+        return None
+        
+    def set_apps(self, apps):
+        """Replace the records (only if they are a different list)"""
+        if apps is self.apps:
+            return
+        self.beginResetModel()
+        self.apps = apps
+        self.endResetModel()
+        
+    def append_apps(self, apps):
+        start = len(self.apps)
+        self.beginInsertRows(QModelIndex(), start, start + len(apps) - 1)
+        self.apps.extend(apps)
+        self.endInsertRows()
+
+
+class AppFilterProxy(QAbstractProxyModel):
+    """Shows an ordered subset of the source rows.
     
-    def _categorize_application(self, name, info):
-        """Determine application category"""
-        name_lower = name.lower()
-        description_lower = info.get('description', '').lower()
-        command_lower = info.get('command', '').lower()
-        
-        for category, keywords in self.categories.items():
-            for keyword in keywords:
-                if (keyword in name_lower or 
-                    keyword in description_lower or 
-                    keyword in command_lower):
-                    return category
-                    
-        return 'Other'
-
-
-class AppCard(QWidget):
-    """Simple and elegant card for applications"""
+    Search results are already ranked source row ids, so filtering is one
+    set_rows() call instead of a per-row filterAcceptsRow callback.
+    """
     
-    clicked = pyqtSignal(dict)
+    def __init__(self):
+        super().__init__()
+        self.rows = []
+        self._positions = None
+        
+    def set_rows(self, rows):
+        self.beginResetModel()
+        self.rows = list(rows)
+        self._positions = None
+        self.endResetModel()
+        
+    def append_rows(self, rows):
+        rows = list(rows)
+        if not rows:
+            return
+        start = len(self.rows)
+        self.beginInsertRows(QModelIndex(), start, start + len(rows) - 1)
+        self.rows.extend(rows)
+        self._positions = None
+        self.endInsertRows()
+        
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+        
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else 1
+        
+    def index(self, row, column=0, parent=QModelIndex()):
+        if parent.isValid() or not 0 <= row < len(self.rows) or column != 0:
+            return QModelIndex()
+        return self.createIndex(row, column)
+        
+    def parent(self, index=None):
+        return QModelIndex()
+        
+    def mapToSource(self, proxy_index):
+        if not proxy_index.isValid() or self.sourceModel() is None:
+            return QModelIndex()
+        return self.sourceModel().index(self.rows[proxy_index.row()], 0)
+        
+    def mapFromSource(self, source_index):
+        if not source_index.isValid():
+            return QModelIndex()
+        if self._positions is None:
+            self._positions = {row: position for position, row in enumerate(self.rows)}
+        position = self._positions.get(source_index.row())
+        return QModelIndex() if position is None else self.createIndex(position, 0)
+
+
+class IconTask(QRunnable):
+    """Finds, decodes and scales one icon on the loader's thread pool"""
     
-    def __init__(self, app_data):
+    def __init__(self, loader, name):
         super().__init__()
-        self.app_data = app_data
-        self.setup_ui()
+        self.loader = loader
+        self.name = name
         
-    def setup_ui(self):
-        self.setFixedSize(300, 80)
-        self.setStyleSheet("""
-            AppCard {
-                background-color: #f8f9fa;
-                border: 2px solid #dee2e6;
-                border-radius: 8px;
-                margin: 4px;
-            }
-            AppCard:hover {
-                background-color: #e3f2fd;
-                border: 2px solid #2196f3;
-            }
-        """)
-        
-        layout = QHBoxLayout(self)
-        layout.setContentsMargins(12, 8, 12, 8)
+    def run(self):
+        self.loader.task_done.emit(self.name, load_icon_image(self.loader.theme, self.name,
+                                                              self.loader.ICON_SIZE))
+
+
+def load_icon_image(theme, name, pixels):
+    """Icon scaled to ``pixels``, from the thumbnail cache when possible; None if not found"""
+    path = theme.lookup(name, pixels)
+    if path is None:
+        return None
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+        
+    thumbnail = thumbnail_path(path, st, pixels)
+    image = QImage(thumbnail)
+    if not image.isNull():
+        return image
+        
+    image = QImage(path)
+    if image.isNull():
+        return None
+    if max(image.width(), image.height()) == pixels and path.endswith('.png'):
+        # Already what a thumbnail would be
+        return image
+    image = image.scaled(pixels, pixels, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+    try:
+        os.makedirs(os.path.dirname(thumbnail), exist_ok=True)
+        image.save(thumbnail, 'PNG')
+    except OSError:
+        pass
+    return image
+
+
+class IconLoader(QObject):
+    """App icons, loaded only when a card is painted.
+    
+    Lookup and decoding run on a small thread pool (QImage is safe off
+    the GUI thread, QPixmap is not); finished icons become pixmaps in an
+    LRU on the GUI thread and icon_ready asks the view to repaint.
+    Queued requests are dropped when the visible rows change.
+    """
+    
+    ICON_SIZE = 48
+    CACHE_SIZE = 512
+    
+    icon_ready = pyqtSignal()
+    task_done = pyqtSignal(str, object)
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.theme = IconTheme(QIcon.themeName() or None)
+        # {icon name: QPixmap, or None when there is no such icon}
+        self.pixmaps = OrderedDict()
+        self.pending = set()
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(2)
+        self.task_done.connect(self.on_task_done)
+        
+    def pixmap(self, name):
+        """Cached pixmap of an icon, or None while it loads or if it does not exist"""
+        if name in self.pixmaps:
+            self.pixmaps.move_to_end(name)
+            return self.pixmaps[name]
+        if name not in self.pending:
+            self.pending.add(name)
+            self.pool.start(IconTask(self, name))
+        return None
+        
+    def cancel_pending(self):
+        """Forget queued requests; cards still visible ask again when repainted"""
+        self.pool.clear()
+        self.pending.clear()
+        
+    def on_task_done(self, name, image):
+        self.pending.discard(name)
+        self.pixmaps[name] = QPixmap.fromImage(image) if image is not None else None
+        self.pixmaps.move_to_end(name)
+        while len(self.pixmaps) > self.CACHE_SIZE:
+            self.pixmaps.popitem(last=False)
+        self.icon_ready.emit()
+
+
+class AppCardDelegate(QStyledItemDelegate):
+    """Paints an app card; only visible cells are ever painted"""
+    
+    CARD_SIZE = QSize(300, 80)
+    
+    def __init__(self, parent=None, icons=None):
+        super().__init__(parent)
+        self.icons = icons
+        self.icon_font = QFont()
+        self.icon_font.setPixelSize(24)
+        self.name_font = QFont()
+        self.name_font.setPixelSize(13)
+        self.name_font.setBold(True)
+        self.description_font = QFont()
+        self.description_font.setPixelSize(11)
+        self.type_font = QFont()
+        self.type_font.setPixelSize(10)
+        self.type_font.setBold(True)
+        
+    def sizeHint(self, option, index):
+        return self.CARD_SIZE
+        
+    def paint(self, painter, option, index):
+        with tracing.span('paint_card'):
+            self.paint_card(painter, option, index)
+            
+    def paint_card(self, painter, option, index):
+        app = index.data(AppListModel.AppRole)
+        if app is None:
+            return
+            
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        
+        # Card
+        rect = option.rect.adjusted(4, 4, -4, -4)
+        if option.state & QStyle.State_MouseOver:
+            painter.setPen(QPen(QColor('#2196f3'), 2))
+            painter.setBrush(QColor('#e3f2fd'))
+        else:
+            painter.setPen(QPen(QColor('#dee2e6'), 2))
+            painter.setBrush(QColor('#f8f9fa'))
+        painter.drawRoundedRect(rect, 8, 8)
         
         # Icon
-        icon_label = QLabel()
-        icon_label.setFixedSize(48, 48)
-        icon_label.setAlignment(Qt.AlignCenter)
-        
-        # Emoji icons based on type
-        if self.app_data['type'] == 'desktop':
-            icon_label.setText('📱')
+        desktop = app['type'] == 'desktop'
+        icon_rect = QRect(rect.left() + 12, rect.top() + (rect.height() - 48) // 2, 48, 48)
+        pixmap = self.icons.pixmap(app['icon']) if self.icons is not None and app.get('icon') else None
+        if pixmap is not None:
+            target = QRect(0, 0, pixmap.width(), pixmap.height())
+            target.moveCenter(icon_rect.center())
+            painter.drawPixmap(target, pixmap)
         else:
-            icon_label.setText('⚡')
-        icon_label.setStyleSheet("font-size: 24px;")
-        
-        # Info
-        info_widget = QWidget()
-        info_layout = QVBoxLayout(info_widget)
-        info_layout.setContentsMargins(0, 0, 0, 0)
-        info_layout.setSpacing(2)
-        
-        # Name
-        name_label = QLabel(self.app_data['name'])
-        name_label.setStyleSheet("font-weight: bold; color: #212529; font-size: 13px;")
-        name_label.setWordWrap(True)
-        
-        # Description
-        description = self.app_data['description']
-        if len(description) > 50:
-            description = description[:47] + '...'
-        description_label = QLabel(description)
-        description_label.setStyleSheet("color: #6c757d; font-size: 11px;")
-        description_label.setWordWrap(True)
-        
-        # Type
-        type_text = '📱 GUI App' if self.app_data['type'] == 'desktop' else '⚡ CLI Tool'
-        type_label = QLabel(type_text)
-        type_label.setStyleSheet("color: #28a745; font-size: 10px; font-weight: bold;")
-        
-        info_layout.addWidget(name_label)
-        info_layout.addWidget(description_label)
-        info_layout.addWidget(type_label)
-        
-        layout.addWidget(icon_label)
-        layout.addWidget(info_widget)
-        
-    def mousePressEvent(self, event):
-        if event.button() == Qt.LeftButton:
-            self.clicked.emit(self.app_data)
+            painter.setFont(self.icon_font)
+            painter.setPen(QColor('#212529'))
+            painter.drawText(icon_rect, Qt.AlignCenter, '📱' if desktop else '⚡')
+        
+        # Name, description and type, one line each
+        left = icon_rect.right() + 10
+        width = rect.right() - 12 - left
+        top = rect.top() + 8
+        lines = (
+            (self.name_font, '#212529', app['name']),
+            (self.description_font, '#6c757d', app['description']),
+            (self.type_font, '#28a745', '📱 GUI App' if desktop else '⚡ CLI Tool'),
+        )
+        for font, color, text in lines:
+            metrics = QFontMetrics(font)
+            painter.setFont(font)
+            painter.setPen(QColor(color))
+            painter.drawText(QRect(left, top, width, metrics.height()), Qt.AlignLeft | Qt.AlignVCenter,
+                             metrics.elidedText(text, Qt.ElideRight, width))
+            top += metrics.height() + 2
             
-    def enterEvent(self, event):
-        self.setCursor(Qt.PointingHandCursor)
-        
-    def leaveEvent(self, event):
-        self.setCursor(Qt.ArrowCursor)
+        painter.restore()
 
 
 class BulletproofLauncher(QMainWindow):
     """🚀 Bulletproof Launcher - Crash Free!"""
     
-    def __init__(self):
+    def __init__(self, trace=None, resident=False):
         super().__init__()
-        self.detector = AppDetector()
+        self.trace = trace or StartupTrace()
+        self.resident = resident
+        self.quitting = False
+        self.instance_server = None
+        self.tray = None
+        self.detector = ApplicationDetector()
+        self.index = AppIndex(self.detector)
         self.all_apps = {}
         self.current_category = 'All'
+        self.app_loader = None
+        self.watcher = None
+        self.search_index = None
+        self.search_session = None
+        self.usage = UsageStore().load()
+        self.launch_engine = LaunchEngine(telemetry=LaunchStats())
+        self.icon_loader = IconLoader(self)
+        self.search_scheduler = SearchScheduler(self)
+        self.search_scheduler.results_ready.connect(self.on_search_results)
+        self.watcher_bridge = AppWatcherBridge()
+        self.watcher_bridge.apps_changed.connect(self.on_apps_changed)
+        self.index_builder = SearchIndexBuilder(self)
+        self.index_builder.index_ready.connect(self.on_search_index_rebuilt)
+        self.touched_categories = set()
         self.setup_ui()
-        self.load_apps()
+        if self.trace.enabled:
+            self.app_view.viewport().installEventFilter(self)
+        self.load_apps(from_cache=True)
+        if resident:
+            self.start_instance_server()
+        
+    def start_instance_server(self):
+        """Listen for show/quit commands from later invocations"""
+        try:
+            path = instance_socket_path()
+        except OSError as e:
+            print(f"⚠️  Single-instance server disabled: {e}")
+            self.resident = False
+            return
+        # Another launcher may have started since the check before Qt was
+        # loaded; only a socket nobody answers on is stale
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.settimeout(INSTANCE_TIMEOUT)
+                sock.connect(path)
+        except OSError:
+            QLocalServer.removeServer(path)
+        else:
+            print("⚠️  Another launcher instance is already resident; this one will not stay resident")
+            self.resident = False
+            return
+        self.instance_server = QLocalServer(self)
+        self.instance_server.setSocketOptions(QLocalServer.UserAccessOption)
+        if not self.instance_server.listen(path):
+            print(f"⚠️  Single-instance server failed: {self.instance_server.errorString()}")
+            self.instance_server = None
+            self.resident = False
+            return
+        self.instance_server.newConnection.connect(self.on_instance_connection)
+        
+        if QSystemTrayIcon.isSystemTrayAvailable():
+            icon_path = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                     'bulletproof_launcher_icon_64.png')
+            self.tray = QSystemTrayIcon(QIcon(icon_path), self)
+            menu = QMenu(self)
+            menu.addAction("🚀 Show", self.summon)
+            menu.addAction("❌ Quit", self.quit_launcher)
+            self.tray.setContextMenu(menu)
+            self.tray.activated.connect(
+                lambda reason: self.summon() if reason == QSystemTrayIcon.Trigger else None)
+            self.tray.show()
+            
+    def on_instance_connection(self):
+        while self.instance_server.hasPendingConnections():
+            connection = self.instance_server.nextPendingConnection()
+            connection.readyRead.connect(lambda connection=connection: self.on_instance_command(connection))
+            connection.disconnected.connect(connection.deleteLater)
+            
+    def on_instance_command(self, connection):
+        if not connection.canReadLine():
+            return
+        command = bytes(connection.readLine()).decode('utf-8', 'replace').strip()
+        connection.write(b'ok\n' if command in ('show', 'quit') else b'error\n')
+        connection.flush()
+        connection.disconnectFromServer()
+        if command == 'show':
+            self.summon()
+        elif command == 'quit':
+            self.quit_launcher()
+            
+    def summon(self):
+        """Show, raise and focus the window with a cleared search box"""
+        self.search_input.clear()
+        self.showNormal()
+        self.raise_()
+        self.activateWindow()
+        self.search_input.setFocus()
+        
+    def quit_launcher(self):
+        self.quitting = True
+        self.close()
+        QApplication.quit()
+        
+    def eventFilter(self, watched, event):
+        """--startup-trace: note when the first results get painted"""
+        if (event.type() == QEvent.Paint and watched is self.app_view.viewport() and
+                self.app_proxy.rowCount()):
+            watched.removeEventFilter(self)
+            # Runs once the paint event has been handled
+            QTimer.singleShot(0, lambda: self.trace.mark("first results painted"))
+        return super().eventFilter(watched, event)
         
     def setup_ui(self):
         self.setWindowTitle("🚀 BULLETPROOF LAUNCHER")
@@ -409,7 +642,7 @@ class BulletproofLauncher(QMainWindow):
                 border: 2px solid #2980b9;
             }
         """)
-        self.search_input.textChanged.connect(self.filter_apps)
+        self.search_input.textChanged.connect(self.on_search_text_changed)
         
         # Refresh button
         refresh_btn = QPushButton("🔄 Refresh")
@@ -445,13 +678,29 @@ class BulletproofLauncher(QMainWindow):
         """)
         content_layout.addWidget(self.category_title)
         
-        # Scroll area
-        scroll = QScrollArea()
-        scroll.setWidgetResizable(True)
-        scroll.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
-        scroll.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-        scroll.setStyleSheet("""
-            QScrollArea {
+        # App grid: a list view in icon mode over a proxy of the app model
+        self.app_model = AppListModel()
+        self.app_proxy = AppFilterProxy()
+        self.app_proxy.setSourceModel(self.app_model)
+        
+        self.app_view = QListView()
+        self.app_view.setModel(self.app_proxy)
+        self.app_view.setItemDelegate(AppCardDelegate(self.app_view, self.icon_loader))
+        self.icon_loader.icon_ready.connect(self.app_view.viewport().update)
+        self.app_view.verticalScrollBar().valueChanged.connect(self.icon_loader.cancel_pending)
+        self.app_view.setViewMode(QListView.IconMode)
+        self.app_view.setGridSize(QSize(310, 88))
+        self.app_view.setUniformItemSizes(True)
+        self.app_view.setMovement(QListView.Static)
+        self.app_view.setResizeMode(QListView.Adjust)
+        self.app_view.setLayoutMode(QListView.Batched)
+        self.app_view.setBatchSize(500)
+        self.app_view.setSelectionMode(QAbstractItemView.NoSelection)
+        self.app_view.setMouseTracking(True)
+        self.app_view.viewport().setCursor(Qt.PointingHandCursor)
+        self.app_view.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.app_view.setStyleSheet("""
+            QListView {
                 background-color: transparent;
                 border: none;
             }
@@ -466,29 +715,49 @@ class BulletproofLauncher(QMainWindow):
                 border-radius: 4px;
             }
         """)
+        self.app_view.clicked.connect(self.on_app_clicked)
+        self.app_view.activated.connect(self.on_app_clicked)
+        content_layout.addWidget(self.app_view)
         
-        # Apps widget
-        self.apps_widget = QWidget()
-        self.apps_layout = QVBoxLayout(self.apps_widget)
-        self.apps_layout.setSpacing(8)
-        self.apps_layout.setContentsMargins(5, 5, 5, 5)
-        
-        scroll.setWidget(self.apps_widget)
-        content_layout.addWidget(scroll)
+        self.empty_label = QLabel("😔 No applications found!")
+        self.empty_label.setAlignment(Qt.AlignCenter)
+        self.empty_label.setStyleSheet("font-size: 16px; color: rgba(255, 255, 255, 0.7); padding: 50px;")
+        self.empty_label.hide()
+        content_layout.addWidget(self.empty_label)
         
         main_layout.addWidget(content)
         
-    def load_apps(self):
-        """Load applications in background"""
+    def load_apps(self, from_cache=False):
+        """Load applications in background, streaming them into the view.
+        
+        With ``from_cache`` the on-disk index is shown right away, before
+        the window's first paint, and the worker only streams changes.
+        """
+        if self.app_loader is not None:
+            return
+            
+        self.index_builder.cancel()
+        self.all_apps = {}
+        self.search_index = None
+        self.search_session = None
         self.search_input.setEnabled(False)
         self.search_input.setPlaceholderText("🔄 Loading applications...")
         
+        cached = self.index.cached_applications() if from_cache else {}
+        if cached:
+            self.on_apps_batch({
+                'added': [(category, app) for category, apps in cached.items() for app in apps],
+                'removed': [],
+                'modified': [],
+            })
+        
         # Thread worker
         self.worker = QThread()
-        self.app_loader = AppLoader(self.detector)
+        self.app_loader = AppLoader(self.index, skip_cached=bool(cached))
         self.app_loader.moveToThread(self.worker)
         
         self.worker.started.connect(self.app_loader.run)
+        self.app_loader.batch_ready.connect(self.on_apps_batch)
         self.app_loader.finished.connect(self.on_apps_loaded)
         self.app_loader.finished.connect(self.worker.quit)
         self.app_loader.finished.connect(self.app_loader.deleteLater)
@@ -496,13 +765,76 @@ class BulletproofLauncher(QMainWindow):
         
         self.worker.start()
         
-    def on_apps_loaded(self, apps):
+    def on_apps_batch(self, delta):
+        """Show a batch of applications as soon as it is detected"""
+        with tracing.span('apps_batch', added=len(delta['added'])):
+            self.apply_batch(delta)
+            
+    def apply_batch(self, delta):
+        first_batch = not self.search_input.isEnabled()
+        apply_delta(self.all_apps, delta)
+        self.update_stats()
+        
+        if first_batch:
+            self.trace.mark(f"first batch shown ({len(delta['added'])} apps)")
+            self.search_input.setEnabled(True)
+            self.search_input.setPlaceholderText("🔍 Search applications...")
+            self.set_category(self.current_category)
+        elif delta['removed'] or delta['modified']:
+            self.filter_apps()
+        else:
+            search_text = self.search_input.text().lower().strip()
+            self.append_apps([
+                app for category, app in delta['added']
+                if self.current_category in ('All', category) and
+                (not search_text or self.matches_search(app, search_text))
+            ])
+        
+    def on_apps_loaded(self, apps, search_index):
         """After applications are loaded"""
+        self.app_loader = None
         self.all_apps = apps
+        self.search_index = search_index
+        self.search_session = SearchSession(search_index, usage=self.usage)
         self.search_input.setEnabled(True)
         self.search_input.setPlaceholderText("🔍 Search applications...")
         
-        # Update stats
+        self.update_stats()
+        
+        # Batches were appended in arrival order; settle on the ranked view
+        self.set_category(self.current_category)
+        
+        self.trace.mark("index revalidated, search ready")
+        
+        # Keep the index live from now on
+        if self.watcher is None:
+            from app_watcher import AppWatcher
+            self.watcher = AppWatcher(self.index, self.watcher_bridge.publish)
+            self.watcher.start()
+        
+    def on_apps_changed(self, delta):
+        """Apply an incremental delta pushed by the watcher"""
+        self.touched_categories |= apply_delta(self.all_apps, delta)
+        self.update_stats()
+        # The view keeps showing the current index until the new one is ready
+        self.index_builder.rebuild(self.all_apps, self.search_index)
+            
+        count = sum(len(delta[kind]) for kind in ('added', 'removed', 'modified'))
+        self.statusBar().showMessage(f"🔄 {count} application(s) updated", 3000)
+        
+    def on_search_index_rebuilt(self, search_index):
+        """Switch to the search index rebuilt after watcher deltas"""
+        touched, self.touched_categories = self.touched_categories, set()
+        self.search_index = search_index
+        self.search_session = SearchSession(search_index, usage=self.usage)
+        
+        # Only redraw if the visible list is affected
+        if self.current_category == 'All' or self.current_category in touched:
+            self.filter_apps()
+        
+    def update_stats(self):
+        """Refresh the sidebar statistics"""
+        apps = self.all_apps
         total = sum(len(app_list) for app_list in apps.values())
         categories = len([cat for cat, app_list in apps.items() if app_list])
         
@@ -521,9 +853,6 @@ class BulletproofLauncher(QMainWindow):
             
         self.stats_label.setText(stats_text)
         
-        # Show all apps
-        self.set_category('All')
-        
     def set_category(self, category):
         """تنظیم دسته فعال"""
         self.current_category = category
@@ -557,11 +886,36 @@ class BulletproofLauncher(QMainWindow):
         
         self.filter_apps()
         
+    def on_search_text_changed(self, text):
+        """Debounced search on the worker; the partial list while loading is small"""
+        if self.search_session is None:
+            self.filter_apps()
+        else:
+            self.search_scheduler.schedule(self.search_session, text, self.current_category)
+            
     def filter_apps(self):
         """Filter applications"""
+        if self.search_session is None:
+            self.search_scheduler.cancel()
+            with tracing.span('filter', query=self.search_input.text()):
+                apps = self.matching_apps()
+            self.display_apps(apps)
+            return
+            
+        self.search_scheduler.run_now(self.search_session, self.search_input.text(),
+                                      self.current_category)
+        
+    def on_search_results(self, session, ids):
+        """Apply the latest search result; only the proxy's row mapping changes"""
+        if session is not self.search_session:
+            return
+        self.app_model.set_apps(session.index.apps)
+        self.show_rows(ids)
+        
+    def matching_apps(self):
+        """Apps of the current category that match the search text (while loading)"""
         search_text = self.search_input.text().lower().strip()
         
-        # Get apps for current category
         if self.current_category == 'All':
             apps = []
             for app_list in self.all_apps.values():
@@ -571,52 +925,45 @@ class BulletproofLauncher(QMainWindow):
             
         # Filter by search
         if search_text:
-            filtered = []
-            for app in apps:
-                if (search_text in app['name'].lower() or 
-                    search_text in app['desc'].lower() or
-                    search_text in app['command'].lower()):
-                    filtered.append(app)
-            apps = filtered
+            apps = [app for app in apps if self.matches_search(app, search_text)]
+        else:
+            apps = self.usage.rank(apps)
             
-        self.display_apps(apps)
+        return apps
+        
+    def matches_search(self, app, search_text):
+        """Check if app matches the (lowercased) search text"""
+        return (search_text in app['name'].lower() or 
+                search_text in app['description'].lower() or
+                search_text in app['command'].lower())
+        
+    def show_rows(self, rows):
+        """Show these model rows, in order"""
+        with tracing.span('render_rows', rows=len(rows)):
+            self.icon_loader.cancel_pending()
+            self.app_proxy.set_rows(rows)
+            self.app_view.scrollToTop()
+            self.empty_label.setVisible(not self.app_proxy.rows)
         
     def display_apps(self, apps):
-        """Display applications"""
-        # Clear previous apps
-        for i in reversed(range(self.apps_layout.count())):
-            child = self.apps_layout.itemAt(i).widget()
-            if child:
-                child.setParent(None)
-                
+        """Display applications (a fresh model of just these records)"""
+        self.app_model.set_apps(list(apps))
+        self.show_rows(range(len(apps)))
+        
+    def append_apps(self, apps):
+        """Append applications to the view without rebuilding it"""
         if not apps:
-            empty = QLabel("😔 No applications found!")
-            empty.setAlignment(Qt.AlignCenter)
-            empty.setStyleSheet("font-size: 16px; color: rgba(255, 255, 255, 0.7); padding: 50px;")
-            self.apps_layout.addWidget(empty)
             return
+        start = len(self.app_model.apps)
+        self.app_model.append_apps(apps)
+        self.app_proxy.append_rows(range(start, start + len(apps)))
+        self.empty_label.hide()
+        
+    def on_app_clicked(self, index):
+        app_data = index.data(AppListModel.AppRole)
+        if app_data is not None:
+            self.launch_app(app_data)
             
-        # Create grid of cards (3 per row)
-        apps_per_row = 3
-        for i in range(0, len(apps), apps_per_row):
-            row_widget = QWidget()
-            row_layout = QHBoxLayout(row_widget)
-            row_layout.setContentsMargins(0, 0, 0, 0)
-            row_layout.setSpacing(10)
-            
-            for j in range(apps_per_row):
-                if i + j < len(apps):
-                    app = apps[i + j]
-                    card = AppCard(app)
-                    card.clicked.connect(self.launch_app)
-                    row_layout.addWidget(card)
-                else:
-                    row_layout.addStretch()
-                    
-            self.apps_layout.addWidget(row_widget)
-            
-        self.apps_layout.addStretch()
-        
     def launch_app(self, app_data):
         """Launch application"""
         command = app_data.get('command', '')
@@ -627,36 +974,202 @@ class BulletproofLauncher(QMainWindow):
             return
             
         try:
-            subprocess.Popen(command, shell=True, 
-                           stdout=subprocess.DEVNULL, 
-                           stderr=subprocess.DEVNULL)
+            child = self.launch_engine.launch(app_data)
+        except LaunchError as e:
+            QMessageBox.critical(self, "Launch Error", f"Failed to launch {name}:\n{str(e)}")
+            return
             
-            self.statusBar().showMessage(f"🚀 Launched: {name}", 3000)
+        self.usage.record(app_data)
+        if self.search_session is not None:
+            self.search_session.usage_changed()
+        self.statusBar().showMessage(f"🚀 Launched: {name} ({child.spawn_time * 1000:.1f} ms)", 3000)
             
-        except Exception as e:
-            QMessageBox.critical(self, "Launch Error", f"Failed to launch {name}:\n{str(e)}")
+    def closeEvent(self, event):
+        if self.resident and not self.quitting:
+            # Stay resident; the next invocation only shows the window again
+            event.ignore()
+            self.hide()
+            return
+        self.search_scheduler.cancel()
+        if self.watcher:
+            self.watcher.stop()
+            self.watcher = None
+        super().closeEvent(event)
+
+
+class SearchTask(QRunnable):
+    """One search, run on the scheduler's thread pool"""
+    
+    def __init__(self, scheduler, generation, session, query, category):
+        super().__init__()
+        self.scheduler = scheduler
+        self.generation = generation
+        self.session = session
+        self.query = query
+        self.category = category
+        
+    def run(self):
+        # A newer keystroke arrived while this one was queued
+        if self.generation != self.scheduler.generation:
+            return
+        ids = self.session.search_ids(self.query, self.category)
+        self.scheduler.task_done.emit(self.generation, self.session, ids)
+
+
+class SearchScheduler(QObject):
+    """Debounces queries and runs them off the GUI thread.
+    
+    Every query gets a generation number; queued tasks and results of
+    anything but the latest generation are dropped, so only the newest
+    result reaches the view.
+    """
+    
+    DEBOUNCE_MS = 30
+    
+    results_ready = pyqtSignal(object, object)
+    task_done = pyqtSignal(int, object, object)
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.generation = 0
+        self.pending = None
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(self.DEBOUNCE_MS)
+        self.timer.timeout.connect(self.run_pending)
+        # One worker: searches share a session, and only the latest matters
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(1)
+        self.task_done.connect(self.on_task_done)
+        
+    def schedule(self, session, query, category):
+        """Search after the debounce window, restarting it on every call"""
+        self.pending = (session, query, category)
+        self.generation += 1
+        self.timer.start()
+        
+    def run_now(self, session, query, category):
+        """Search without waiting (category switches, new index)"""
+        self.pending = (session, query, category)
+        self.generation += 1
+        self.timer.stop()
+        self.run_pending()
+        
+    def run_pending(self):
+        if self.pending is None:
+            return
+        session, query, category = self.pending
+        self.pending = None
+        self.pool.clear()
+        self.pool.start(SearchTask(self, self.generation, session, query, category))
+        
+    def on_task_done(self, generation, session, ids):
+        if generation == self.generation:
+            self.results_ready.emit(session, ids)
+            
+    def cancel(self):
+        self.generation += 1
+        self.pending = None
+        self.timer.stop()
+        self.pool.clear()
+
+
+class AppWatcherBridge(QObject):
+    """Carries watcher deltas from the watcher thread to the GUI thread"""
+    
+    apps_changed = pyqtSignal(dict)
+    
+    def publish(self, delta):
+        """Runs on the watcher thread"""
+        self.apps_changed.emit(delta)
+
+
+class SearchIndexTask(QRunnable):
+    """One search index rebuild, run on the builder's thread pool"""
+    
+    def __init__(self, builder, generation, apps, previous):
+        super().__init__()
+        self.builder = builder
+        self.generation = generation
+        self.apps = apps
+        self.previous = previous
+        
+    def run(self):
+        # Another delta arrived while this one was queued
+        if self.generation != self.builder.generation:
+            return
+        search_index = SearchIndex(self.apps, previous=self.previous)
+        self.builder.task_done.emit(self.generation, search_index)
+
+
+class SearchIndexBuilder(QObject):
+    """Rebuilds the search index off the GUI thread after watcher deltas.
+    
+    The new index reuses the n-grams of the previous one, so a delta only
+    indexes the field values it brings. Like SearchScheduler, only the
+    build of the latest generation reaches the window.
+    """
+    
+    index_ready = pyqtSignal(object)
+    task_done = pyqtSignal(int, object)
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.generation = 0
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(1)
+        self.task_done.connect(self.on_task_done)
+        
+    def rebuild(self, apps_by_category, previous):
+        """Index a snapshot of the app lists, which keep changing on the GUI thread"""
+        self.generation += 1
+        snapshot = {category: list(apps) for category, apps in apps_by_category.items()}
+        self.pool.clear()
+        self.pool.start(SearchIndexTask(self, self.generation, snapshot, previous))
+        
+    def on_task_done(self, generation, search_index):
+        if generation == self.generation:
+            self.index_ready.emit(search_index)
+            
+    def cancel(self):
+        self.generation += 1
+        self.pool.clear()
 
 
 class AppLoader(QObject):
     """Worker thread for loading applications"""
     
-    finished = pyqtSignal(dict)
+    batch_ready = pyqtSignal(dict)
+    finished = pyqtSignal(dict, object)
     
-    def __init__(self, detector):
+    def __init__(self, index, skip_cached=False):
         super().__init__()
-        self.detector = detector
+        self.index = index
+        self.skip_cached = skip_cached
         
     def run(self):
-        apps = self.detector.detect_apps()
-        self.finished.emit(apps)
+        # Cached entries arrive first (unless already shown), then changes as they are parsed
+        for delta in self.index.iter_batches(skip_cached=self.skip_cached):
+            self.batch_ready.emit(delta)
+        apps = self.index.applications()
+        self.finished.emit(apps, SearchIndex(apps))
 
 
 def main():
-    app = QApplication(sys.argv)
+    trace = StartupTrace('--startup-trace' in sys.argv)
+    trace.mark("interpreter ready", MODULE_START)
+    trace.mark("modules imported", MODULES_LOADED)
+    
+    resident = '--new-instance' not in sys.argv
+    app = QApplication([arg for arg in sys.argv if arg not in ('--startup-trace', '--new-instance')])
     app.setApplicationName("Bulletproof Launcher")
     
-    launcher = BulletproofLauncher()
+    launcher = BulletproofLauncher(trace, resident=resident)
+    # Only a launcher whose instance server is listening can be summoned again
+    app.setQuitOnLastWindowClosed(not launcher.resident)
+    trace.mark("window built")
     launcher.show()
+    trace.mark("window shown")
     
     sys.exit(app.exec_())
 
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Compiled categorization engine for Smart Launcher.
+
+The keyword table is compiled once into a single prefix-factored regular
+expression, so an application is categorized with one scan over its
+lowercased fields instead of one substring test per category, keyword
+and field. The result is identical to the original nested loop: the
+first category (in table order) having any keyword in the name,
+description or command.
+
+Desktop entries that declare freedesktop Categories= take a fast path
+that skips keyword matching entirely.
+"""
+
+import re
+
+# freedesktop.org main/additional categories -> launcher categories
+FREEDESKTOP_CATEGORIES = {
+    'Development': 'Programming',
+    'IDE': 'Programming',
+    'TextEditor': 'Programming',
+    'RevisionControl': 'Programming',
+    'Debugger': 'Programming',
+    'Security': 'Security',
+    'System': 'System',
+    'Monitor': 'System',
+    'TerminalEmulator': 'System',
+    'Network': 'Internet',
+    'WebBrowser': 'Internet',
+    'Email': 'Internet',
+    'Chat': 'Internet',
+    'AudioVideo': 'Media',
+    'Audio': 'Media',
+    'Video': 'Media',
+    'Player': 'Media',
+    'Office': 'Office',
+    'WordProcessor': 'Office',
+    'Spreadsheet': 'Office',
+    'Graphics': 'Graphics',
+    'Photography': 'Graphics',
+    '2DGraphics': 'Graphics',
+    '3DGraphics': 'Graphics',
+    'Game': 'Games',
+    'Emulator': 'Games',
+}
+
+FALLBACK = 'Other'
+
+
+def trie_pattern(words):
+    """Regex source matching any of ``words``, factored by common prefixes.
+
+    Python's re engine tries alternatives one by one, so a flat
+    ``a|b|c`` alternation costs one attempt per keyword at every
+    position; the trie shape only follows branches whose first character
+    matches. At a given position the longest matching word wins.
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = True
+
+    def build(node):
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        return '(?:' + body + ')?' if '' in node else body
+
+    return build(trie)
+
+
+class CategoryMatcher:
+    """Keyword table compiled into one regex, with a Categories= fast path"""
+
+    # Descriptions repeat a lot ("Command line tool"), so their rank is memoized
+    DESCRIPTION_MEMO_SIZE = 4096
+
+    def __init__(self, categories):
+        # Keep a copy so callers can tell when the table changed
+        self.categories = {category: list(keywords) for category, keywords in categories.items()}
+        self.names = list(self.categories) + [FALLBACK]
+        self.no_match = len(self.categories)
+
+        # Each keyword belongs to the first category listing it
+        rank = {}
+        for index, keywords in enumerate(self.categories.values()):
+            for keyword in keywords:
+                rank.setdefault(keyword.lower(), index)
+
+        # The regex reports the longest keyword starting at a position; every
+        # shorter keyword matching there is a prefix of it, so fold their
+        # ranks in up front
+        self.rank = {keyword: min(r for prefix, r in rank.items() if keyword.startswith(prefix))
+                     for keyword in rank}
+
+        if rank:
+            source = trie_pattern(rank)
+            self._search = re.compile(source).search
+            # Lookahead: finditer then reports every start position, overlaps included
+            self._finditer = re.compile('(?=(' + source + '))').finditer
+        else:
+            self._search = None
+            self._finditer = None
+
+        self.desktop_map = {key: value for key, value in FREEDESKTOP_CATEGORIES.items()
+                            if value in self.categories}
+        self._description_ranks = {}
+
+    def _best_rank(self, text, limit):
+        """Lowest category index of any keyword in ``text``, or ``limit``"""
+        if self._search is None:
+            return limit
+        match = self._search(text)
+        if match is None:
+            return limit
+
+        best = limit
+        rank = self.rank
+        for match in self._finditer(text, match.start()):
+            index = rank[match.group(1)]
+            if index < best:
+                best = index
+                if best == 0:
+                    break
+        return best
+
+    def _description_rank(self, description):
+        ranks = self._description_ranks
+        index = ranks.get(description)
+        if index is None:
+            if len(ranks) >= self.DESCRIPTION_MEMO_SIZE:
+                ranks.clear()
+            index = ranks[description] = self._best_rank(description.lower(), self.no_match)
+        return index
+
+    def categorize(self, name, info):
+        """Category of one application"""
+        for desktop_category in info.get('categories') or ():
+            category = self.desktop_map.get(desktop_category)
+            if category:
+                return category
+
+        best = self._description_rank(info.get('description', ''))
+        if best:
+            name = name.lower()
+            command = info.get('command', '').lower()
+            # NUL keeps keywords from matching across fields
+            text = name if command == name else name + '\0' + command
+            best = self._best_rank(text, best)
+        return self.names[best]
+
+    def categorize_many(self, items):
+        """Categories for an iterable of (name, info) pairs, in order"""
+        categorize = self.categorize
+        return [categorize(name, info) for name, info in items]
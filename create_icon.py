@@ -4,45 +4,70 @@
 می‌سازد: یک آیکون 256x256 زیبا و حرفه‌ای
 """
 
-from PIL import Image, ImageDraw, ImageFont
 import os
+import math
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image, ImageDraw, ImageFont
+
+# The artwork is drawn on this grid and scaled to the master size
+BASE_SIZE = 256
+
+# Sizes written next to the master icon
+SIZES = [16, 32, 48, 64, 128]
+
+
+def gradient_channel(start, end, size):
+    """یک کانال gradient: از start (بالا) تا end (پایین)، ۱۰٪ روشن‌تر به سمت راست.
 
-def create_bulletproof_icon():
+    Pixel values are the same as the original per-pixel loop, but each
+    distinct row is computed once and the channel is assembled from row
+    buffers, so the work is O(distinct rows x size) instead of size²
+    putpixel calls.
+    """
+    rows = {}
+    lines = []
+    for y in range(size):
+        ratio = y / size
+        value = int(start + (end - start) * ratio)
+        row = rows.get(value)
+        if row is None:
+            row = rows[value] = bytes(max(0, min(255, int(value + (value * 0.1 * (x / size)))))
+                                      for x in range(size))
+        lines.append(row)
+    return Image.frombuffer('L', (size, size), b''.join(lines), 'raw', 'L', 0, 1)
+
+
+def gradient_background(size):
+    """Gradient background - آبی تا بنفش (667eea to 764ba2)"""
+    return Image.merge('RGBA', (
+        gradient_channel(102, 118, size),
+        gradient_channel(126, 75, size),
+        gradient_channel(234, 162, size),
+        Image.new('L', (size, size), 255),
+    ))
+
+
+def create_bulletproof_icon(size=BASE_SIZE):
     """ایجاد آیکون زیبا برای launcher"""
     
-    # ابعاد آیکون
-    size = 256
+    # ابعاد آیکون: همه اندازه‌ها نسبت به شبکه 256 هستند
+    scale = size / BASE_SIZE
+    
+    def px(value):
+        return round(value * scale)
     
     # ایجاد تصویر با gradient زمینه
-    img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
+    img = gradient_background(size)
     draw = ImageDraw.Draw(img)
     
-    # Gradient background - آبی تا بنفش
-    for y in range(size):
-        ratio = y / size
-        r = int(102 + (118 - 102) * ratio)  # 667eea to 764ba2
-        g = int(126 + (75 - 126) * ratio)
-        b = int(234 + (162 - 234) * ratio)
-        
-        for x in range(size):
-            x_ratio = x / size
-            final_r = int(r + (r * 0.1 * x_ratio))
-            final_g = int(g + (g * 0.1 * x_ratio))
-            final_b = int(b + (b * 0.1 * x_ratio))
-            
-            # کنترل رنگ در محدوده 0-255
-            final_r = max(0, min(255, final_r))
-            final_g = max(0, min(255, final_g))
-            final_b = max(0, min(255, final_b))
-            
-            img.putpixel((x, y), (final_r, final_g, final_b, 255))
-    
     # دایره اصلی (shield)
-    shield_radius = 90
+    shield_radius = px(90)
     center = size // 2
     
     # سایه برای shield
-    shadow_offset = 8
+    shadow_offset = px(8)
     draw.ellipse([
         center - shield_radius + shadow_offset,
         center - shield_radius + shadow_offset,
@@ -56,10 +81,10 @@ def create_bulletproof_icon():
         center - shield_radius,
         center + shield_radius,
         center + shield_radius
-    ], fill=(255, 255, 255, 240), outline=(52, 152, 219, 255), width=6)
+    ], fill=(255, 255, 255, 240), outline=(52, 152, 219, 255), width=max(1, px(6)))
     
     # دایره داخلی - آبی روشن
-    inner_radius = 70
+    inner_radius = px(70)
     draw.ellipse([
         center - inner_radius,
         center - inner_radius,
@@ -70,37 +95,36 @@ def create_bulletproof_icon():
     # نماد rocket در وسط
     rocket_points = [
         # نوک راکت
-        (center, center - 40),
+        (center, center - px(40)),
         # بدنه راکت
-        (center - 15, center - 20),
-        (center - 15, center + 10),
-        (center - 10, center + 20),
-        (center - 5, center + 25),
-        (center + 5, center + 25),
-        (center + 10, center + 20),
-        (center + 15, center + 10),
-        (center + 15, center - 20),
+        (center - px(15), center - px(20)),
+        (center - px(15), center + px(10)),
+        (center - px(10), center + px(20)),
+        (center - px(5), center + px(25)),
+        (center + px(5), center + px(25)),
+        (center + px(10), center + px(20)),
+        (center + px(15), center + px(10)),
+        (center + px(15), center - px(20)),
     ]
     draw.polygon(rocket_points, fill=(255, 255, 255, 255))
     
     # شعله راکت
     flame_points = [
-        (center - 8, center + 20),
-        (center, center + 40),
-        (center + 8, center + 20),
+        (center - px(8), center + px(20)),
+        (center, center + px(40)),
+        (center + px(8), center + px(20)),
     ]
     draw.polygon(flame_points, fill=(255, 87, 51, 255))
     
     # نقاط تزئینی دور shield
-    star_radius = 110
+    star_radius = 110 * scale
     for i in range(8):
         angle = i * 45  # هر 45 درجه
-        import math
         x = center + star_radius * math.cos(math.radians(angle))
         y = center + star_radius * math.sin(math.radians(angle))
         
         # ستاره کوچک
-        star_size = 8
+        star_size = 8 * scale
         star_points = []
         for j in range(5):
             star_angle = angle + j * 72
@@ -121,9 +145,9 @@ def create_bulletproof_icon():
     # متن "BP" (BulletProof) در پایین
     try:
         # تلاش برای استفاده از فونت سیستم
-        font_size = 24
+        font_size = px(24)
         font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", font_size)
-    except:
+    except OSError:
         font = ImageFont.load_default()
     
     text = "BP"
@@ -132,39 +156,69 @@ def create_bulletproof_icon():
     text_height = bbox[3] - bbox[1]
     
     text_x = center - text_width // 2
-    text_y = center + 60
+    text_y = center + px(60)
     
     # سایه متن
-    draw.text((text_x + 2, text_y + 2), text, fill=(0, 0, 0, 128), font=font)
+    shadow = max(1, px(2))
+    draw.text((text_x + shadow, text_y + shadow), text, fill=(0, 0, 0, 128), font=font)
     # متن اصلی
     draw.text((text_x, text_y), text, fill=(255, 255, 255, 255), font=font)
     
     return img
 
+
+def save_resized(icon, size, output_dir):
+    """یک اندازه را می‌سازد و ذخیره می‌کند؛ returns the written path"""
+    resized = icon.resize((size, size), Image.Resampling.LANCZOS)
+    size_path = os.path.join(output_dir, f"bulletproof_launcher_icon_{size}.png")
+    resized.save(size_path, "PNG")
+    return size_path
+
+
+def write_icon_set(icon, output_dir, sizes=SIZES, workers=None):
+    """Save the master icon and every size, in parallel.
+
+    Pillow releases the GIL while resampling and compressing, so the
+    sizes really are rendered concurrently. Returns the written paths,
+    master first.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    icon_path = os.path.join(output_dir, "bulletproof_launcher_icon.png")
+    with ThreadPoolExecutor(max_workers=workers or min(len(sizes) + 1, os.cpu_count() or 1)) as pool:
+        master = pool.submit(icon.save, icon_path, "PNG")
+        resized = [pool.submit(save_resized, icon, size, output_dir) for size in sizes]
+        master.result()
+        return [icon_path] + [future.result() for future in resized]
+
+
 def main():
     """ایجاد و ذخیره آیکون"""
+    parser = argparse.ArgumentParser(description="Create the Bulletproof Launcher icon set")
+    parser.add_argument('--output-dir', default=os.path.dirname(os.path.abspath(__file__)),
+                        help='directory for the PNG files (default: next to this script)')
+    parser.add_argument('--size', type=int, default=BASE_SIZE, help='master icon size in pixels')
+    parser.add_argument('--sizes', default=','.join(map(str, SIZES)),
+                        help='comma-separated sizes to render from the master (default: %(default)s)')
+    args = parser.parse_args()
+    sizes = [int(size) for size in args.sizes.split(',') if size]
+    
     print("🎨 Creating Bulletproof Launcher icon...")
     
     try:
-        icon = create_bulletproof_icon()
-        icon_path = "/home/reza/code/bulletproof_launcher_icon.png"
-        icon.save(icon_path, "PNG")
+        icon = create_bulletproof_icon(args.size)
+        icon_path, *size_paths = write_icon_set(icon, args.output_dir, sizes)
         print(f"✅ Icon saved to: {icon_path}")
         
         # ایجاد سایزهای مختلف
-        sizes = [16, 32, 48, 64, 128]
         for size in sizes:
-            resized = icon.resize((size, size), Image.Resampling.LANCZOS)
-            size_path = f"/home/reza/code/bulletproof_launcher_icon_{size}.png"
-            resized.save(size_path, "PNG")
             print(f"✅ {size}x{size} icon saved")
             
     except Exception as e:
         print(f"❌ Error creating icon: {e}")
         # ایجاد آیکون ساده اگر PIL کار نکرد
-        create_simple_icon()
+        create_simple_icon(args.output_dir)
 
-def create_simple_icon():
+def create_simple_icon(output_dir):
     """ایجاد آیکون ساده با SVG"""
     print("🎨 Creating simple SVG icon...")
     
@@ -206,7 +260,8 @@ def create_simple_icon():
     <text x="128" y="200" text-anchor="middle" font-family="Arial" font-size="24" font-weight="bold" fill="#ffffff">BP</text>
 </svg>'''
     
-    with open("/home/reza/code/bulletproof_launcher_icon.svg", "w") as f:
+    os.makedirs(output_dir, exist_ok=True)
+    with open(os.path.join(output_dir, "bulletproof_launcher_icon.svg"), "w") as f:
         f.write(svg_content)
     print("✅ SVG icon created")
 
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Streaming parser for freedesktop.org .desktop files.
+
+Only the [Desktop Entry] group is read: parsing stops at the next group
+header, so Desktop Actions and other groups are never touched, and
+localized keys (Name[de]=...) are skipped. Follows the Desktop Entry
+Specification for value escapes, Exec quoting and field codes, and for
+the Hidden, NoDisplay, TryExec, OnlyShowIn and NotShowIn keys.
+"""
+
+import os
+import shutil
+
+GROUP = '[Desktop Entry]'
+
+_STRING_ESCAPES = {'s': ' ', 'n': '\n', 't': '\t', 'r': '\r', '\\': '\\'}
+
+# Field codes expanded from the entry itself; file/URL codes are dropped
+# because the launcher never passes files
+_DROPPED_FIELD_CODES = set('fFuUdDnNvm')
+
+# Checked every time the index is used rather than once at parse time:
+# a TryExec program can be installed, and the desktop can change, while
+# the file itself stays the same
+ENVIRONMENT_KEYS = ('TryExec', 'OnlyShowIn', 'NotShowIn')
+
+
+def read_entry(file_path):
+    """Return the unlocalized keys of the [Desktop Entry] group, or None"""
+    entry = None
+    try:
+        with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+            for line in f:
+                line = line.strip()
+                if not line or line[0] == '#':
+                    continue
+                if line[0] == '[':
+                    if entry is not None:
+                        # Next group: everything we need has been read
+                        break
+                    if line == GROUP:
+                        entry = {}
+                    continue
+                if entry is None:
+                    continue
+
+                key, sep, value = line.partition('=')
+                if not sep:
+                    continue
+                key = key.rstrip()
+                if '[' in key or key in entry:
+                    continue
+                entry[key] = value.lstrip()
+    except OSError:
+        return None
+    return entry
+
+
+def unescape(value):
+    """Expand the string escapes of a desktop entry value"""
+    if '\\' not in value:
+        return value
+    result = []
+    chars = iter(value)
+    for char in chars:
+        if char == '\\':
+            nxt = next(chars, '')
+            result.append(_STRING_ESCAPES.get(nxt, '\\' + nxt))
+        else:
+            result.append(char)
+    return ''.join(result)
+
+
+def is_true(value):
+    return (value or '').strip().lower() == 'true'
+
+
+def split_list(value):
+    """Split a ';'-separated list value"""
+    return [item for item in (value or '').split(';') if item]
+
+
+def split_exec(value):
+    """Split an (unescaped) Exec value into arguments, honoring quoting"""
+    args = []
+    current = []
+    in_arg = False
+    quoted = False
+    chars = iter(value)
+    for char in chars:
+        if quoted:
+            if char == '\\':
+                nxt = next(chars, '')
+                if nxt in '"`$\\':
+                    current.append(nxt)
+                else:
+                    current.append('\\' + nxt)
+            elif char == '"':
+                quoted = False
+            else:
+                current.append(char)
+        elif char == '"':
+            quoted = True
+            in_arg = True
+        elif char in ' \t':
+            if in_arg:
+                args.append(''.join(current))
+                current = []
+                in_arg = False
+        else:
+            current.append(char)
+            in_arg = True
+    if in_arg:
+        args.append(''.join(current))
+    return args
+
+
+def expand_field_codes(args, name='', icon='', file_path=''):
+    """Expand or drop Exec field codes such as %U, %f, %i, %c and %%"""
+    expanded = []
+    for arg in args:
+        if len(arg) == 2 and arg[0] == '%':
+            code = arg[1]
+            if code in _DROPPED_FIELD_CODES:
+                continue
+            if code == 'i':
+                if icon:
+                    expanded.extend(['--icon', icon])
+                continue
+            if code == 'c':
+                expanded.append(name)
+                continue
+            if code == 'k':
+                expanded.append(file_path)
+                continue
+
+        if '%' in arg:
+            arg = _expand_inline(arg, name, file_path)
+            if not arg:
+                continue
+        expanded.append(arg)
+    return expanded
+
+
+def _expand_inline(arg, name, file_path):
+    """Field codes embedded inside a larger argument"""
+    result = []
+    chars = iter(arg)
+    for char in chars:
+        if char != '%':
+            result.append(char)
+            continue
+        code = next(chars, '')
+        if code == '%':
+            result.append('%')
+        elif code == 'c':
+            result.append(name)
+        elif code == 'k':
+            result.append(file_path)
+        # Other codes are dropped
+    return ''.join(result)
+
+
+def exec_argv(entry, file_path=''):
+    """Command line of an entry as an argument list"""
+    value = unescape(entry.get('Exec', ''))
+    return expand_field_codes(split_exec(value),
+                              name=unescape(entry.get('Name', '')),
+                              icon=entry.get('Icon', ''),
+                              file_path=str(file_path))
+
+
+def current_desktops():
+    """Desktop environment names from XDG_CURRENT_DESKTOP"""
+    return set(split_list(os.environ.get('XDG_CURRENT_DESKTOP', '').replace(':', ';')))
+
+
+def try_exec_ok(value):
+    """Whether a TryExec binary exists (absolute path or on PATH)"""
+    if not value:
+        return True
+    if os.path.isabs(value):
+        return os.access(value, os.X_OK)
+    return shutil.which(value) is not None
+
+
+def is_displayed(entry):
+    """Apply Type, Hidden and NoDisplay, which depend only on the file"""
+    if entry.get('Type', 'Application') != 'Application':
+        return False
+    return not (is_true(entry.get('Hidden')) or is_true(entry.get('NoDisplay')))
+
+
+def environment_keys(entry):
+    """The keys whose outcome depends on the session and installed programs"""
+    return {key: entry[key] for key in ENVIRONMENT_KEYS if entry.get(key)}
+
+
+def is_shown_here(entry, desktops=None):
+    """Apply TryExec and OnlyShowIn/NotShowIn for the current session"""
+    only = split_list(entry.get('OnlyShowIn'))
+    not_in = split_list(entry.get('NotShowIn'))
+    if only or not_in:
+        if desktops is None:
+            desktops = current_desktops()
+        if only and not desktops.intersection(only):
+            return False
+        if desktops.intersection(not_in):
+            return False
+
+    return try_exec_ok(entry.get('TryExec'))
+
+
+def is_visible(entry, desktops=None):
+    """Apply Type, Hidden, NoDisplay, TryExec and OnlyShowIn/NotShowIn"""
+    return is_displayed(entry) and is_shown_here(entry, desktops)
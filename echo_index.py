@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Cached index of the rofi launcher tree (~/echo-launcher).
+
+launcher.sh shows the tree one directory at a time: directories are
+categories and every file holds the shell command to run on its first
+line. Listing a level used to cost a find, a sort and a basename per
+entry. EchoIndex walks the tree once and writes a flat, tab-separated
+index that the script loads into arrays with plain `read`:
+
+    # echo-index 1 /home/user/echo-launcher
+    d	Programming	📁 Programming
+    f	Programming/Python/VSCode	⚡ VSCode	code
+
+(kind, path relative to the tree, display name, command). Paths are
+sorted, so children come out in order. Next to it a JSON state keeps
+the mtime of every directory and the mtime/size of every file: a later
+run only re-lists directories whose mtime changed and re-reads files
+that changed, and rewrites the index only if something did.
+
+    python3 echo_index.py --launcher-dir ~/echo-launcher    # prints the index path
+"""
+
+import os
+import sys
+import json
+import stat
+import hashlib
+import argparse
+from pathlib import Path
+
+from app_index import default_cache_dir
+
+VERSION = 1
+
+DIR_ICON = '📁'
+FILE_ICON = '⚡'
+
+
+def read_command(file_path):
+    """First line of a command file, or '' if unreadable"""
+    try:
+        with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+            return f.readline().rstrip('\r\n')
+    except OSError:
+        return ''
+
+
+def display_name(kind, name):
+    return f"{DIR_ICON if kind == 'd' else FILE_ICON} {name}"
+
+
+def usable_name(name):
+    """Names that fit in a line of the index"""
+    return '\t' not in name and '\n' not in name
+
+
+class EchoIndex:
+    """Flat index of a launcher tree, revalidated by directory and file mtimes"""
+
+    def __init__(self, launcher_dir, cache_dir=None):
+        self.launcher_dir = os.path.abspath(os.path.expanduser(launcher_dir))
+        cache_dir = Path(cache_dir) if cache_dir else default_cache_dir()
+        key = hashlib.sha1(self.launcher_dir.encode('utf-8', 'surrogateescape')).hexdigest()[:12]
+        self.index_path = cache_dir / f'echo-index-{key}.tsv'
+        self.state_path = cache_dir / f'echo-index-{key}.json'
+        # {relative dir: {'mtime': ns, 'children': {name: kind}}}
+        self.dirs = {}
+        # {relative file: {'stat': [mtime ns, size], 'command': str}}
+        self.files = {}
+
+    def path(self, relative):
+        return os.path.join(self.launcher_dir, relative) if relative else self.launcher_dir
+
+    def load(self):
+        """Read the saved state; a stale or unreadable one is ignored"""
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return self
+        if (isinstance(data, dict) and data.get('version') == VERSION and
+                data.get('launcher_dir') == self.launcher_dir):
+            self.dirs = data.get('dirs', {})
+            self.files = data.get('files', {})
+        return self
+
+    def refresh(self):
+        """Bring the index up to date; returns True if anything changed"""
+        changed = False
+        seen = set()
+        pending = ['']
+        dirs = {}
+        files = {}
+        while pending:
+            relative = pending.pop()
+            try:
+                st = os.stat(self.path(relative))
+            except OSError:
+                continue
+            # Symlinked directories are followed, but only once
+            if (st.st_dev, st.st_ino) in seen or not stat.S_ISDIR(st.st_mode):
+                continue
+            seen.add((st.st_dev, st.st_ino))
+
+            cached = self.dirs.get(relative)
+            if cached is not None and cached['mtime'] == st.st_mtime_ns:
+                children = cached['children']
+            else:
+                children = self._list_dir(relative)
+                changed = True
+            dirs[relative] = {'mtime': st.st_mtime_ns, 'children': children}
+
+            for name, kind in children.items():
+                child = f'{relative}/{name}' if relative else name
+                if kind == 'd':
+                    pending.append(child)
+                    continue
+                entry = self._refresh_file(child)
+                if entry is None:
+                    continue
+                if entry is not self.files.get(child):
+                    changed = True
+                files[child] = entry
+
+        if set(dirs) != set(self.dirs) or set(files) != set(self.files):
+            changed = True
+        self.dirs = dirs
+        self.files = files
+        return changed or not self.index_path.exists()
+
+    def _list_dir(self, relative):
+        children = {}
+        try:
+            with os.scandir(self.path(relative)) as it:
+                for entry in it:
+                    if not usable_name(entry.name):
+                        continue
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        continue
+                    children[entry.name] = 'd' if is_dir else 'f'
+        except OSError:
+            pass
+        return children
+
+    def _refresh_file(self, relative):
+        """Cached entry if the file is unchanged, a re-read one otherwise, None if gone"""
+        file_path = self.path(relative)
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            return None
+        key = [st.st_mtime_ns, st.st_size]
+        cached = self.files.get(relative)
+        if cached is not None and cached['stat'] == key:
+            return cached
+        return {'stat': key, 'command': read_command(file_path)}
+
+    def entries(self):
+        """(kind, relative path, display name, command) of every entry, sorted by path"""
+        rows = []
+        for relative, info in self.dirs.items():
+            for name, kind in info['children'].items():
+                child = f'{relative}/{name}' if relative else name
+                if kind == 'd':
+                    if child in self.dirs:
+                        rows.append(('d', child, display_name('d', name), ''))
+                elif child in self.files:
+                    rows.append(('f', child, display_name('f', name), self.files[child]['command']))
+        # Component-wise, so a directory's children stay together
+        rows.sort(key=lambda row: row[1].split('/'))
+        return rows
+
+    def save(self):
+        """Atomically write the shell index and the revalidation state"""
+        try:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.index_path.with_name(self.index_path.name + '.tmp')
+            with open(tmp_path, 'w', encoding='utf-8', errors='surrogateescape') as f:
+                f.write(f"# echo-index {VERSION} {self.launcher_dir}\n")
+                for row in self.entries():
+                    f.write('\t'.join(row) + '\n')
+            os.replace(tmp_path, self.index_path)
+
+            tmp_path = self.state_path.with_name(self.state_path.name + '.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': VERSION, 'launcher_dir': self.launcher_dir,
+                           'dirs': self.dirs, 'files': self.files},
+                          f, separators=(',', ':'))
+            os.replace(tmp_path, self.state_path)
+        except OSError as e:
+            print(f"⚠️  Could not write launcher index: {e}", file=sys.stderr)
+
+    def update(self):
+        """Load, revalidate and save if needed; returns the index path"""
+        self.load()
+        if self.refresh():
+            self.save()
+        return self.index_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Index the rofi launcher tree")
+    parser.add_argument('--launcher-dir', default=os.path.expanduser('~/echo-launcher'),
+                        help='launcher tree (default: %(default)s)')
+    args = parser.parse_args()
+    print(EchoIndex(args.launcher_dir).update())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+fzf-style fuzzy matching for Smart Launcher.
+
+A query matches a text when its characters appear in order (a
+subsequence), so "ff" finds "firefox" and "gc" finds "gnome-calculator".
+Matches are scored like fzf's v1 algorithm: find the leftmost
+occurrence, tighten it from the right, then reward characters at word
+boundaries, at the start of the text and in consecutive runs, and
+penalize gaps. Ranking keeps only the best ``k`` with a heap instead of
+sorting every match.
+
+A contiguous match at the very start of the text always outscores any
+other match of the same query (every other case loses the prefix bonus
+or a run bonus), which lets callers rank prefix matches alone when
+there are enough of them.
+"""
+
+import re
+import heapq
+
+SCORE_MATCH = 16
+SCORE_GAP_START = -3
+SCORE_GAP_EXTENSION = -1
+BONUS_BOUNDARY = 8
+BONUS_CONSECUTIVE = 4
+BONUS_PREFIX = 12
+# fzf doubles the bonus of the first query character
+BONUS_FIRST_CHAR_MULTIPLIER = 2
+
+BOUNDARY_CHARS = frozenset(' -_./:\0')
+
+
+def subsequence_pattern(query):
+    """Regex finding ``query`` as a subsequence within one field.
+
+    Fields are separated by NUL or newline. Negated classes
+    ("f[^i\\0\\n]*i...") keep the search linear instead of backtracking
+    like ".*?" would.
+    """
+    parts = [re.escape(query[0])]
+    for char in query[1:]:
+        parts.append('[^' + re.escape(char) + '\\0\\n]*' + re.escape(char))
+    return re.compile(''.join(parts))
+
+
+def _bonus(text, pos):
+    if pos == 0 or text[pos - 1] in BOUNDARY_CHARS:
+        return BONUS_BOUNDARY
+    return 0
+
+
+def score(query, text):
+    """Fuzzy score of lowercased ``query`` in lowercased ``text``, or None"""
+    if not query:
+        return 0
+
+    start = text.find(query)
+    if start >= 0:
+        # Contiguous: one run, no gaps
+        bonus = _bonus(text, start)
+        total = (SCORE_MATCH * len(query) + bonus * BONUS_FIRST_CHAR_MULTIPLIER +
+                 max(bonus, BONUS_CONSECUTIVE) * (len(query) - 1))
+        return total + BONUS_PREFIX if start == 0 else total
+
+    # Leftmost end of the subsequence
+    pos = -1
+    for char in query:
+        pos = text.find(char, pos + 1)
+        if pos < 0:
+            return None
+    end = pos
+
+    # Walk back from the end for the shortest window
+    for char in reversed(query):
+        pos = text.rfind(char, 0, pos + 1)
+        pos -= 1
+    start = pos + 1
+
+    # Like fzf, characters continuing a run keep the bonus of its first one
+    run_bonus = _bonus(text, start)
+    total = SCORE_MATCH * len(query) + run_bonus * BONUS_FIRST_CHAR_MULTIPLIER
+    previous = pos = start
+    for char in query[1:]:
+        pos = text.find(char, pos + 1, end + 1)
+        if pos == previous + 1:
+            total += max(run_bonus, BONUS_CONSECUTIVE)
+        else:
+            run_bonus = _bonus(text, pos)
+            total += SCORE_GAP_START + SCORE_GAP_EXTENSION * (pos - previous - 2) + run_bonus
+        previous = pos
+
+    if start == 0:
+        total += BONUS_PREFIX
+    return total
+
+
+def top_k(scored, k):
+    """The ``k`` best (score, item) pairs, best first; ties keep input order"""
+    # The counter breaks ties on input order without comparing items
+    best = heapq.nlargest(k, ((item_score, -n, item) for n, (item_score, item) in enumerate(scored)))
+    return [(item_score, item) for item_score, _n, item in best]
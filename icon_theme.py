@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Icon theme lookup for Smart Launcher.
+
+Desktop entries name their icon (``Icon=firefox``) and the freedesktop
+Icon Theme Specification says where to find it: in the current theme,
+the themes it inherits, then hicolor, then /usr/share/pixmaps, at the
+size closest to the one wanted. Doing that per icon means probing
+dozens of directories, so IconTheme walks the theme directories once
+and answers lookups from a name -> candidates dict.
+
+Decoded icons are scaled once and kept as PNG thumbnails under
+~/.cache/smart-launcher/icons, keyed by source path, mtime, size and
+pixel size (see thumbnail_path), so later runs skip decoding.
+
+Has no GUI dependencies; bulletproof_launcher.py does the decoding.
+"""
+
+import os
+import re
+import hashlib
+import threading
+
+from app_index import default_cache_dir
+
+ICON_EXTENSIONS = ('.png', '.svg', '.xpm')
+
+# Size of icons only found in pixmaps or without a size directory
+UNKNOWN_SIZE = 0
+SCALABLE = -1
+
+_SIZE_DIR = re.compile(r'^(\d+)(?:x\d+)?(?:@\d+x?)?$')
+
+
+def icon_dirs():
+    """Base directories holding icon themes, in lookup order"""
+    data_home = os.environ.get('XDG_DATA_HOME') or os.path.expanduser('~/.local/share')
+    data_dirs = os.environ.get('XDG_DATA_DIRS') or '/usr/local/share:/usr/share'
+    dirs = [os.path.expanduser('~/.icons'), os.path.join(data_home, 'icons')]
+    dirs += [os.path.join(data_dir, 'icons') for data_dir in data_dirs.split(':') if data_dir]
+    return [directory for directory in dict.fromkeys(dirs) if os.path.isdir(directory)]
+
+
+def theme_inherits(base_dirs, theme):
+    """Themes listed in Inherits= of a theme's index.theme"""
+    for base_dir in base_dirs:
+        try:
+            with open(os.path.join(base_dir, theme, 'index.theme'), 'r',
+                      encoding='utf-8', errors='replace') as f:
+                for line in f:
+                    key, sep, value = line.partition('=')
+                    if sep and key.strip() == 'Inherits':
+                        return [name.strip() for name in value.split(',') if name.strip()]
+        except OSError:
+            continue
+    return []
+
+
+def theme_chain(base_dirs, theme):
+    """A theme and everything it inherits, ending with hicolor"""
+    chain = []
+    pending = [theme] if theme else []
+    while pending:
+        name = pending.pop(0)
+        if name in chain or name == 'hicolor':
+            continue
+        chain.append(name)
+        pending.extend(theme_inherits(base_dirs, name))
+    chain.append('hicolor')
+    return chain
+
+
+def dir_size(relative_dir):
+    """Nominal size of a theme subdirectory such as 48x48/apps or apps/scalable"""
+    for part in relative_dir.split(os.sep):
+        if part == 'scalable':
+            return SCALABLE
+        match = _SIZE_DIR.match(part)
+        if match:
+            return int(match.group(1))
+    return UNKNOWN_SIZE
+
+
+def thumbnail_path(path, st, pixels, cache_dir=None):
+    """Cache file of ``path`` scaled to ``pixels``; changes with the file's mtime and size"""
+    cache_dir = cache_dir or os.path.join(default_cache_dir(), 'icons')
+    key = f"{path}\0{st.st_mtime_ns}\0{st.st_size}\0{pixels}".encode('utf-8', 'surrogateescape')
+    return os.path.join(cache_dir, hashlib.sha1(key).hexdigest() + '.png')
+
+
+class IconTheme:
+    """Name -> file index over the icon theme directories, built once on first use"""
+
+    def __init__(self, theme=None, base_dirs=None, pixmap_dirs=('/usr/share/pixmaps',)):
+        self.theme = theme
+        self.base_dirs = base_dirs
+        self.pixmap_dirs = list(pixmap_dirs)
+        # {name: [(theme rank, size, path)]}
+        self.icons = None
+        self._lock = threading.Lock()
+
+    def build(self):
+        """Walk every theme directory once"""
+        with self._lock:
+            if self.icons is not None:
+                return
+            base_dirs = icon_dirs() if self.base_dirs is None else self.base_dirs
+            icons = {}
+            chain = theme_chain(base_dirs, self.theme)
+            for rank, theme in enumerate(chain):
+                for base_dir in base_dirs:
+                    theme_dir = os.path.join(base_dir, theme)
+                    for dir_path, _dirs, files in os.walk(theme_dir):
+                        size = dir_size(os.path.relpath(dir_path, theme_dir))
+                        for filename in files:
+                            stem, ext = os.path.splitext(filename)
+                            if ext in ICON_EXTENSIONS:
+                                icons.setdefault(stem, []).append(
+                                    (rank, size, os.path.join(dir_path, filename)))
+
+            rank = len(chain)
+            for pixmap_dir in self.pixmap_dirs:
+                try:
+                    with os.scandir(pixmap_dir) as it:
+                        for entry in it:
+                            stem, ext = os.path.splitext(entry.name)
+                            if ext in ICON_EXTENSIONS and entry.is_file():
+                                icons.setdefault(stem, []).append((rank, UNKNOWN_SIZE, entry.path))
+                except OSError:
+                    continue
+            self.icons = icons
+
+    def lookup(self, name, pixels):
+        """Best file for an Icon= value at ``pixels``, or None"""
+        if not name:
+            return None
+        if os.path.isabs(name):
+            return name if os.path.isfile(name) else None
+        if self.icons is None:
+            self.build()
+
+        candidates = self.icons.get(name)
+        if not candidates and os.path.splitext(name)[1] in ICON_EXTENSIONS:
+            # Some entries wrongly include the extension
+            candidates = self.icons.get(os.path.splitext(name)[0])
+        if not candidates:
+            return None
+
+        def distance(candidate):
+            rank, size, path = candidate
+            if size == pixels:
+                fit = 0
+            elif size == SCALABLE:
+                fit = 1
+            elif size > pixels:
+                # Scaling down looks better than scaling up
+                fit = 2 + size - pixels
+            elif size == UNKNOWN_SIZE:
+                fit = 100000
+            else:
+                fit = 10000 + pixels - size
+            # SVGs only render with Qt's SVG plugin; prefer raster files at equal fit
+            return (rank, fit, path.endswith('.svg'))
+
+        return min(candidates, key=distance)[2]
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Shell-free application launching for Smart Launcher.
+
+Every app record carries an ``argv`` resolved at index time: the Exec
+arguments of a .desktop file split per the spec, or the absolute path
+of a PATH command. Launching hands that list straight to posix_spawn in
+a new session with stdio on /dev/null, so no /bin/sh is started per
+launch. Commands that really need a shell (pipes, redirections, variable
+assignments) still go through ``/bin/sh -c``.
+
+Children are reaped by one background thread waiting on their pidfds,
+so a long-running launcher never accumulates zombies. Each launch
+records its spawn latency (resolution + spawn, as seen by the caller);
+with a LaunchStats attached, latencies, spawn errors and exits are also
+kept per app on disk (see launch_stats.py).
+"""
+
+import os
+import time
+import shlex
+import shutil
+import threading
+from collections import deque
+
+import tracing
+
+# Characters that only mean something to a shell
+SHELL_CHARS = frozenset('|&;<>()$`\\"\'*?[]~{}\n')
+
+# Spawn latencies kept for stats()
+LATENCY_SAMPLES = 256
+
+# Children started through the subprocess fallback, by pid. Holding the
+# Popen objects keeps subprocess from reaping them behind the reaper's back
+_popen_children = {}
+
+
+class LaunchError(Exception):
+    """The command could not be resolved or spawned"""
+
+
+def resolve_executable(name):
+    """Absolute path of an executable name, or None"""
+    if '/' in name:
+        path = os.path.abspath(os.path.expanduser(name))
+        return path if os.access(path, os.X_OK) else None
+    return shutil.which(name)
+
+
+def resolve_argv(argv):
+    """Copy of ``argv`` with its executable made absolute (unchanged if not found)"""
+    if not argv:
+        return []
+    path = resolve_executable(argv[0])
+    return [path or argv[0]] + list(argv[1:])
+
+
+def needs_shell(command):
+    """Whether a command line uses shell syntax beyond plain words"""
+    if not SHELL_CHARS.intersection(command):
+        words = command.split()
+        # VAR=value prefixes are shell assignments
+        return bool(words) and '=' in words[0]
+    try:
+        argv = shlex.split(command)
+    except ValueError:
+        return True
+    # Quoting produced by shlex.join (desktop entries) is plain words
+    return shlex.join(argv) != command
+
+
+def app_argv(app):
+    """Argument list to spawn for an app record, or None if it needs a shell"""
+    argv = app.get('argv')
+    if argv and os.path.isabs(argv[0]) and os.access(argv[0], os.X_OK):
+        return list(argv)
+
+    # Not resolved at index time, or the binary moved since
+    command = app.get('command', '')
+    if needs_shell(command):
+        return None
+    argv = shlex.split(command)
+    if not argv:
+        raise LaunchError("empty command")
+    path = resolve_executable(argv[0])
+    if path is None:
+        raise LaunchError(f"command not found: {argv[0]}")
+    return [path] + argv[1:]
+
+
+def spawn(argv, env=None):
+    """Start ``argv`` in a new session with stdio on /dev/null; returns the pid"""
+    env = os.environ if env is None else env
+    file_actions = [
+        (os.POSIX_SPAWN_OPEN, 0, os.devnull, os.O_RDONLY, 0),
+        (os.POSIX_SPAWN_OPEN, 1, os.devnull, os.O_WRONLY, 0),
+        (os.POSIX_SPAWN_OPEN, 2, os.devnull, os.O_WRONLY, 0),
+    ]
+    try:
+        # Python opens its own descriptors close-on-exec, so the child
+        # inherits nothing but these three
+        return os.posix_spawn(argv[0], argv, env, file_actions=file_actions, setsid=True)
+    except (AttributeError, NotImplementedError):
+        pass
+
+    import subprocess
+    process = subprocess.Popen(argv, env=env, close_fds=True, start_new_session=True,
+                               stdin=subprocess.DEVNULL,
+                               stdout=subprocess.DEVNULL,
+                               stderr=subprocess.DEVNULL)
+    # The reaper collects the exit status (see LaunchEngine._exited)
+    _popen_children[process.pid] = process
+    return process.pid
+
+
+class Child:
+    """One launched process"""
+
+    def __init__(self, name, argv, pid, started, spawn_time):
+        self.name = name
+        self.argv = argv
+        self.pid = pid
+        self.started = started
+        # Seconds from launch() being called to the child existing
+        self.spawn_time = spawn_time
+        # Set by the reaper: exit code (negative signal number) and lifetime
+        self.exit_status = None
+        self.lifetime = None
+
+
+class LaunchEngine:
+    """Spawns apps without a shell and reaps them in the background.
+
+    ``on_exit(child)`` is called from the reaper thread when a child
+    exits; keep it short. ``telemetry`` (a LaunchStats) receives every
+    launch, spawn error and exit.
+    """
+
+    def __init__(self, on_exit=None, telemetry=None):
+        self.on_exit = on_exit
+        self.telemetry = telemetry
+        self.children = {}
+        self.latencies = deque(maxlen=LATENCY_SAMPLES)
+        self._lock = threading.Lock()
+        self._reaper = None
+        self._wake_r = self._wake_w = None
+
+    def launch(self, app, env=None):
+        """Start an app record; returns its Child or raises LaunchError.
+
+        Commands with shell syntax run under ``app['shell']`` (default /bin/sh).
+        """
+        started = time.perf_counter()
+        try:
+            with tracing.span('launch', app=app.get('name', '')):
+                argv = app_argv(app)
+                if argv is None:
+                    argv = [app.get('shell') or '/bin/sh', '-c', app['command']]
+                try:
+                    pid = spawn(argv, env)
+                except OSError as e:
+                    raise LaunchError(f"{argv[0]}: {e.strerror or e}") from e
+        except LaunchError:
+            if self.telemetry is not None:
+                self.telemetry.record_error(app.get('name', app.get('command', '')))
+            raise
+
+        spawn_time = time.perf_counter() - started
+        child = Child(app.get('name', argv[0]), argv, pid, time.time(), spawn_time)
+        with self._lock:
+            self.latencies.append(spawn_time)
+        if self.telemetry is not None:
+            self.telemetry.record_spawn(child.name, spawn_time)
+        self._watch(child)
+        return child
+
+    def stats(self):
+        """Spawn latency summary (seconds) over the recent launches"""
+        with self._lock:
+            samples = sorted(self.latencies)
+        if not samples:
+            return {'launches': 0}
+        return {
+            'launches': len(samples),
+            'mean': sum(samples) / len(samples),
+            'median': samples[len(samples) // 2],
+            'max': samples[-1],
+        }
+
+    def running(self):
+        with self._lock:
+            return list(self.children.values())
+
+    def _watch(self, child):
+        if not hasattr(os, 'pidfd_open'):
+            threading.Thread(target=self._wait_blocking, args=(child,), daemon=True).start()
+            return
+        try:
+            pidfd = os.pidfd_open(child.pid)
+        except OSError:
+            # Old kernel, or the child is already gone (still needs reaping)
+            threading.Thread(target=self._wait_blocking, args=(child,), daemon=True).start()
+            return
+
+        with self._lock:
+            self.children[pidfd] = child
+            if self._reaper is None:
+                self._wake_r, self._wake_w = os.pipe()
+                self._reaper = threading.Thread(target=self._reap_loop, name='launch-reaper', daemon=True)
+                self._reaper.start()
+        os.write(self._wake_w, b'\0')
+
+    def _wait_blocking(self, child):
+        try:
+            _pid, status = os.waitpid(child.pid, 0)
+        except ChildProcessError:
+            return
+        self._exited(child, status)
+
+    def _reap_loop(self):
+        import selectors
+        selector = selectors.DefaultSelector()
+        selector.register(self._wake_r, selectors.EVENT_READ)
+        watched = set()
+        while True:
+            with self._lock:
+                for pidfd in self.children.keys() - watched:
+                    selector.register(pidfd, selectors.EVENT_READ)
+                    watched.add(pidfd)
+
+            for key, _events in selector.select():
+                if key.fd == self._wake_r:
+                    os.read(self._wake_r, 512)
+                    continue
+                pidfd = key.fd
+                selector.unregister(pidfd)
+                watched.discard(pidfd)
+                with self._lock:
+                    child = self.children.pop(pidfd)
+                os.close(pidfd)
+                try:
+                    _pid, status = os.waitpid(child.pid, 0)
+                except ChildProcessError:
+                    continue
+                self._exited(child, status)
+
+    def _exited(self, child, status):
+        child.exit_status = os.waitstatus_to_exitcode(status)
+        process = _popen_children.pop(child.pid, None)
+        if process is not None:
+            process.returncode = child.exit_status
+        child.lifetime = time.time() - child.started
+        if self.telemetry is not None:
+            self.telemetry.record_exit(child.name, child.exit_status, child.lifetime)
+        if self.on_exit is not None:
+            try:
+                self.on_exit(child)
+            except Exception as e:
+                print(f"⚠️  Launch exit hook failed: {e}")
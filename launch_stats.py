@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Launch telemetry for Smart Launcher.
+
+For every app the launchers keep a few counters and two log-scale
+histograms: spawn latency (from launch() being called to the child
+existing) and lifetime (from spawn to exit, as seen by the reaper). They
+live in ~/.local/share/smart-launcher/launch_stats.json, one small
+record per app however often it is launched.
+
+Recording only touches an in-memory delta under a lock. A background
+thread merges the deltas into the file a moment later (and once more at
+interpreter exit), so launching never waits on the disk. The read,
+merge and replace happen under an flock on launch_stats.json.lock, so
+launchers running side by side (GUI, CLI, daemon) add up rather than
+overwrite each other.
+
+    python3 launch_stats.py    # same as smart_cli_launcher.py --launch-stats
+"""
+
+import os
+import json
+import fcntl
+import math
+import atexit
+import threading
+import time
+from pathlib import Path
+
+from usage_store import default_data_dir
+
+VERSION = 1
+
+# Histogram buckets double in width; bucket 0 holds everything below the base
+SPAWN_BASE = 0.25e-3
+SPAWN_BUCKETS = 16
+LIFETIME_BASE = 0.1
+LIFETIME_BUCKETS = 20
+
+# Seconds to gather records before writing them out
+FLUSH_DELAY = 2.0
+
+# Apps whose median lifetime is below this are reported as short-lived
+SHORT_LIVED = 10.0
+
+
+def bucket_index(value, base, count):
+    """Histogram bucket of ``value``: 0 below ``base``, then one per doubling"""
+    if value < base:
+        return 0
+    return min(count - 1, int(math.log2(value / base)) + 1)
+
+
+def bucket_upper(index, base):
+    """Upper edge of a histogram bucket"""
+    return base * 2 ** index
+
+
+def percentile(histogram, base, fraction):
+    """Upper edge of the bucket holding the given fraction of samples, or None"""
+    total = sum(histogram)
+    if not total:
+        return None
+    needed = fraction * total
+    seen = 0
+    for index, count in enumerate(histogram):
+        seen += count
+        if seen >= needed:
+            return bucket_upper(index, base)
+    return bucket_upper(len(histogram) - 1, base)
+
+
+def empty_record():
+    return {
+        'launches': 0,
+        # Spawn errors (not found, not executable) and non-zero exits
+        'errors': 0,
+        'failures': 0,
+        'exits': 0,
+        'last_status': None,
+        'spawn_total': 0.0,
+        'spawn_max': 0.0,
+        'spawn': [0] * SPAWN_BUCKETS,
+        'lifetime': [0] * LIFETIME_BUCKETS,
+    }
+
+
+def merge_record(into, record):
+    """Add the counts of ``record`` to ``into``"""
+    for key in ('launches', 'errors', 'failures', 'exits', 'spawn_total'):
+        into[key] = into.get(key, 0) + record[key]
+    into['spawn_max'] = max(into.get('spawn_max', 0.0), record['spawn_max'])
+    if record['last_status'] is not None:
+        into['last_status'] = record['last_status']
+    for key in ('spawn', 'lifetime'):
+        counts = into.get(key) or []
+        into[key] = [a + b for a, b in zip(counts + [0] * (len(record[key]) - len(counts)), record[key])]
+    return into
+
+
+def read_stats(path):
+    """{app name: record} stored at ``path``; empty if missing or unreadable"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        print(f"⚠️  Could not read launch stats: {e}")
+        return {}
+    if not isinstance(data, dict) or data.get('version') != VERSION:
+        return {}
+    return data.get('apps', {})
+
+
+class LaunchStats:
+    """Per-app launch counters and histograms, written behind the launcher's back"""
+
+    def __init__(self, path=None, flush_delay=FLUSH_DELAY):
+        self.path = Path(path) if path else default_data_dir() / 'launch_stats.json'
+        self.flush_delay = flush_delay
+        self.pending = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._writer = None
+
+    def record_spawn(self, name, seconds):
+        with self._lock:
+            record = self._pending(name)
+            record['launches'] += 1
+            record['spawn_total'] += seconds
+            record['spawn_max'] = max(record['spawn_max'], seconds)
+            record['spawn'][bucket_index(seconds, SPAWN_BASE, SPAWN_BUCKETS)] += 1
+        self._schedule()
+
+    def record_error(self, name):
+        with self._lock:
+            record = self._pending(name)
+            record['launches'] += 1
+            record['errors'] += 1
+        self._schedule()
+
+    def record_exit(self, name, status, lifetime):
+        with self._lock:
+            record = self._pending(name)
+            record['exits'] += 1
+            record['last_status'] = status
+            if status != 0:
+                record['failures'] += 1
+            record['lifetime'][bucket_index(lifetime, LIFETIME_BASE, LIFETIME_BUCKETS)] += 1
+        self._schedule()
+
+    def load(self):
+        """Stored records with the not yet written ones added"""
+        apps = read_stats(self.path)
+        with self._lock:
+            for name, record in self.pending.items():
+                merge_record(apps.setdefault(name, empty_record()), record)
+        return apps
+
+    def flush(self):
+        """Merge the pending records into the file"""
+        with self._flush_lock:
+            with self._lock:
+                pending, self.pending = self.pending, {}
+            if not pending:
+                return
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.path.with_name(self.path.name + '.lock'), 'a') as lock_file:
+                    # Held until replaced, so no other process merges into a stale copy
+                    fcntl.flock(lock_file, fcntl.LOCK_EX)
+                    apps = read_stats(self.path)
+                    for name, record in pending.items():
+                        merge_record(apps.setdefault(name, empty_record()), record)
+                    tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+                    with open(tmp_path, 'w', encoding='utf-8') as f:
+                        json.dump({'version': VERSION, 'apps': apps}, f, separators=(',', ':'))
+                    os.replace(tmp_path, self.path)
+            except OSError as e:
+                print(f"⚠️  Could not write launch stats: {e}")
+
+    def _pending(self, name):
+        record = self.pending.get(name)
+        if record is None:
+            record = self.pending[name] = empty_record()
+        return record
+
+    def _schedule(self):
+        with self._lock:
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._write_loop, name='launch-stats', daemon=True)
+                self._writer.start()
+                atexit.register(self.flush)
+        self._wake.set()
+
+    def _write_loop(self):
+        while True:
+            self._wake.wait()
+            time.sleep(self.flush_delay)
+            self._wake.clear()
+            self.flush()
+
+
+def format_report(apps, limit=10):
+    """Text report: slowest apps to spawn, most failing, and short-lived ones"""
+    if not apps:
+        return "No launches recorded yet."
+
+    def ms(seconds):
+        return f"{seconds * 1000:8.1f}"
+
+    lines = []
+    spawned = [(name, record) for name, record in apps.items() if sum(record['spawn'])]
+    spawned.sort(key=lambda item: -item[1]['spawn_total'] / sum(item[1]['spawn']))
+    lines.append("🐢 Slowest to spawn (ms)")
+    lines.append(f"   {'mean':>8} {'p90 ≤':>8} {'max':>8} {'runs':>5}  app")
+    for name, record in spawned[:limit]:
+        runs = sum(record['spawn'])
+        p90 = percentile(record['spawn'], SPAWN_BASE, 0.9)
+        lines.append(f"   {ms(record['spawn_total'] / runs)} {ms(p90)} {ms(record['spawn_max'])} {runs:5d}  {name}")
+
+    failing = [(name, record) for name, record in apps.items() if record['errors'] or record['failures']]
+    failing.sort(key=lambda item: (-(item[1]['errors'] + item[1]['failures']), item[0]))
+    lines.append("")
+    lines.append("💥 Most failing")
+    if not failing:
+        lines.append("   none")
+    else:
+        lines.append(f"   {'failed':>6} {'of':>5} {'last':>5}  app")
+        for name, record in failing[:limit]:
+            failed = record['errors'] + record['failures']
+            last = record['last_status']
+            last = '-' if last is None else str(last)
+            lines.append(f"   {failed:6d} {record['launches']:5d} {last:>5}  {name}")
+
+    short = []
+    for name, record in apps.items():
+        median = percentile(record['lifetime'], LIFETIME_BASE, 0.5)
+        if median is not None and median <= SHORT_LIVED:
+            short.append((median, name, record))
+    short.sort(key=lambda item: (item[0], item[1]))
+    lines.append("")
+    lines.append(f"⚡ Short-lived (median time to exit ≤ {SHORT_LIVED:g} s)")
+    if not short:
+        lines.append("   none")
+    else:
+        lines.append(f"   {'median ≤':>9} {'exits':>5}  app")
+        for median, name, record in short[:limit]:
+            lines.append(f"   {median:8.1f}s {record['exits']:5d}  {name}")
+    return '\n'.join(lines)
+
+
+def print_report(path=None):
+    """Print the launch stats report; returns an exit code"""
+    print(format_report(LaunchStats(path).load()))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(print_report())
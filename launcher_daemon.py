@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Resident index daemon for Smart Launcher.
+
+Keeps the application index, the search index and the usage stats in
+memory (kept live by AppWatcher) and answers requests on a Unix domain
+socket, so the CLI starts instantly and never rescans. The protocol is
+one JSON object per line in each direction:
+
+    {"op": "ping"}                                  -> {"ok": true, "pid": 1234, "apps": 1288}
+    {"op": "list"}                                  -> {"ok": true, "categories": {"Programming": 66, ...}}
+    {"op": "query", "query": "fire", "category": "All", "limit": 20}
+                                                    -> {"ok": true, "apps": [{..., "category": "Internet"}]}
+    {"op": "launch", "name": "Firefox", "command": "firefox", "env": {"DISPLAY": ":0"}}
+                                                    -> {"ok": true, "pid": 4321, "spawn_ms": 0.4}
+    {"op": "refresh"}                               -> {"ok": true, "apps": 1290}
+    {"op": "stats"}                                 -> {"ok": true, "launches": 12, "median_ms": 0.4,
+                                                        "max_ms": 1.9, "running": [{"name": "Firefox", "pid": 4321}]}
+    {"op": "shutdown"}                              -> {"ok": true}
+
+Errors come back as {"ok": false, "error": "..."}.
+
+    python3 launcher_daemon.py           # run in the foreground
+    python3 launcher_daemon.py --stop    # stop a running daemon
+"""
+
+import os
+import sys
+import json
+import socket
+import argparse
+import threading
+import socketserver
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from smart_launcher import ApplicationDetector
+from app_index import AppIndex
+from search_index import ALL, SearchIndex, SearchSession
+from usage_store import UsageStore
+from launch_engine import LaunchEngine, LaunchError
+from launch_stats import LaunchStats
+from runtime_dir import runtime_dir
+
+# Client variables passed on to launched apps, so they open on the
+# client's display rather than the daemon's
+LAUNCH_ENV = ('DISPLAY', 'WAYLAND_DISPLAY', 'XAUTHORITY', 'DBUS_SESSION_BUS_ADDRESS')
+
+CLIENT_TIMEOUT = 5.0
+
+# A refresh rescans every directory, far longer than a query on big systems
+OP_TIMEOUTS = {'refresh': 300.0}
+
+
+def default_socket_path():
+    """Socket path, in XDG_RUNTIME_DIR when available (see runtime_dir.py)"""
+    return Path(runtime_dir()) / 'daemon.sock'
+
+
+class DaemonError(Exception):
+    """The daemon answered with an error"""
+
+
+class DaemonClient:
+    """Line-delimited JSON client; one connection per request"""
+
+    def __init__(self, socket_path=None, timeout=CLIENT_TIMEOUT):
+        self.socket_path = str(socket_path or default_socket_path())
+        self.timeout = timeout
+
+    @classmethod
+    def connect(cls, socket_path=None):
+        """A client if a daemon answers on the socket, else None"""
+        try:
+            client = cls(socket_path)
+            client.request('ping')
+        except (OSError, ValueError, DaemonError):
+            return None
+        return client
+
+    def request(self, op, **params):
+        params['op'] = op
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(max(self.timeout, OP_TIMEOUTS.get(op, 0)))
+            sock.connect(self.socket_path)
+            sock.sendall(json.dumps(params).encode('utf-8') + b'\n')
+            with sock.makefile('rb') as f:
+                line = f.readline()
+        if not line:
+            raise DaemonError('daemon closed the connection')
+        response = json.loads(line)
+        if not response.get('ok'):
+            raise DaemonError(response.get('error', 'unknown error'))
+        return response
+
+
+class LauncherDaemon:
+    """In-memory index, search and usage state behind the socket protocol"""
+
+    def __init__(self, socket_path=None):
+        self.socket_path = Path(socket_path) if socket_path else default_socket_path()
+        self.detector = ApplicationDetector()
+        self.index = AppIndex(self.detector)
+        self.usage = UsageStore().load()
+        self.launch_engine = LaunchEngine(on_exit=self.on_child_exit, telemetry=LaunchStats())
+        self.watcher = None
+        self.server = None
+        self.lock = threading.Lock()
+        self.search_index = None
+        self.search_session = None
+        self.by_identity = {}
+
+    def load(self):
+        self.publish(self.index.load())
+
+    def publish(self, apps, previous=None):
+        """Swap in new search structures built from a categorized app dict"""
+        search_index = SearchIndex({category: app_list for category, app_list in apps.items() if app_list},
+                                   previous=previous)
+        by_identity = {(app['name'], app['command']): app for app in search_index.apps}
+        with self.lock:
+            self.search_index = search_index
+            self.search_session = SearchSession(search_index, usage=self.usage)
+            self.by_identity = by_identity
+
+    def on_child_exit(self, child):
+        """LaunchEngine callback, on the reaper thread"""
+        print(f"🏁 {child.name} (pid {child.pid}) exited with {child.exit_status} after {child.lifetime:.1f} s")
+
+    def on_apps_changed(self, delta):
+        """AppWatcher callback; only the field values the delta brings are n-grammed"""
+        self.publish(self.index.applications(), previous=self.search_index)
+
+    def handle(self, request):
+        """Answer one request dict"""
+        op = request.get('op')
+        handler = getattr(self, 'op_' + str(op), None)
+        if handler is None:
+            return {'ok': False, 'error': f"unknown op: {op}"}
+        try:
+            response = handler(request)
+        except KeyError as e:
+            return {'ok': False, 'error': f"missing field: {e}"}
+        except (LookupError, TypeError, ValueError, LaunchError) as e:
+            return {'ok': False, 'error': str(e)}
+        response['ok'] = True
+        return response
+
+    def op_ping(self, request):
+        return {'pid': os.getpid(), 'apps': len(self.search_index)}
+
+    def op_list(self, request):
+        ranges = self.search_index.ranges
+        return {'categories': {category: len(ranges[category])
+                               for category in ranges if category != ALL}}
+
+    def op_query(self, request):
+        session = self.search_session
+        ids = session.search_ids(str(request.get('query', '')), request.get('category', ALL))
+        limit = request.get('limit')
+        if limit is not None:
+            ids = ids[:int(limit)]
+        index = session.index
+        return {'apps': [dict(index.apps[doc_id], category=index.category_of(doc_id)) for doc_id in ids]}
+
+    def op_launch(self, request):
+        app = self.by_identity.get((request['name'], request['command']))
+        if app is None:
+            raise LookupError(f"unknown application: {request['name']}")
+        env = dict(os.environ)
+        env.update({key: str(value) for key, value in (request.get('env') or {}).items()
+                    if key in LAUNCH_ENV})
+        child = self.launch_engine.launch(app, env)
+        with self.lock:
+            self.usage.record(app)
+            self.search_session.usage_changed()
+        return {'pid': child.pid, 'spawn_ms': round(child.spawn_time * 1000, 3)}
+
+    def op_stats(self, request):
+        stats = self.launch_engine.stats()
+        response = {'launches': stats['launches']}
+        for key in ('mean', 'median', 'max'):
+            if key in stats:
+                response[key + '_ms'] = round(stats[key] * 1000, 3)
+        response['running'] = [{'name': child.name, 'pid': child.pid, 'started': child.started}
+                               for child in self.launch_engine.running()]
+        return response
+
+    def op_refresh(self, request):
+        self.load()
+        return {'apps': len(self.search_index)}
+
+    def op_shutdown(self, request):
+        # Stopped from another thread so this response still gets written
+        threading.Thread(target=self.server.shutdown, daemon=True).start()
+        return {}
+
+    def serve_forever(self):
+        """Bind the socket, keep the index live and serve until shut down"""
+        if DaemonClient.connect(self.socket_path):
+            print(f"⚠️  A daemon is already running on {self.socket_path}")
+            return False
+
+        print("🔍 Loading applications...")
+        self.load()
+        print(f"✅ {len(self.search_index)} applications in memory")
+
+        self.socket_path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        try:
+            self.socket_path.unlink()
+        except FileNotFoundError:
+            pass
+
+        from app_watcher import AppWatcher
+        self.watcher = AppWatcher(self.index, self.on_apps_changed)
+        self.watcher.start()
+
+        self.server = _Server(str(self.socket_path), _RequestHandler)
+        self.server.launcher = self
+        os.chmod(self.socket_path, 0o600)
+        print(f"🔗 Listening on {self.socket_path}")
+        try:
+            self.server.serve_forever()
+        finally:
+            self.server.server_close()
+            self.watcher.stop()
+            try:
+                self.socket_path.unlink()
+            except FileNotFoundError:
+                pass
+        return True
+
+
+class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Answers each request line with one response line"""
+
+    def handle(self):
+        launcher = self.server.launcher
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise ValueError('request must be an object')
+            except ValueError as e:
+                response = {'ok': False, 'error': f"invalid JSON: {e}"}
+            else:
+                response = launcher.handle(request)
+            self.wfile.write(json.dumps(response, ensure_ascii=False).encode('utf-8') + b'\n')
+            self.wfile.flush()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Smart Launcher index daemon")
+    parser.add_argument('--socket', help='socket path (default: $XDG_RUNTIME_DIR/smart-launcher/daemon.sock)')
+    parser.add_argument('--stop', action='store_true', help='stop a running daemon')
+    args = parser.parse_args()
+
+    if args.stop:
+        client = DaemonClient.connect(args.socket)
+        if client is None:
+            print("❌ No daemon running")
+            sys.exit(1)
+        client.request('shutdown')
+        print("👋 Daemon stopped")
+        return
+
+    try:
+        daemon = LauncherDaemon(args.socket)
+    except PermissionError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    try:
+        if not daemon.serve_forever():
+            sys.exit(1)
+    except KeyboardInterrupt:
+        print("\n👋 Goodbye!")
+
+
+if __name__ == "__main__":
+    main()
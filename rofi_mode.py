@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Rofi script-mode provider for the echo-launcher tree.
+
+One rofi window serves every level: rofi runs this script again on each
+selection with the chosen row's info in ROFI_INFO, and the script
+answers with the next level, or launches the command and prints nothing
+so rofi closes. No dmenu round trip per level, no temp file and no
+confirmation dialog.
+
+Two modes over the same cached tree index (see echo_index.py):
+
+    tree   directories level by level, with a Back row and a breadcrumb prompt
+    all    every command file as one flat list of breadcrumbs, so a tool
+           six levels deep is one fuzzy query away; with --apps the
+           applications found by ApplicationDetector are listed too
+
+    rofi -modi "tree:./rofi_mode.py,all:./rofi_mode.py --all --apps" -show tree
+
+Detected apps come from the resident daemon when it is running (which
+also records the launch for frecency), otherwise from the cached
+application index without revalidating it. Needs rofi 1.7 or later.
+"""
+
+import os
+import sys
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from echo_index import EchoIndex
+
+DEFAULT_LAUNCHER_DIR = os.environ.get('ECHO_LAUNCHER_DIR') or os.path.expanduser('~/echo-launcher')
+
+ROOT_PROMPT = '🚀 Echo Launcher'
+SEPARATOR = ' / '
+BACK_OPTION = '⬅️ Back'
+APP_ICON = '🚀'
+
+# ROFI_RETV values
+RETV_INITIAL = 0
+RETV_SELECTED = 1
+
+
+def option(key, value):
+    """A mode option line (prompt, message, data, ...)"""
+    return f"\0{key}\x1f{value}"
+
+
+def row(text, info, **options):
+    """An entry line; ``info`` comes back in ROFI_INFO when it is selected"""
+    options['info'] = info
+    return text + '\0' + '\x1f'.join(f"{key}\x1f{value}" for key, value in options.items() if value)
+
+
+def clean(text):
+    """Text safe inside a row: no newlines, NULs or field separators"""
+    return ' '.join(str(text).replace('\0', ' ').replace('\x1f', ' ').split())
+
+
+def breadcrumb(relative):
+    return ROOT_PROMPT + ''.join(SEPARATOR + part for part in relative.split('/') if part)
+
+
+class RofiMode:
+    """One invocation of the script: reads rofi's state, prints the next menu or launches"""
+
+    def __init__(self, launcher_dir, flat=False, apps=False):
+        self.flat = flat
+        self.with_apps = apps
+        index = EchoIndex(launcher_dir).load()
+        if index.refresh():
+            index.save()
+        self.launcher_dir = index.launcher_dir
+        # {relative dir: [(kind, relative path, display name, command)]}
+        self.children = {}
+        self.dirs = {''}
+        self.commands = {}
+        for kind, relative, display, command in index.entries():
+            parent = relative.rpartition('/')[0]
+            self.children.setdefault(parent, []).append((kind, relative, display, command))
+            if kind == 'd':
+                self.dirs.add(relative)
+            else:
+                self.commands[relative] = command
+
+    def run(self, retv, info):
+        """Lines to print for this invocation"""
+        if retv == RETV_SELECTED and info:
+            kind, _sep, value = info.partition(':')
+            if kind == 'd':
+                return self.tree_rows(value)
+            try:
+                if kind == 'f':
+                    self.launch_file(value)
+                    return []
+                if kind == 'a':
+                    self.launch_app(value)
+                    return []
+            except Exception as e:
+                return self.menu(os.environ.get('ROFI_DATA', ''), message=f"❌ Failed to launch: {e}")
+        return self.menu(os.environ.get('ROFI_DATA', '') if retv != RETV_INITIAL else '')
+
+    def menu(self, relative, message=None):
+        lines = self.flat_rows() if self.flat else self.tree_rows(relative)
+        if message:
+            lines.insert(0, option('message', clean(message)))
+        return lines
+
+    def tree_rows(self, relative):
+        if relative not in self.dirs:
+            # The directory went away since the menu was shown
+            relative = ''
+        lines = [option('prompt', breadcrumb(relative)), option('data', relative),
+                 option('no-custom', 'true')]
+        if relative:
+            lines.append(row(BACK_OPTION, 'd:' + relative.rpartition('/')[0]))
+        entries = self.children.get(relative, [])
+        for kind, child, display, _command in entries:
+            lines.append(row(display, f'{kind}:{child}'))
+        if not entries:
+            lines.append(option('message', '📭 Empty directory' if relative else
+                                f'📭 No categories found. Create directories in {self.launcher_dir}'))
+        return lines
+
+    def flat_rows(self):
+        lines = [option('prompt', ROOT_PROMPT), option('no-custom', 'true')]
+        for relative in sorted(self.commands, key=lambda path: path.split('/')):
+            parts = relative.split('/')
+            text = '⚡ ' + SEPARATOR.join(parts)
+            lines.append(row(text, 'f:' + relative, meta=clean(self.commands[relative])))
+        if self.with_apps:
+            for app in self.detected_apps():
+                text = f"{APP_ICON} {clean(app['name'])}"
+                if app.get('category'):
+                    text += f"  ·  {clean(app['category'])}"
+                lines.append(row(text, f"a:{app['name']}\t{app['command']}",
+                                 icon=clean(app.get('icon') or ''),
+                                 meta=clean(f"{app.get('description', '')} {app['command']}")))
+        return lines
+
+    def detected_apps(self):
+        """Apps from the daemon, or from the cached index"""
+        from launcher_daemon import DaemonClient, DaemonError
+        daemon = DaemonClient.connect()
+        if daemon is not None:
+            try:
+                return daemon.request('query', query='')['apps']
+            except (OSError, ValueError, DaemonError):
+                pass
+
+        apps = []
+        for category, app_list in self.cached_index().items():
+            apps.extend(dict(app, category=category) for app in app_list)
+        apps.sort(key=lambda app: app['name'].lower())
+        return apps
+
+    @staticmethod
+    def cached_index():
+        from contextlib import redirect_stdout
+        from smart_launcher import ApplicationDetector
+        from app_index import AppIndex
+        index = AppIndex(ApplicationDetector())
+        # stdout belongs to rofi
+        with redirect_stdout(sys.stderr):
+            apps = index.cached_applications()
+            return apps if any(apps.values()) else index.load()
+
+    def launch_file(self, relative):
+        from launch_engine import LaunchEngine, LaunchError
+        from launch_stats import LaunchStats
+        command = self.commands.get(relative)
+        if not command:
+            raise LaunchError(f"no command found in '{relative.rpartition('/')[2]}'")
+        # Echo files have always been run by bash
+        LaunchEngine(telemetry=LaunchStats()).launch({'name': relative.rpartition('/')[2], 'command': command,
+                                                      'shell': '/bin/bash'})
+
+    def launch_app(self, value):
+        from launcher_daemon import DaemonClient, DaemonError, LAUNCH_ENV
+        name, _sep, command = value.partition('\t')
+        daemon = DaemonClient.connect()
+        if daemon is not None:
+            env = {key: os.environ[key] for key in LAUNCH_ENV if key in os.environ}
+            try:
+                daemon.request('launch', name=name, command=command, env=env)
+                return
+            except (OSError, ValueError, DaemonError):
+                pass
+
+        from launch_engine import LaunchEngine, LaunchError
+        from launch_stats import LaunchStats
+        from usage_store import UsageStore
+        for app_list in self.cached_index().values():
+            for app in app_list:
+                if app['name'] == name and app['command'] == command:
+                    LaunchEngine(telemetry=LaunchStats()).launch(app)
+                    UsageStore().load().record(app)
+                    return
+        raise LaunchError(f"unknown application: {name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rofi script mode for the echo-launcher tree")
+    parser.add_argument('--launcher-dir', default=DEFAULT_LAUNCHER_DIR,
+                        help='launcher tree (default: %(default)s)')
+    parser.add_argument('--all', action='store_true', help='flat list of every command file')
+    parser.add_argument('--apps', action='store_true', help='with --all, also list detected applications')
+    # rofi passes the selected row's text; the mode works from ROFI_INFO instead
+    parser.add_argument('selection', nargs='?', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    try:
+        retv = int(os.environ.get('ROFI_RETV', RETV_INITIAL))
+    except ValueError:
+        retv = RETV_INITIAL
+    mode = RofiMode(args.launcher_dir, flat=args.all, apps=args.apps)
+    lines = mode.run(retv, os.environ.get('ROFI_INFO', ''))
+    if lines:
+        sys.stdout.write('\n'.join(lines) + '\n')
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Private runtime directory for Smart Launcher's sockets.
+
+The GUI's single-instance socket and the daemon's socket live in
+$XDG_RUNTIME_DIR/smart-launcher, or in /tmp/smart-launcher-<uid> when
+XDG_RUNTIME_DIR is unset. /tmp is shared, so another user could create
+that directory (or a symlink by that name) first and then listen in on,
+or answer, our sockets. The directory is only used when it is a real
+directory owned by the current user with mode 0700.
+
+Imports nothing beyond the standard library, so the GUI can use it
+before loading Qt.
+"""
+
+import os
+import stat
+
+
+def runtime_dir():
+    """Path of the socket directory, created if missing; PermissionError if it is not private"""
+    base = os.environ.get('XDG_RUNTIME_DIR')
+    if base and os.path.isdir(base):
+        path = os.path.join(base, 'smart-launcher')
+    else:
+        path = f'/tmp/smart-launcher-{os.getuid()}'
+    try:
+        os.mkdir(path, 0o700)
+    except FileExistsError:
+        pass
+
+    st = os.lstat(path)
+    if (not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid() or
+            stat.S_IMODE(st.st_mode) != 0o700):
+        raise PermissionError(f"{path} is not a private directory "
+                              f"(must be owned by uid {os.getuid()} with mode 0700)")
+    return path
@@ -0,0 +1,462 @@
+#!/usr/bin/env python3
+"""
+Search index for Smart Launcher.
+
+Built once per detection from the categorized app dict. Every app gets a
+pre-lowercased haystack (name, description and command), apps are laid
+out category by category so a category is a contiguous id range, and
+bigram/trigram posting lists map n-grams to the distinct field values
+containing them (bigrams answer two-character queries, the prefix of
+every search). Field values are deduplicated first: thousands of PATH
+tools share the description "Command line tool" and usually have
+name == command, so the n-gram index stays small.
+
+Plain queries keep the launcher's substring semantics: an app matches
+when the lowercased query occurs in its name, description or command.
+Fuzzy queries (``match_ids``) also accept the query as a subsequence of
+the name or command, and ``rank_ids`` orders matches by fuzzy score.
+"""
+
+import heapq
+import math
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+
+import fuzzy
+import tracing
+from usage_store import app_key
+
+ALL = 'All'
+
+# Above this share of the apps in range, a straight scan over the
+# haystacks is cheaper than merging posting lists
+SCAN_RATIO = 0.25
+
+# Matches ordered by score; the rest keep display order
+RANKED_RESULTS = 50
+
+# Score bonus per doubling of an app's frecency (one launch now = 1.0)
+FRECENCY_BONUS = 16
+
+
+def _bigrams(text):
+    return set(map(''.join, zip(text, text[1:])))
+
+
+def _trigrams(text):
+    return set(map(''.join, zip(text, text[1:], text[2:])))
+
+
+class SearchIndex:
+    """Immutable substring index over a categorized app dict"""
+
+    def __init__(self, apps_by_category, previous=None):
+        """Index ``apps_by_category``.
+
+        ``previous`` is an index of an earlier version of the same apps
+        (e.g. before a watcher delta): its field values keep their ids and
+        n-gram postings, so only values it did not have are n-grammed.
+        """
+        with tracing.span('build_search_index', incremental=previous is not None):
+            self._build(apps_by_category, previous)
+
+    def _build(self, apps_by_category, previous=None):
+        self.apps = []
+        self.app_categories = []
+        self.ranges = {}
+        for category, apps in apps_by_category.items():
+            start = len(self.apps)
+            self.apps.extend(apps)
+            self.app_categories.extend([category] * len(apps))
+            self.ranges[category] = range(start, len(self.apps))
+        self.ranges[ALL] = range(len(self.apps))
+
+        # NUL separators keep matches from spanning two fields
+        self.haystacks = []
+        self.names = []
+        self.commands = []
+        self.fuzzy_texts = []
+        if previous is not None and previous.unused_strings * 2 > len(previous.strings):
+            # Mostly values that are gone: start over
+            previous = None
+        if previous is not None:
+            strings = {text: string_id for string_id, text in enumerate(previous.strings)}
+            string_docs = [array('I') for _text in previous.strings]
+        else:
+            strings = {}
+            string_docs = []
+        for doc_id, app in enumerate(self.apps):
+            command = app['command']
+            if app.get('aliases'):
+                # Other names of the same program (merged PATH commands)
+                command = ' '.join([command] + app['aliases'])
+            fields = (app['name'].lower(), app['description'].lower(), command.lower())
+            self.haystacks.append('\0'.join(fields))
+            self.names.append(fields[0])
+            self.commands.append(fields[2])
+            self.fuzzy_texts.append(fields[0] if fields[0] == fields[2] else fields[0] + '\0' + fields[2])
+            for field in set(fields):
+                string_id = strings.get(field)
+                if string_id is None:
+                    string_id = strings[field] = len(string_docs)
+                    string_docs.append(array('I'))
+                string_docs[string_id].append(doc_id)
+
+        # Names and commands in sorted order, to find prefix matches by bisection
+        prefixes = sorted({(text, doc_id) for doc_id in range(len(self.apps))
+                           for text in (self.names[doc_id], self.commands[doc_id])})
+        self.prefix_keys = [text for text, _doc_id in prefixes]
+        self.prefix_docs = array('I', [doc_id for _text, doc_id in prefixes])
+
+        # All fuzzy texts in one newline-separated string: a single regex
+        # pass over it finds the subsequence matches of a whole category
+        offsets = array('I')
+        position = 0
+        for text in self.fuzzy_texts:
+            offsets.append(position)
+            position += len(text) + 1
+        self.fuzzy_offsets = offsets
+        self.fuzzy_blob = '\n'.join(text.replace('\n', ' ') for text in self.fuzzy_texts)
+
+        self.strings = list(strings)
+        self.string_docs = string_docs
+        # Values of the previous index no app has any more; they match nothing
+        self.unused_strings = sum(1 for docs in string_docs if not docs)
+
+        if previous is not None:
+            # The previous index may still be searched on another thread:
+            # its posting lists are copied before anything is appended
+            postings = dict(previous.postings)
+            shared = set(postings)
+            first_new = len(previous.strings)
+        else:
+            postings = {}
+            shared = set()
+            first_new = 0
+        for string_id in range(first_new, len(self.strings)):
+            text = self.strings[string_id]
+            for gram in _bigrams(text) | _trigrams(text):
+                posting = postings.get(gram)
+                if posting is None:
+                    posting = postings[gram] = array('I')
+                elif gram in shared:
+                    posting = postings[gram] = array('I', posting)
+                    shared.discard(gram)
+                posting.append(string_id)
+        self.postings = postings
+
+    def __len__(self):
+        return len(self.apps)
+
+    def category_of(self, doc_id):
+        return self.app_categories[doc_id]
+
+    def search(self, query, category=ALL):
+        """Apps of ``category`` matching ``query``, in display order"""
+        return list(map(self.apps.__getitem__, self.search_ids(query, category)))
+
+    def search_ids(self, query, category=ALL, candidates=None):
+        """Ids of matching apps in ascending (display) order.
+
+        ``candidates`` optionally restricts the search to a sorted subset
+        of ids, e.g. the results of a shorter query.
+        """
+        doc_range = self.ranges.get(category)
+        if doc_range is None:
+            return []
+        query = query.lower().strip()
+        if not query:
+            return list(candidates) if candidates is not None else list(doc_range)
+
+        haystacks = self.haystacks
+        if candidates is not None:
+            return [doc_id for doc_id in candidates if query in haystacks[doc_id]]
+
+        string_ids = self._matching_strings(query)
+        if string_ids is None:
+            return self._scan(query, doc_range)
+
+        string_docs = self.string_docs
+        total = sum(len(string_docs[string_id]) for string_id in string_ids)
+        if total > SCAN_RATIO * len(doc_range):
+            return self._scan(query, doc_range)
+
+        doc_ids = set()
+        for string_id in string_ids:
+            doc_ids.update(string_docs[string_id])
+        start, stop = doc_range.start, doc_range.stop
+        return sorted(doc_id for doc_id in doc_ids if start <= doc_id < stop)
+
+    def match_ids(self, query, category=ALL, candidates=None, limit=None, extra=()):
+        """Ids of apps matching ``query`` as substring or fuzzy subsequence.
+
+        Substrings are looked for in every field, subsequences only in the
+        name and command. Ascending (display) order, like ``search_ids``;
+        ``candidates`` may come in any order.
+
+        With ``limit``, the subsequence pass is skipped when ``prefix_fills``
+        says prefix matches alone fill the ranked head: subsequence-only
+        matches could not reach it, so only the ``extra`` ids (e.g. apps
+        with a usage boost) are checked and the result leaves the others out.
+        """
+        ids = self.search_ids(query, category, candidates)
+        query = query.lower().strip()
+        if len(query) < 2:
+            # A one-character subsequence is a substring
+            return ids if candidates is None else sorted(ids)
+
+        pattern = fuzzy.subsequence_pattern(query)
+        if limit is not None and self.prefix_fills(query, category, limit):
+            fuzzy_texts = self.fuzzy_texts
+            doc_range = self.ranges.get(category, range(0))
+            fuzzy_ids = [doc_id for doc_id in extra
+                         if doc_id in doc_range and pattern.search(fuzzy_texts[doc_id])]
+        elif candidates is not None:
+            fuzzy_texts = self.fuzzy_texts
+            fuzzy_ids = [doc_id for doc_id in candidates if pattern.search(fuzzy_texts[doc_id])]
+        else:
+            fuzzy_ids = self._fuzzy_scan(pattern, self.ranges.get(category, range(0)))
+        if not fuzzy_ids:
+            return ids if candidates is None else sorted(ids)
+        return sorted(set(ids).union(fuzzy_ids))
+
+    def _fuzzy_scan(self, pattern, doc_range):
+        """Ids in ``doc_range`` whose name or command matches ``pattern``"""
+        if not doc_range:
+            return []
+        offsets = self.fuzzy_offsets
+        start = offsets[doc_range.start]
+        stop = offsets[doc_range.stop] - 1 if doc_range.stop < len(offsets) else len(self.fuzzy_blob)
+        # A match never crosses a newline, so each one lies in a single app;
+        # an app can match more than once
+        doc_ids = {bisect_right(offsets, match.start()) - 1
+                   for match in pattern.finditer(self.fuzzy_blob, start, stop)}
+        return doc_ids
+
+    def prefix_fills(self, query, category, limit):
+        """Whether at least ``limit`` apps of ``category`` have a name or command starting with query.
+
+        Those outscore every other match (see fuzzy.py), so they make up
+        the whole ranked head.
+        """
+        doc_range = self.ranges.get(category, range(0))
+        keys = self.prefix_keys
+        start = bisect_left(keys, query)
+        stop = bisect_left(keys, query + '\uffff', start)
+        if stop - start < limit:
+            return False
+        prefix_docs = self.prefix_docs
+        found = set()
+        for position in range(start, stop):
+            doc_id = prefix_docs[position]
+            if doc_id in doc_range:
+                found.add(doc_id)
+                if len(found) >= limit:
+                    return True
+        return False
+
+    def score(self, query, doc_id):
+        """Fuzzy score of one app; description-only matches score 0"""
+        name = self.names[doc_id]
+        best = fuzzy.score(query, name)
+        command = self.commands[doc_id]
+        if command != name:
+            command_score = fuzzy.score(query, command)
+            if command_score is not None and (best is None or command_score > best):
+                best = command_score
+        if best is None:
+            return 0
+        if name == query:
+            best += fuzzy.BONUS_PREFIX
+        return best
+
+    def rank_ids(self, query, ids, limit=RANKED_RESULTS, boosts=None):
+        """``ids`` with the best ``limit`` first by score, the rest in order.
+
+        ``boosts`` optionally maps ids to a bonus added to their score.
+        Only a heap of ``limit`` entries is kept, the matches are never
+        sorted as a whole.
+        """
+        query = query.lower().strip()
+        if not query or not ids:
+            return list(ids)
+
+        scored = ids
+        if len(ids) > limit:
+            # Prefix matches outscore everything else, so when there are
+            # enough of them the rest need not be scored at all (unless
+            # a boost lifts them)
+            id_set = set(ids)
+            prefixed = id_set.intersection(self._prefix_ids(query))
+            if len(prefixed) >= limit:
+                # They all score the same except exact names, and ties
+                # keep id order, so only the first ``limit`` of them can
+                # make the head
+                head = set(heapq.nsmallest(limit, prefixed))
+                names = self.names
+                head.update(doc_id for doc_id in self._exact_ids(query)
+                            if doc_id in prefixed and names[doc_id] == query)
+                if boosts:
+                    head.update(id_set.intersection(boosts))
+                scored = sorted(head)
+
+        score = self.score
+        if boosts:
+            scores = ((score(query, doc_id) + boosts.get(doc_id, 0), doc_id) for doc_id in scored)
+        else:
+            scores = ((score(query, doc_id), doc_id) for doc_id in scored)
+        best = [doc_id for _score, doc_id in fuzzy.top_k(scores, limit)]
+        head = set(best)
+        return best + [doc_id for doc_id in ids if doc_id not in head]
+
+    def _exact_ids(self, query):
+        """Ids of apps whose name or command is query"""
+        keys = self.prefix_keys
+        start = bisect_left(keys, query)
+        return self.prefix_docs[start:bisect_right(keys, query, start)]
+
+    def _prefix_ids(self, query):
+        """Ids of apps whose name or command starts with query"""
+        keys = self.prefix_keys
+        start = bisect_left(keys, query)
+        stop = bisect_left(keys, query + '\uffff', start)
+        return self.prefix_docs[start:stop]
+
+    def _matching_strings(self, query):
+        """Distinct field values containing query, or None for 1-char queries"""
+        if len(query) < 2:
+            return None
+
+        smallest = None
+        for gram in (_trigrams(query) if len(query) > 2 else (query,)):
+            posting = self.postings.get(gram)
+            if posting is None:
+                return []
+            if smallest is None or len(posting) < len(smallest):
+                smallest = posting
+
+        strings = self.strings
+        if len(query) <= 3:
+            # The posting list of the query's only n-gram is exact
+            return list(smallest)
+        return [string_id for string_id in smallest if query in strings[string_id]]
+
+    def _scan(self, query, doc_range):
+        haystacks = self.haystacks[doc_range.start:doc_range.stop]
+        return [doc_id for doc_id, haystack in zip(doc_range, haystacks) if query in haystack]
+
+
+class SearchSession:
+    """Incremental, ranked search over one SearchIndex.
+
+    Typing usually extends the previous query ("fire" -> "firef"), and
+    every app matching the longer query also matches the shorter one
+    (as substring and as subsequence), so the cached result of the
+    longest cached prefix is used as candidate set instead of searching
+    the whole index again. A bounded LRU of (category, query) -> ranked
+    ids makes backspacing and repeated queries instant. A session is
+    tied to its index; start a new one whenever the index is rebuilt.
+    Sessions are thread-safe.
+
+    With a UsageStore, frequently and recently launched apps get a score
+    bonus, and lead the list when there is no query. Call usage_changed()
+    after recording a launch.
+    """
+
+    CACHE_SIZE = 64
+
+    def __init__(self, index, cache_size=CACHE_SIZE, ranked=RANKED_RESULTS, usage=None):
+        self.index = index
+        self.cache_size = cache_size
+        self.ranked = ranked
+        self.usage = usage
+        self._cache = OrderedDict()
+        # Keys whose results leave out subsequence-only matches (see
+        # SearchIndex.match_ids); they are never used as candidates
+        self._partial = set()
+        self._boosts = None
+        # Searches may run on a worker thread while the GUI records launches
+        self._lock = threading.Lock()
+
+    def usage_changed(self):
+        """Forget rankings that depend on the usage store"""
+        with self._lock:
+            self._cache.clear()
+            self._partial.clear()
+            self._boosts = None
+
+    def boosts(self):
+        """{id: frecency bonus} of every launched app in the index"""
+        if self._boosts is None:
+            self._boosts = {}
+            scores = self.usage.scores() if self.usage is not None else None
+            if scores:
+                for doc_id, app in enumerate(self.index.apps):
+                    frecency = scores.get(app_key(app))
+                    if frecency:
+                        self._boosts[doc_id] = FRECENCY_BONUS * math.log2(1 + frecency)
+        return self._boosts
+
+    def search(self, query, category=ALL):
+        """Apps of ``category`` matching ``query``, best matches first"""
+        return list(map(self.index.apps.__getitem__, self.search_ids(query, category)))
+
+    def search_ids(self, query, category=ALL):
+        """Ids of matching apps: the best ``ranked`` by score, then display order"""
+        with self._lock, tracing.span('search', query=query, category=category):
+            return self._search_ids(query.lower().strip(), category)
+
+    def _search_ids(self, query, category):
+        cache = self._cache
+        key = (category, query)
+        ids = cache.get(key)
+        if ids is not None:
+            cache.move_to_end(key)
+            return ids
+
+        index = self.index
+        boosts = self.boosts()
+        if not query:
+            ids = index.search_ids(query, category)
+            if boosts:
+                # Most used first, then the others in display order
+                doc_range = index.ranges.get(category, range(0))
+                used = sorted((doc_id for doc_id in boosts if doc_id in doc_range),
+                              key=lambda doc_id: (-boosts[doc_id], doc_id))
+                used_set = set(used)
+                ids = used + [doc_id for doc_id in ids if doc_id not in used_set]
+        else:
+            # match_ids returns display order whatever the candidates' order
+            ids = index.match_ids(query, category, self._candidates(query, category),
+                                  limit=self.ranked, extra=boosts)
+            if len(query) > 1 and index.prefix_fills(query, category, self.ranked):
+                self._partial.add(key)
+            ids = index.rank_ids(query, ids, self.ranked, boosts)
+
+        ids = tuple(ids)
+        cache[key] = ids
+        if len(cache) > self.cache_size:
+            self._partial.discard(cache.popitem(last=False)[0])
+        return ids
+
+    def _candidates(self, query, category):
+        """Cached results of the longest cached prefix of query, if small enough.
+
+        Filtering a candidate list that covers most of the category is
+        slower than the index's own scan over pre-joined haystacks.
+        """
+        doc_range = self.index.ranges.get(category)
+        if doc_range is None:
+            return None
+        cache = self._cache
+        for end in range(len(query) - 1, 0, -1):
+            key = (category, query[:end])
+            ids = cache.get(key)
+            if ids is not None and key not in self._partial:
+                if len(ids) > SCAN_RATIO * len(doc_range):
+                    return None
+                cache.move_to_end(key)
+                return ids
+        return None
@@ -8,35 +8,102 @@ Works without GUI, perfect for headless systems
 
 import sys
 import os
-import subprocess
 import json
 from pathlib import Path
 
+import tracing
+
 # Import the detector from smart_launcher
-sys.path.insert(0, '/home/reza/code')
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from smart_launcher import ApplicationDetector
+from app_index import AppIndex
+from search_index import ALL, SearchIndex, SearchSession
+from usage_store import UsageStore
+from launcher_daemon import DaemonClient, DaemonError, LAUNCH_ENV
+from launch_engine import LaunchEngine
+from launch_stats import LaunchStats
 
 class SmartCLILauncher:
     """Terminal-based smart launcher"""
     
-    def __init__(self):
+    def __init__(self, use_daemon=True):
         self.detector = ApplicationDetector()
+        self.index = AppIndex(self.detector)
         self.applications = {}
+        self.category_counts = {}
+        self.search_index = None
+        self.search_session = None
+        self.usage = UsageStore().load()
+        self.launch_engine = LaunchEngine(telemetry=LaunchStats())
+        self.use_daemon = use_daemon
+        self.daemon = None
         self.current_category = ""
         
-    def load_applications(self):
-        """Load and categorize applications"""
+    def load_applications(self, rescan=False):
+        """Load and categorize applications, from the daemon when one is running"""
+        if self.use_daemon:
+            self.daemon = DaemonClient.connect()
+        if self.daemon is not None:
+            if rescan:
+                print("🔄 Asking the daemon to rescan...")
+                if self.daemon_request('refresh') is None:
+                    # Already loaded locally by the fallback
+                    return
+            response = self.daemon_request('list')
+            if response is None:
+                return
+            self.category_counts = {category: count for category, count in response['categories'].items()
+                                    if count}
+            print(f"🔗 Daemon: {sum(self.category_counts.values())} applications in "
+                  f"{len(self.category_counts)} categories")
+            return
+                
         print("🔍 Scanning for applications...")
-        detected_apps = self.detector.detect_applications()
+        with tracing.span('load_applications'):
+            detected_apps = self.index.load()
         
+        self.applications = {}
         total_apps = 0
         for category, apps in detected_apps.items():
             if apps:  # Only include categories with apps
                 self.applications[category] = apps
                 total_apps += len(apps)
                 
+        self.search_index = SearchIndex(self.applications)
+        self.search_session = SearchSession(self.search_index, usage=self.usage)
+        self.category_counts = {category: len(apps) for category, apps in self.applications.items()}
         print(f"✅ Found {total_apps} applications in {len(self.applications)} categories")
         
+    def daemon_request(self, op, **params):
+        """Ask the daemon; if it went away or failed, switch to the local index and return None"""
+        if self.daemon is None:
+            return None
+        try:
+            return self.daemon.request(op, **params)
+        except (OSError, ValueError, DaemonError) as e:
+            print(f"⚠️  Daemon request failed ({e}), loading applications locally")
+            self.daemon = None
+            self.use_daemon = False
+            self.load_applications()
+            return None
+            
+    def category_apps(self, category: str):
+        """Apps of a category, most used first"""
+        if self.daemon is not None:
+            response = self.daemon_request('query', query='', category=category)
+            if response is not None:
+                return response['apps']
+        return self.search_session.search('', category)
+        
+    def find_apps(self, query: str, category: str = ALL):
+        """(category, app) pairs matching query, best first"""
+        if self.daemon is not None:
+            response = self.daemon_request('query', query=query, category=category)
+            if response is not None:
+                return [(app['category'], app) for app in response['apps']]
+        return [(self.search_index.category_of(app_id), self.search_index.apps[app_id])
+                for app_id in self.search_session.search_ids(query, category)]
+        
     def show_main_menu(self):
         """Show main categories menu"""
         while True:
@@ -44,11 +111,11 @@ class SmartCLILauncher:
             print("🚀 SMART ECHO LAUNCHER")
             print("=" * 60)
             
-            categories = list(self.applications.keys())
+            categories = list(self.category_counts.keys())
             
             # Show categories
             for i, category in enumerate(categories, 1):
-                count = len(self.applications[category])
+                count = self.category_counts[category]
                 print(f"{i:2d}. 📁 {category:<20} ({count} apps)")
                 
             print(f"\n{len(categories)+1:2d}. 🔍 Search applications")
@@ -69,7 +136,7 @@ class SmartCLILauncher:
                 elif choice_num == len(categories) + 1:
                     self.search_applications()
                 elif choice_num == len(categories) + 2:
-                    self.load_applications()
+                    self.load_applications(rescan=True)
                 elif choice_num == len(categories) + 3:
                     print("\n👋 Goodbye!")
                     break
@@ -83,7 +150,8 @@ class SmartCLILauncher:
     def show_category_apps(self, category: str):
         """Show applications in a category"""
         while True:
-            apps = self.applications[category]
+            with tracing.span('list_category', category=category):
+                apps = self.category_apps(category)
             
             print(f"\n📁 {category} ({len(apps)} applications)")
             print("-" * 60)
@@ -103,7 +171,7 @@ class SmartCLILauncher:
                 for i, app in enumerate(page_apps, start_idx + 1):
                     name = app['name'][:40] + "..." if len(app['name']) > 40 else app['name']
                     desc = app['description'][:30] + "..." if len(app['description']) > 30 else app['description']
-                    source = f"[{app['source']}]"
+                    source = f"[{app['type']}]"
                     print(f"{i:3d}. ⚡ {name:<43} {source:<8} {desc}")
                 
                 # Navigation options
@@ -156,11 +224,7 @@ class SmartCLILauncher:
         if not query:
             return
             
-        found_apps = []
-        for category, apps in self.applications.items():
-            for app in apps:
-                if self.matches_search(app, query):
-                    found_apps.append((category, app))
+        found_apps = self.find_apps(query)
                     
         if not found_apps:
             print(f"❌ No applications found for '{query}'")
@@ -191,8 +255,7 @@ class SmartCLILauncher:
         if not query:
             return
             
-        apps = self.applications[category]
-        found_apps = [app for app in apps if self.matches_search(app, query)]
+        found_apps = [app for _category, app in self.find_apps(query, category)]
         
         if not found_apps:
             print(f"❌ No applications found in {category} for '{query}'")
@@ -217,16 +280,6 @@ class SmartCLILauncher:
         except (ValueError, KeyboardInterrupt):
             pass
             
-    def matches_search(self, app: dict, query: str) -> bool:
-        """Check if app matches search query"""
-        query = query.lower()
-        search_fields = [
-            app.get('name', '').lower(),
-            app.get('command', '').lower(),
-            app.get('description', '').lower()
-        ]
-        return any(query in field for field in search_fields)
-        
     def launch_application(self, app: dict):
         """Launch an application"""
         print(f"\n🚀 Launching: {app['name']}")
@@ -239,10 +292,8 @@ class SmartCLILauncher:
         if confirm in ['y', 'yes']:
             try:
                 print("⚡ Starting application...")
-                subprocess.Popen(app['command'], shell=True, 
-                               stdout=subprocess.DEVNULL, 
-                               stderr=subprocess.DEVNULL)
-                print("✅ Application launched successfully!")
+                pid, spawn_ms = self.start_application(app)
+                print(f"✅ Application launched successfully! (pid {pid}, spawned in {spawn_ms:.1f} ms)")
             except Exception as e:
                 print(f"❌ Failed to launch: {e}")
         else:
@@ -250,6 +301,19 @@ class SmartCLILauncher:
             
         input("Press Enter to continue...")
         
+    def start_application(self, app: dict):
+        """Start an app through the daemon (which records usage) or locally; returns (pid, spawn ms)"""
+        if self.daemon is not None:
+            env = {key: os.environ[key] for key in LAUNCH_ENV if key in os.environ}
+            response = self.daemon_request('launch', name=app['name'], command=app['command'], env=env)
+            if response is not None:
+                return response['pid'], response['spawn_ms']
+                
+        child = self.launch_engine.launch(app)
+        self.usage.record(app)
+        self.search_session.usage_changed()
+        return child.pid, child.spawn_time * 1000
+        
     def run(self):
         """Run the launcher"""
         print("🚀 Smart Echo Launcher - CLI Edition")
@@ -257,7 +321,7 @@ class SmartCLILauncher:
         
         try:
             self.load_applications()
-            if not self.applications:
+            if not self.category_counts:
                 print("❌ No applications found!")
                 return
                 
@@ -267,9 +331,31 @@ class SmartCLILauncher:
         except Exception as e:
             print(f"❌ Error: {e}")
 
+def print_daemon_stats():
+    """Spawn latency and running apps of the daemon's session, if one is running"""
+    daemon = DaemonClient.connect()
+    if daemon is None:
+        return
+    try:
+        stats = daemon.request('stats')
+    except (OSError, ValueError, DaemonError):
+        return
+    print(f"\n🛰️  Daemon session: {stats['launches']} launches", end='')
+    if stats['launches']:
+        print(f", spawn median {stats['median_ms']:.1f} ms, max {stats['max_ms']:.1f} ms", end='')
+    print()
+    for child in stats['running']:
+        print(f"   ▶ {child['name']} (pid {child['pid']})")
+
 def main():
     """Main entry point"""
-    launcher = SmartCLILauncher()
+    sys.argv = tracing.enable_from_argv(sys.argv)
+    if '--launch-stats' in sys.argv:
+        from launch_stats import print_report
+        status = print_report()
+        print_daemon_stats()
+        sys.exit(status)
+    launcher = SmartCLILauncher(use_daemon='--no-daemon' not in sys.argv)
     launcher.run()
 
 if __name__ == "__main__":
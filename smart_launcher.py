@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Smart Launcher core - application detection shared by every front-end.
+Has no GUI dependencies so the CLI launcher works on headless systems.
+"""
+
+import os
+import shlex
+from pathlib import Path
+
+import app_identity
+import desktop_entry
+import path_scanner
+import tracing
+from launch_engine import resolve_argv
+from categorizer import CategoryMatcher
+
+
+class ApplicationDetector:
+    """Intelligent application detection and categorization engine"""
+
+    def __init__(self):
+        self.categories = {
+            'Programming': ['code', 'editor', 'ide', 'python', 'java', 'git', 'vim'],
+            'Security': ['security', 'hack', 'nmap', 'wireshark', 'metasploit', 'burp'],
+            'System': ['system', 'monitor', 'htop', 'top', 'kill', 'systemctl'],
+            'Internet': ['browser', 'firefox', 'chrome', 'wget', 'curl', 'thunderbird'],
+            'Media': ['video', 'audio', 'vlc', 'mpv', 'gimp', 'blender', 'spotify'],
+            'Office': ['office', 'document', 'libreoffice', 'writer', 'calc', 'pdf'],
+            'Graphics': ['graphics', 'design', 'gimp', 'inkscape', 'krita', 'darktable'],
+            'Games': ['game', 'steam', 'lutris', 'wine', 'emulator']
+        }
+        self._matcher = None
+
+    def desktop_dirs(self):
+        """Directories scanned for .desktop files"""
+        return [
+            '/usr/share/applications',
+            '/usr/local/share/applications',
+            os.path.expanduser('~/.local/share/applications')
+        ]
+
+    def path_dirs(self):
+        """Directories scanned for command line tools, in PATH order.
+
+        Entries resolving to the same directory (e.g. /bin -> /usr/bin)
+        are only listed once.
+        """
+        return path_scanner.unique_dirs(os.environ.get('PATH', '').split(':'))
+
+    def detect_applications(self):
+        """Detect all applications in the system"""
+        print("Scanning system for applications...")
+
+        # Scan desktop applications
+        with tracing.span('scan_desktop_files'):
+            desktop_apps = self._scan_desktop_files()
+        print(f"Found {len(desktop_apps)} desktop applications")
+
+        # Scan command line tools
+        with tracing.span('scan_path_commands'):
+            path_apps = self._scan_path_commands()
+        print(f"Found {len(path_apps)} command line tools")
+
+        # Merge entries that run the same program, then categorize
+        return self.build_categories(self.merge_apps(desktop_apps, path_apps))
+
+    def merge_apps(self, desktop_entries, path_apps):
+        """One {name: info} entry per program; see app_identity.merge_apps"""
+        with tracing.span('merge_apps', apps=len(desktop_entries) + len(path_apps)):
+            return app_identity.merge_apps(desktop_entries, path_apps)
+
+    def build_categories(self, all_apps):
+        """Group merged applications by category, sorted by name"""
+        apps_by_category = {}
+        for cat in self.categories:
+            apps_by_category[cat] = []
+        apps_by_category['Other'] = []
+
+        with tracing.span('build_categories', apps=len(all_apps)):
+            for name, info in all_apps.items():
+                category = info.get('category') or self._categorize_application(name, info)
+                apps_by_category[category].append(self.make_record(name, info))
+
+        # Sort applications by name
+        for cat in apps_by_category:
+            apps_by_category[cat].sort(key=lambda x: x['name'].lower())
+
+        return apps_by_category
+
+    def make_record(self, name, info):
+        """Application record as shown by the launchers"""
+        return {
+            'name': name,
+            'command': info.get('command', name),
+            'argv': info.get('argv', []),
+            'description': info.get('description', 'Application'),
+            'type': info.get('type', 'unknown'),
+            'icon': info.get('icon', ''),
+            'aliases': info.get('aliases', [])
+        }
+
+    def _scan_desktop_files(self):
+        """اسکن فایل‌های .desktop - {file id: (name, info)}"""
+        entries = {}
+        # A file in a later directory (~/.local) overrides, or hides, the same file id
+        for desktop_dir in self.desktop_dirs():
+            entries.update(self._scan_desktop_dir(desktop_dir))
+        desktops = desktop_entry.current_desktops()
+        return {file_id: parsed for file_id, parsed in entries.items()
+                if parsed and self.desktop_entry_shown(parsed[1], desktops)}
+
+    def desktop_entry_shown(self, info, desktops=None):
+        """Whether a parsed entry's TryExec and OnlyShowIn/NotShowIn allow it in this session"""
+        return desktop_entry.is_shown_here(info.get('show_if', {}), desktops)
+
+    def _scan_desktop_dir(self, desktop_dir):
+        """Parse every .desktop file of a single directory: {file id: (name, info) or None}"""
+        entries = {}
+        if not os.path.exists(desktop_dir):
+            return entries
+
+        with tracing.span('scan_desktop_dir', dir=desktop_dir):
+            for file_path in sorted(Path(desktop_dir).glob('*.desktop')):
+                # Hidden and invalid files are kept as None to mask earlier directories
+                entries[file_path.name] = self._parse_desktop_file(file_path)
+
+        return entries
+
+    def _parse_desktop_file(self, file_path):
+        """Parse one .desktop file into (name, info), or None if hidden/invalid.
+
+        TryExec and OnlyShowIn/NotShowIn are kept in the info's ``show_if``
+        and checked by desktop_entry_shown, since the parsed file is cached.
+        """
+        with tracing.span('parse_desktop_file'):
+            entry = desktop_entry.read_entry(file_path)
+            if entry is None or not desktop_entry.is_displayed(entry):
+                return None
+
+            name = desktop_entry.unescape(entry.get('Name', '')) or Path(file_path).stem
+            argv = desktop_entry.exec_argv(entry, file_path)
+            description = desktop_entry.unescape(
+                entry.get('Comment') or entry.get('GenericName') or 'Desktop Application')
+
+            # Resolved now so launching needs neither a shell nor a PATH lookup
+            resolved = resolve_argv(argv)
+            info = {
+                'command': shlex.join(argv),
+                'argv': resolved,
+                'executable': app_identity.executable_path(resolved[0] if resolved else ''),
+                'description': description,
+                'type': 'desktop',
+                'icon': entry.get('Icon', ''),
+                'categories': desktop_entry.split_list(entry.get('Categories'))
+            }
+            show_if = desktop_entry.environment_keys(entry)
+            if show_if:
+                info['show_if'] = show_if
+            return name, info
+
+    def _scan_path_commands(self):
+        """اسکن دستورات PATH - all directories in parallel, no cap"""
+        apps = {}
+        # Earlier PATH directories win, as in the shell
+        for _path_dir, commands in reversed(self._scan_path_dirs(self.path_dirs())):
+            apps.update(commands)
+        return apps
+
+    def _scan_path_dirs(self, path_dirs):
+        """Scan several PATH directories concurrently, keeping their order"""
+        return path_scanner.scan_dirs(path_dirs)
+
+    def _iter_scan_path_dirs(self, path_dirs):
+        """Scan several PATH directories concurrently, yielding each as it finishes"""
+        return path_scanner.iter_scan_dirs(path_dirs)
+
+    def _scan_path_dir(self, path_dir):
+        """List the executables of a single PATH directory"""
+        return path_scanner.scan_dir(path_dir)
+
+    def _check_path_command(self, file_path):
+        """Return the info of an executable PATH entry, or None"""
+        return path_scanner.check_command(file_path)
+
+    def category_matcher(self):
+        """Compiled form of self.categories, rebuilt if the table was edited"""
+        if self._matcher is None or self._matcher.categories != self.categories:
+            self._matcher = CategoryMatcher(self.categories)
+        return self._matcher
+
+    def categorize_batch(self, items):
+        """Categories for a list of (name, info) pairs"""
+        with tracing.span('categorize_batch', apps=len(items)):
+            return self.category_matcher().categorize_many(items)
+
+    def _categorize_application(self, name, info):
+        """Determine application category"""
+        return self.category_matcher().categorize(name, info)
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Lightweight tracing for Smart Launcher's hot paths.
+
+Code marks interesting work with named spans:
+
+    with tracing.span('scan_path_dir', dir=path_dir):
+        ...
+
+Tracing is off by default and a disabled span() only returns a shared
+no-op context manager. It is switched on by --profile[=FILE] on the GUI
+and CLI launchers or by SMART_LAUNCHER_TRACE=FILE in the environment
+(any value without a path separator or .json suffix, like 1, uses
+smart-launcher-trace.json in the current directory). At exit the spans
+are written as Chrome trace-event JSON (open it in chrome://tracing or
+https://ui.perfetto.dev) and a per-span summary is printed.
+"""
+
+import os
+import sys
+import json
+import time
+import atexit
+import threading
+
+ENV_VAR = 'SMART_LAUNCHER_TRACE'
+DEFAULT_PATH = 'smart-launcher-trace.json'
+
+_enabled = False
+_path = None
+_origin = time.perf_counter()
+# (name, start, duration, thread id, args); list.append is atomic
+_events = []
+_thread_names = {}
+
+
+class _Span:
+    __slots__ = ('name', 'args', 'start')
+
+    def __init__(self, name, args):
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter()
+        ident = threading.get_ident()
+        if ident not in _thread_names:
+            _thread_names[ident] = threading.current_thread().name
+        _events.append((self.name, self.start, end - self.start, ident, self.args))
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(name, **args):
+    """Context manager timing a block as ``name``; free when tracing is off"""
+    if not _enabled:
+        return _NULL_SPAN
+    return _Span(name, args)
+
+
+def enabled():
+    return _enabled
+
+
+def enable(path=None):
+    """Start recording spans; they are exported to ``path`` at exit"""
+    global _enabled, _path
+    _path = path or DEFAULT_PATH
+    if not _enabled:
+        _enabled = True
+        atexit.register(finish)
+
+
+def enable_from_argv(argv):
+    """Handle --profile[=FILE]; returns argv without it"""
+    rest = []
+    for arg in argv:
+        if arg == '--profile':
+            enable()
+        elif arg.startswith('--profile='):
+            enable(arg.split('=', 1)[1])
+        else:
+            rest.append(arg)
+    return rest
+
+
+def chrome_trace(events=None):
+    """Events in Chrome trace-event format"""
+    events = _events if events is None else events
+    pid = os.getpid()
+    trace = [{'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': ident, 'args': {'name': name}}
+             for ident, name in list(_thread_names.items())]
+    for name, start, duration, ident, args in events:
+        trace.append({
+            'name': name,
+            'ph': 'X',
+            'ts': round((start - _origin) * 1e6, 3),
+            'dur': round(duration * 1e6, 3),
+            'pid': pid,
+            'tid': ident,
+            'args': {key: str(value) for key, value in args.items()},
+        })
+    return {'traceEvents': trace, 'displayTimeUnit': 'ms'}
+
+
+def summary(events=None):
+    """Text table of count, total, mean, p95 and max per span name, slowest total first"""
+    events = _events if events is None else events
+    durations = {}
+    for name, _start, duration, _ident, _args in events:
+        durations.setdefault(name, []).append(duration)
+
+    lines = [f"   {'span':<24} {'count':>7} {'total ms':>10} {'mean ms':>9} {'p95 ms':>9} {'max ms':>9}"]
+    for name, values in sorted(durations.items(), key=lambda item: -sum(item[1])):
+        values.sort()
+        total = sum(values)
+        p95 = values[min(len(values) - 1, int(len(values) * 0.95))]
+        lines.append(f"   {name:<24} {len(values):>7} {total * 1000:10.1f} "
+                     f"{total / len(values) * 1000:9.3f} {p95 * 1000:9.3f} {values[-1] * 1000:9.3f}")
+    return '\n'.join(lines)
+
+
+def finish():
+    """Write the Chrome trace and print the summary (once)"""
+    global _enabled
+    if not _enabled:
+        return
+    _enabled = False
+    events = list(_events)
+    try:
+        with open(_path, 'w', encoding='utf-8') as f:
+            json.dump(chrome_trace(events), f, separators=(',', ':'))
+        written = f"written to {_path}"
+    except OSError as e:
+        written = f"could not be written: {e}"
+    print(f"\n🔬 Trace: {len(events)} spans {written}", file=sys.stderr)
+    if events:
+        print(summary(events), file=sys.stderr)
+
+
+_env_value = os.environ.get(ENV_VAR, '')
+if _env_value and _env_value != '0':
+    enable(_env_value if (os.sep in _env_value or _env_value.endswith('.json')) else None)
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Launch history and frecency ranking for Smart Launcher.
+
+Every launch appends one line, "<unix time>\\t<app name>", to
+~/.local/share/smart-launcher/usage.log. In memory each app keeps the
+sum of exp(λ·(t - epoch)) over its launches, so recording a launch is
+O(1) and ranking needs no clock: dividing every sum by exp(λ·(now -
+epoch)) gives the decayed score (one launch right now = 1.0, halving
+every HALF_LIFE seconds) without changing the order.
+
+The log is compacted when it holds many more lines than apps: it is
+rewritten with one line per app, whose timestamp is the single launch
+time that yields the same score.
+
+The GUI, the daemon and the CLI may all keep a store open on the same
+log. Appends and compaction happen under an flock on usage.log.lock,
+and each process first replays the lines others appended since it last
+read the log, so no launch is lost and every store converges on the
+log's contents. The lock file holds a counter bumped by every
+compaction; a store that sees it change re-reads the log whole.
+"""
+
+import os
+import math
+import time
+import fcntl
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+
+# A launch counts half as much after a week
+HALF_LIFE = 7 * 24 * 3600
+
+# Compact once the log has this many lines more than it has apps
+COMPACT_SLACK = 500
+
+
+def default_data_dir():
+    """Data directory, honoring XDG_DATA_HOME"""
+    base = os.environ.get('XDG_DATA_HOME') or os.path.expanduser('~/.local/share')
+    return Path(base) / 'smart-launcher'
+
+
+def app_key(app):
+    """Stable id of an app in the log"""
+    return ' '.join(app['name'].split())
+
+
+class UsageStore:
+    """Append-only launch log with exponentially decayed frecency"""
+
+    def __init__(self, log_path=None, half_life=HALF_LIFE):
+        self.log_path = Path(log_path) if log_path else default_data_dir() / 'usage.log'
+        self.rate = math.log(2) / half_life
+        self.epoch = None
+        # {app key: sum of exp(rate * (t - epoch))}
+        self.weights = {}
+        self.lines = 0
+        # Compaction count and byte offset of the log up to which weights are current
+        self.generation = None
+        self.offset = 0
+        # Guards weights against search threads reading while a launch is recorded
+        self._lock = threading.RLock()
+
+    @contextmanager
+    def _file_lock(self):
+        """Exclusive flock shared by every process using this log; yields the lock file"""
+        self.log_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.log_path.with_name(self.log_path.name + '.lock'), 'a+', encoding='utf-8') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            yield lock_file
+
+    @staticmethod
+    def _generation(lock_file):
+        lock_file.seek(0)
+        try:
+            return int(lock_file.read() or 0)
+        except ValueError:
+            return 0
+
+    def _reset(self):
+        self.weights = {}
+        self.epoch = None
+        self.lines = 0
+        self.generation = None
+        self.offset = 0
+
+    def _sync(self, lock_file):
+        """Replay lines appended since the last read; re-read a compacted log"""
+        generation = self._generation(lock_file)
+        try:
+            size = os.stat(self.log_path).st_size
+        except FileNotFoundError:
+            size = 0
+        if generation != self.generation or size < self.offset:
+            self._reset()
+            self.generation = generation
+        if size == self.offset:
+            return
+
+        with open(self.log_path, 'rb') as f:
+            f.seek(self.offset)
+            data = f.read()
+        # A line still being written is picked up next time
+        end = data.rfind(b'\n') + 1
+        self.offset += end
+        for line in data[:end].decode('utf-8', errors='replace').splitlines():
+            timestamp, sep, key = line.partition('\t')
+            if not sep or not key:
+                continue
+            try:
+                self._add(key, float(timestamp))
+            except ValueError:
+                continue
+            self.lines += 1
+
+    def load(self):
+        """Read the log; unreadable lines are skipped"""
+        with self._lock:
+            self._reset()
+            try:
+                with self._file_lock() as lock_file:
+                    self._sync(lock_file)
+                    if self.lines > len(self.weights) + COMPACT_SLACK:
+                        self._compact(lock_file)
+            except OSError as e:
+                print(f"⚠️  Could not read usage log: {e}")
+        return self
+
+    def record(self, app, timestamp=None):
+        """Log one launch of ``app`` and update its score"""
+        key = app_key(app)
+        timestamp = time.time() if timestamp is None else timestamp
+        added = False
+        with self._lock:
+            try:
+                with self._file_lock() as lock_file:
+                    self._sync(lock_file)
+                    with open(self.log_path, 'ab') as f:
+                        f.write(f"{timestamp:.0f}\t{key}\n".encode('utf-8'))
+                        self.offset = f.tell()
+                    self._add(key, timestamp)
+                    added = True
+                    self.lines += 1
+                    if self.lines > len(self.weights) + COMPACT_SLACK:
+                        self._compact(lock_file)
+            except OSError as e:
+                if not added:
+                    self._add(key, timestamp)
+                print(f"⚠️  Could not write usage log: {e}")
+
+    def _add(self, key, timestamp):
+        if self.epoch is None:
+            self.epoch = timestamp
+        exponent = self.rate * (timestamp - self.epoch)
+        if exponent > 500:
+            # Weights would overflow: move the epoch forward first
+            self._rebase(timestamp)
+            exponent = 0.0
+        self.weights[key] = self.weights.get(key, 0.0) + math.exp(exponent)
+
+    def _rebase(self, epoch):
+        factor = math.exp(self.rate * (self.epoch - epoch))
+        self.weights = {key: weight * factor for key, weight in self.weights.items()
+                        if weight * factor > 1e-300}
+        self.epoch = epoch
+
+    def effective_time(self, key):
+        """Single launch time giving the same score as the app's history"""
+        return self.epoch + math.log(self.weights[key]) / self.rate
+
+    def compact(self):
+        """Rewrite the log with one line per app"""
+        with self._lock:
+            try:
+                with self._file_lock() as lock_file:
+                    self._sync(lock_file)
+                    self._compact(lock_file)
+            except OSError as e:
+                print(f"⚠️  Could not compact usage log: {e}")
+
+    def _compact(self, lock_file):
+        """compact() with both locks held and the log replayed"""
+        tmp_path = self.log_path.with_name(self.log_path.name + '.tmp')
+        with open(tmp_path, 'wb') as f:
+            for key, weight in self.weights.items():
+                if weight > 0:
+                    f.write(f"{self.effective_time(key):.0f}\t{key}\n".encode('utf-8'))
+            offset = f.tell()
+        os.replace(tmp_path, self.log_path)
+        # Other stores see the new generation and re-read the log whole
+        self.generation = self._generation(lock_file) + 1
+        lock_file.seek(0)
+        lock_file.truncate()
+        lock_file.write(str(self.generation))
+        lock_file.flush()
+        self.offset = offset
+        self.lines = len(self.weights)
+
+    def score(self, app, now=None):
+        """Frecency: 1.0 per launch right now, halving every half-life"""
+        now = time.time() if now is None else now
+        with self._lock:
+            weight = self.weights.get(app_key(app))
+            if not weight:
+                return 0.0
+            return weight * math.exp(self.rate * (self.epoch - now))
+
+    def scores(self, now=None):
+        """{app key: frecency} of every app launched so far"""
+        if not self.weights:
+            return {}
+        now = time.time() if now is None else now
+        with self._lock:
+            decay = math.exp(self.rate * (self.epoch - now))
+            weights = list(self.weights.items())
+        return {key: weight * decay for key, weight in weights}
+
+    def rank(self, apps):
+        """Used apps first by frecency, then the others in their order"""
+        with self._lock:
+            weights = dict(self.weights)
+        used = []
+        rest = []
+        for app in apps:
+            (used if app_key(app) in weights else rest).append(app)
+        used.sort(key=lambda app: -weights[app_key(app)])
+        return used + rest